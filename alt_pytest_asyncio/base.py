@@ -1,7 +1,10 @@
 import abc
-from collections.abc import Callable
+import contextlib
+from collections.abc import Callable, Iterator
 from typing import NoReturn, Protocol
 
+from . import errors
+
 
 class AsyncTimeout(abc.ABC):
     run_count: int
@@ -16,6 +19,13 @@ class AsyncTimeout(abc.ABC):
     @abc.abstractmethod
     def raise_maybe(self, func: Callable[..., object]) -> None: ...
 
+    def remaining_seconds(self) -> float | None:
+        return None
+
+    @contextlib.contextmanager
+    def budget(self, seconds: float) -> Iterator[None]:
+        yield
+
 
 class AsyncTimeoutMaker(Protocol):
     def __call__(self) -> AsyncTimeout: ...
@@ -27,3 +37,13 @@ class AsyncTimeoutProvider(abc.ABC):
 
     @abc.abstractmethod
     def set_timeout_seconds(self, timeout: float) -> NoReturn: ...
+
+    def remaining_seconds(self) -> NoReturn:
+        raise errors.NoAsyncTimeoutInSyncFunctions(
+            "The async_timeout fixture only makes sense in async fixtures/functions"
+        )
+
+    def budget(self, seconds: float) -> NoReturn:
+        raise errors.NoAsyncTimeoutInSyncFunctions(
+            "The async_timeout fixture only makes sense in async fixtures/functions"
+        )
@@ -0,0 +1,237 @@
+import asyncio
+import dataclasses
+import inspect
+import json
+import pathlib
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Mapping
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from . import base, converter, errors
+from .loop_metrics import percentile
+
+_MIN_ROUNDS = 5
+_MAX_ROUNDS = 10_000
+_MAX_ITERATIONS = 1_000_000
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class BenchmarkStats:
+    """
+    How long one run of an awaitable took, in seconds
+    """
+
+    name: str
+    rounds: int
+    iterations: int
+    batch: int
+    min: float
+    median: float
+    p99: float
+    mean: float
+
+    @property
+    def ops_per_second(self) -> float:
+        return 0.0 if self.mean <= 0 else 1 / self.mean
+
+    @classmethod
+    def from_times(
+        cls, *, name: str, iterations: int, batch: int, times: list[float]
+    ) -> "BenchmarkStats":
+        """
+        Make stats from the time each round took to run the awaitable
+        ``iterations * batch`` times
+        """
+        per_op = [t / (iterations * batch) for t in times]
+        return cls(
+            name=name,
+            rounds=len(per_op),
+            iterations=iterations,
+            batch=batch,
+            min=min(per_op),
+            median=statistics.median(per_op),
+            p99=percentile(per_op, 99),
+            mean=statistics.fmean(per_op),
+        )
+
+    def as_dict(self) -> dict[str, object]:
+        return {**dataclasses.asdict(self), "ops_per_second": self.ops_per_second}
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f}{unit}"
+    return f"{seconds / 1e-9:.1f}ns"
+
+
+def load_baseline(path: pathlib.Path) -> dict[str, BenchmarkStats]:
+    """
+    Read the stats saved by ``--async-benchmark-save``
+    """
+    with open(path) as fle:
+        saved = json.load(fle)
+
+    fields = {field.name for field in dataclasses.fields(BenchmarkStats)}
+    return {
+        found["name"]: BenchmarkStats(**{k: v for k, v in found.items() if k in fields})
+        for found in saved["benchmarks"]
+    }
+
+
+class AsyncBenchmark:
+    """
+    The object given by the ``async_benchmark`` fixture.
+
+    Calling it with a function that returns an awaitable runs that function
+    many times on the loop for the test and returns ``BenchmarkStats``.
+    """
+
+    def __init__(self, *, benchmarks: "Benchmarks", request: pytest.FixtureRequest) -> None:
+        self._benchmarks = benchmarks
+        self._request = request
+
+    def __call__(
+        self,
+        factory: Callable[[], Awaitable[object]],
+        *,
+        name: str | None = None,
+        batch: int = 1,
+        rounds: int | None = None,
+        max_time: float = 1.0,
+        min_round_time: float = 0.002,
+    ) -> BenchmarkStats:
+        """
+        Run ``factory()`` until each round takes at least ``min_round_time``
+        seconds and then time ``rounds`` rounds of it, or as many rounds as fit
+        in ``max_time`` seconds.
+
+        With a ``batch`` more than 1, that many awaitables are gathered at once
+        so that the time it takes to schedule them is shared between them.
+        """
+        __tracebackhide__ = True
+        if asyncio.events._get_running_loop() is not None:
+            raise errors.BenchmarkInAsyncFunction(
+                "The async_benchmark fixture can only be used from sync tests"
+            )
+        if batch < 1:
+            raise ValueError(f"batch must be at least 1, got {batch}")
+
+        async def run_round(iterations: int) -> float:
+            start = time.perf_counter()
+            if batch == 1:
+                for _ in range(iterations):
+                    await factory()
+            else:
+                for _ in range(iterations):
+                    await asyncio.gather(*(factory() for _ in range(batch)))
+            return time.perf_counter() - start
+
+        async def measure(async_timeout: base.AsyncTimeout) -> tuple[int, list[float]]:
+            # The timeout applies to each round rather than the whole benchmark
+            iterations = 1
+            while True:
+                async_timeout.use_default_timeout()
+                took = await run_round(iterations)
+                if took >= min_round_time or iterations >= _MAX_ITERATIONS:
+                    break
+                iterations = min(
+                    _MAX_ITERATIONS, iterations * (10 if took < min_round_time / 10 else 2)
+                )
+
+            count = rounds
+            if count is None:
+                count = max(_MIN_ROUNDS, min(_MAX_ROUNDS, int(max_time / max(took, 1e-9))))
+
+            times = []
+            for _ in range(count):
+                async_timeout.use_default_timeout()
+                times.append(await run_round(iterations))
+            return iterations, times
+
+        if inspect.isfunction(factory) or inspect.ismethod(factory):
+            # So a timeout is reported against the benchmarked function
+            measure.__original__ = factory  # type: ignore[attr-defined]
+
+        iterations, times = self._benchmarks.converter.run_for_request(self._request, measure)
+        key = self._request.node.nodeid if name is None else f"{self._request.node.nodeid}::{name}"
+        stats = BenchmarkStats.from_times(
+            name=key, iterations=iterations, batch=batch, times=times
+        )
+        self._benchmarks.record(stats)
+        return stats
+
+
+class Benchmarks:
+    """
+    Collects the stats from ``async_benchmark`` for the session.
+
+    The stats are written to ``save_path`` as JSON when the session is done and
+    any benchmark with a median more than ``tolerance`` slower than the same
+    benchmark in ``baseline`` fails.
+    """
+
+    def __init__(
+        self,
+        *,
+        converter: converter.Converter,
+        save_path: pathlib.Path | None = None,
+        baseline: Mapping[str, BenchmarkStats] | None = None,
+        tolerance: float = 0.1,
+    ) -> None:
+        self.converter = converter
+        self.save_path = save_path
+        self.baseline = baseline or {}
+        self.tolerance = tolerance
+        self.results: list[BenchmarkStats] = []
+
+    def record(self, stats: BenchmarkStats) -> None:
+        __tracebackhide__ = True
+        self.results.append(stats)
+
+        if (baseline := self.baseline.get(stats.name)) is None:
+            return
+
+        if stats.median > baseline.median * (1 + self.tolerance):
+            raise errors.BenchmarkRegression(
+                f"{stats.name} is slower than the baseline:"
+                f" median {format_seconds(stats.median)} compared to {format_seconds(baseline.median)}"
+                f" ({_change(stats, baseline)}, tolerance {self.tolerance:.0%})"
+            )
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if self.save_path is None or not self.results:
+            return
+
+        self.save_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.save_path, "w") as fle:
+            json.dump({"benchmarks": [stats.as_dict() for stats in self.results]}, fle, indent=2)
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        if not self.results:
+            return
+
+        terminalreporter.section("async benchmarks")
+        terminalreporter.line(
+            f"{'min':>10} {'median':>10} {'p99':>10} {'ops/s':>12} {'rounds':>7}"
+            f" {'baseline':>9}  benchmark"
+        )
+        for stats in self.results:
+            baseline = self.baseline.get(stats.name)
+            terminalreporter.line(
+                f"{format_seconds(stats.min):>10} {format_seconds(stats.median):>10}"
+                f" {format_seconds(stats.p99):>10} {stats.ops_per_second:>12.1f}"
+                f" {stats.rounds:>7} {'' if baseline is None else _change(stats, baseline):>9}"
+                f"  {stats.name}"
+            )
+
+
+def _change(stats: BenchmarkStats, baseline: BenchmarkStats) -> str:
+    if baseline.median <= 0:
+        return "n/a"
+    return f"{(stats.median - baseline.median) / baseline.median:+.1%}"
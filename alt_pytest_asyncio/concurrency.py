@@ -0,0 +1,232 @@
+import dataclasses
+import functools
+import inspect
+
+import pytest
+from _pytest.python import get_direct_param_fixture_func
+from _pytest.runner import call_and_report
+
+from . import converter, virtual_time
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ConcurrentTests:
+    """
+    Used to find batches of async tests that can have their bodies run as
+    concurrent tasks on the session loop.
+
+    Only consecutive tests that share the same parent are put in the same batch
+    and only tests that don't use function scoped fixtures (other than from
+    ``pytest.mark.parametrize``) are eligible. This is because pytest sets up
+    and tears down function scoped fixtures one test at a time.
+    """
+
+    enabled_by_default: bool
+    limit: int
+
+    @classmethod
+    def from_config(cls, config: pytest.Config) -> "ConcurrentTests | None":
+        limit = config.getoption("async_concurrency", None)
+        if limit is None:
+            limit = config.getini("async_concurrency")
+        limit = int(limit) if limit not in (None, "") else 10
+
+        if limit < 2:
+            return None
+
+        # The worker loop for pytest-xdist decides which tests get run on
+        # which worker and we don't want to take tests from other workers
+        if hasattr(config, "workerinput"):
+            return None
+
+        for option in ("setuponly", "setupshow", "setupplan", "collectonly"):
+            if config.getoption(option, False):
+                return None
+
+        enabled_by_default = bool(
+            config.getoption("async_concurrent", None) or config.getini("async_concurrent")
+        )
+        return cls(enabled_by_default=enabled_by_default, limit=limit)
+
+    def is_eligible(self, item: pytest.Item) -> bool:
+        if not isinstance(item, pytest.Function):
+            return False
+
+        if not inspect.iscoroutinefunction(converter.original_test_function(item)):
+            return False
+
+        marker = item.get_closest_marker("async_concurrent")
+        if marker is None:
+            enabled = self.enabled_by_default or self.cases_limit(item) is not None
+        elif marker.args:
+            enabled = bool(marker.args[0])
+        else:
+            enabled = bool(marker.kwargs.get("enabled", True))
+
+        if not enabled:
+            return False
+
+        # Load tests are already running lots of things at once
+        if item.get_closest_marker("async_load") is not None:
+            return False
+
+        for xfail in item.iter_markers("xfail"):
+            if not xfail.kwargs.get("run", True):
+                return False
+
+        fixtureinfo = item._fixtureinfo
+        for name in fixtureinfo.names_closure:
+            fixturedefs = fixtureinfo.name2fixturedefs.get(name)
+            if not fixturedefs:
+                continue
+
+            fixturedef = fixturedefs[-1]
+            if (
+                fixturedef.scope == "function"
+                and converter.original_fixture_function(fixturedef)
+                is not get_direct_param_fixture_func
+            ):
+                return False
+
+        return True
+
+    def cases_limit(self, item: pytest.Item) -> int | None:
+        """
+        Return how many cases of this parametrized test may be run at the
+        same time if it's marked with ``async_concurrent_cases``
+        """
+        marker = item.get_closest_marker("async_concurrent_cases")
+        if marker is None:
+            return None
+
+        limit = marker.args[0] if marker.args else marker.kwargs.get("limit")
+        return self.limit if limit is None else int(limit)
+
+    def batch_for(
+        self, item: pytest.Item, nextitem: pytest.Item | None, positions: dict[pytest.Item, int]
+    ) -> tuple[list[pytest.Function], pytest.Item | None]:
+        """
+        Return the tests that should be run concurrently starting with this item
+        and the item that comes after that batch.
+
+        Tests marked with ``async_concurrent_cases`` are only put in a batch
+        with the other cases of the same test function.
+        """
+        if not self.is_eligible(item):
+            return [], nextitem
+
+        assert isinstance(item, pytest.Function)
+        cases_limit = self.cases_limit(item)
+        limit = self.limit if cases_limit is None else cases_limit
+        batch: list[pytest.Function] = [item]
+        items = item.session.items
+        index = positions.get(item)
+        if index is None or nextitem is None or items[index + 1] is not nextitem:
+            return batch, nextitem
+
+        uses_virtual_time = virtual_time.uses_virtual_time(item)
+
+        after: pytest.Item | None = None
+        for after in items[index + 1 :]:
+            if len(batch) >= limit:
+                break
+            if after.parent is not item.parent or not self.is_eligible(after):
+                break
+            if (self.cases_limit(after) is None) != (cases_limit is None):
+                break
+            if cases_limit is not None and (
+                not isinstance(after, pytest.Function) or after.originalname != item.originalname
+            ):
+                break
+            if virtual_time.uses_virtual_time(after) != uses_virtual_time:
+                break
+            assert isinstance(after, pytest.Function)
+            batch.append(after)
+        else:
+            after = None
+
+        return batch, after
+
+
+def run_batch(
+    converter: converter.Converter,
+    batch: list[pytest.Function],
+    *,
+    nextitem: pytest.Item | None,
+) -> None:
+    """
+    Run the tests in this batch with the test bodies running concurrently.
+
+    All the tests are setup first, then the bodies are run together on the loop
+    and then for each test pytest is told about the setup, call and teardown
+    so that reporting happens as normal.
+
+    Pytest only allows one test to be on the setup state at a time, so each test
+    is taken off the setup state after it is setup and put back just before
+    it is torn down.
+    """
+    session = batch[0].session
+    setupstate = session._setupstate
+
+    prepared: list[tuple[pytest.Function, pytest.TestReport, object]] = []
+    for item in batch:
+        if not item._request:
+            item._initrequest()
+
+        rep = call_and_report(item, "setup", log=False)
+        if rep.passed:
+            # The fixtures used to find the timeout for the test may fail
+            prepared_call = pytest.CallInfo.from_call(
+                functools.partial(converter.prepare_concurrent_test, item),
+                when="setup",
+                reraise=(pytest.exit.Exception, KeyboardInterrupt),
+            )
+            if prepared_call.excinfo is not None:
+                rep = item.ihook.pytest_runtest_makereport(item=item, call=prepared_call)
+        prepared.append((item, rep, setupstate.stack.pop(item, None)))
+
+    capman = session.config.pluginmanager.getplugin("capturemanager")
+    capturing = capman is not None and capman.is_globally_capturing()
+    if capturing:
+        capman.resume_global_capture()
+    ran = [item for item, rep, _ in prepared if rep.passed]
+    try:
+        converter.run_concurrent_tests(ran)
+    finally:
+        if capturing:
+            capman.suspend_global_capture(in_=False)
+            out, err = capman.read_global_capture()
+            # The output can't be split between the tests, so it's given once to
+            # the first test that failed, or the first test if none did
+            failed = [item for item in ran if converter.concurrent_test_failed(item)]
+            if owner := (failed or ran)[:1]:
+                if out:
+                    owner[0].add_report_section("call", "stdout (concurrent batch)", out)
+                if err:
+                    owner[0].add_report_section("call", "stderr (concurrent batch)", err)
+
+    for i, (item, rep, detached) in enumerate(prepared):
+        if session.shouldfail or session.shouldstop:
+            converter.forget_concurrent_test(item)
+            continue
+
+        after = batch[i + 1] if i + 1 < len(batch) else nextitem
+
+        ihook = item.ihook
+        ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        ihook.pytest_runtest_logreport(report=rep)
+
+        if detached is not None:
+            setupstate.stack[item] = detached  # type: ignore[assignment]
+
+        try:
+            if rep.passed:
+                call_and_report(item, "call")
+            if session.shouldfail or session.shouldstop:
+                after = None
+            call_and_report(item, "teardown", nextitem=after)
+        finally:
+            item._request = False  # type: ignore[assignment]
+            item.funcargs = None  # type: ignore[assignment]
+
+        ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
@@ -1,88 +1,184 @@
 import asyncio
+import contextlib
 import contextvars
+import dataclasses
+import functools
 import inspect
 import sys
-from collections import defaultdict
-from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+import threading
+import time
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Generator,
+    Iterator,
+    Mapping,
+    Sequence,
+)
 from functools import wraps
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar, cast
 
 import pytest
+from _pytest.nodes import Node
+from _pytest.unittest import TestCaseFunction
 
-from . import base, machinery, protocols
+from . import base, load_testing, loop_thread, machinery, per_loop, protocols
+
+T_Func = TypeVar("T_Func", bound=Callable[..., object])
 
 _PytestScopes = ["function", "class", "module", "package", "session"]
 
+_making_own_task: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "alt_pytest_asyncio_making_own_task", default=False
+)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class _StartedFixture:
+    async_timeout: base.AsyncTimeout
+    task: asyncio.Task[object]
+    gen_obj: AsyncGenerator[object] | None = None
+
+
+@dataclasses.dataclass(kw_only=True)
+class _AsyncTeardown:
+    fixturedef: pytest.FixtureDef[object]
+    node: pytest.Item | pytest.Collector
+    async_timeout: base.AsyncTimeout
+    async_finalizer: Callable[[], Awaitable[None]]
+    finalizer: Callable[[], None]
+    task: asyncio.Task[None] | None = None
+    seconds: float | None = None
+
 
 class Converter:
     def __init__(self) -> None:
+        self.setup_fixtures_concurrently = False
+        self.teardown_fixtures_concurrently = False
+        self.eager_tasks = False
+        self.sync_fast_path = False
+        self.loop_watchers: list[protocols.LoopWatcher] = []
+        self.loop_thread: loop_thread.LoopThread | None = None
         self._ctx = contextvars.copy_context()
-        self._test_tasks: dict[asyncio.AbstractEventLoop, list[asyncio.Task[object]]] = (
-            defaultdict(list)
-        )
+        self._watched_loops: set[asyncio.AbstractEventLoop] = set()
+        self._test_tasks: per_loop.PerLoop[set[asyncio.Task[object]]] = per_loop.PerLoop()
+        self._concurrent_tests: dict[pytest.Function, base.AsyncTimeoutMaker] = {}
+        self._concurrent_outcomes: dict[pytest.Function, tuple[base.AsyncTimeout, object]] = {}
+        self._started_fixtures: dict[pytest.FixtureDef[object], _StartedFixture] = {}
+        self._async_teardowns: dict[pytest.FixtureDef[object], _AsyncTeardown] = {}
+        self._teardown_seconds: dict[pytest.FixtureDef[object], float] = {}
+        self._teardown_starts: dict[pytest.FixtureDef[object], int] = {}
+        self._watched_teardowns: set[pytest.FixtureDef[object]] = set()
+        self._async_fixturedefs: set[pytest.FixtureDef[object]] = set()
+        self._fixture_requests: dict[pytest.FixtureDef[object], pytest.FixtureRequest] = {}
+        self._plain_tests: set[pytest.Function] = set()
+        self._plain_fixturedefs: set[pytest.FixtureDef[object]] = set()
+        self._timeout_names: dict[tuple[str, Node | None], str | None] = {}
+        self._timeouts: dict[tuple[str, Node], tuple[float, base.AsyncTimeoutProvider]] = {}
 
-    def _cleanup_completed_tasks(self) -> None:
+    def _add_new_task(self, loop: asyncio.AbstractEventLoop, task: asyncio.Task[object]) -> None:
         """
-        Remove references to completed tasks to they can be garbage collected, including the
-        return (or yielded) values of the fixture functions, which would otherwise leak memory.
+        Remember this task until it is done so that it can be cancelled when the
+        session is finished.
+
+        Tasks forget themselves when they are done so that we don't keep
+        references to them, including the return (or yielded) values of the
+        fixture functions, which would otherwise leak memory.
         """
+        if task.done():
+            return
+
+        tasks = self._test_tasks.setdefault(loop, set)
+        tasks.add(task)
+
+        def forget(task: asyncio.Task[object]) -> None:
+            tasks.discard(task)
+            if not tasks:
+                self._test_tasks.forget(loop, tasks)
+
+        task.add_done_callback(forget)
+
+    def sessionfinish(self) -> None:
         for loop, tasks in list(self._test_tasks.items()):
             if loop.is_closed():
                 continue
 
-            remaining: list[asyncio.Task[object]] = []
-            finished: list[asyncio.Task[object]] = []
-            for t in tasks:
-                if not t.done():
-                    remaining.append(t)
-                else:
-                    t.cancel()
-                    finished.append(t)
+            def cancel(tasks: set[asyncio.Task[object]]) -> list[asyncio.Task[object]]:
+                ts = []
+                for t in list(tasks):
+                    if not t.done():
+                        t.cancel()
+                        ts.append(t)
+                return ts
 
-            self._test_tasks[loop] = remaining
+            ts = self._on_loop(loop, functools.partial(cancel, tasks))
+            if ts:
+                self._complete(loop, lambda: asyncio.tasks.gather(*ts, return_exceptions=True))
 
-            if finished:
-                loop.run_until_complete(asyncio.tasks.gather(*finished, return_exceptions=True))
+        self._test_tasks.clear()
 
-    def _add_new_task(self, loop: asyncio.AbstractEventLoop, task: asyncio.Task[object]) -> None:
-        self._cleanup_completed_tasks()
-        self._test_tasks[loop].append(task)
+    def convert_items(self, items: Sequence[pytest.Item]) -> bool:
+        """
+        Convert the tests and every fixture they may use so that this doesn't
+        need to happen each time a fixture is setup or a test is run.
 
-    def sessionfinish(self) -> None:
-        for loop, tasks in self._test_tasks.items():
-            ts = []
-            for t in tasks:
-                if not t.done():
-                    t.cancel()
-                    ts.append(t)
+        When ``sync_fast_path`` is on, sync tests and fixtures that have nothing
+        to do with async code are left alone and False is returned if that's
+        all of them.
+        """
+        functions = [
+            item
+            for item in items
+            if isinstance(item, pytest.Function) and not isinstance(item, TestCaseFunction)
+        ]
 
-            if ts:
-                loop.run_until_complete(asyncio.tasks.gather(*ts, return_exceptions=True))
+        if self.sync_fast_path:
+            plain_tests, plain_fixturedefs = _find_sync_only(functions)
+            self._plain_tests.update(plain_tests)
+            self._plain_fixturedefs.update(plain_fixturedefs)
+            if len(plain_tests) == len(functions):
+                return False
 
-    def convert_fixturedef(
-        self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
-    ) -> None:
-        if not hasattr(fixturedef, "func"):
+        seen: set[int] = set()
+        for item in functions:
+            self.convert_pyfunc(item)
+
+            # Parametrized tests share the same fixture info
+            fixtureinfo = item._fixtureinfo
+            if id(fixtureinfo) in seen:
+                continue
+            seen.add(id(fixtureinfo))
+
+            for fixturedefs in fixtureinfo.name2fixturedefs.values():
+                for fixturedef in fixturedefs:
+                    self.convert_fixturedef(fixturedef)
+
+        return True
+
+    def convert_fixturedef(self, fixturedef: pytest.FixtureDef[object]) -> None:
+        """
+        Wrap the function for this fixture so that it runs with our loop and
+        context. This only happens once for each fixture.
+        """
+        if not hasattr(fixturedef, "func") or fixturedef in self._plain_fixturedefs:
             return
 
         if hasattr(fixturedef.func, "__alt_asyncio_pytest_converted__"):
-            fixturedef.func = fixturedef.func.__alt_asyncio_pytest_original__  # type: ignore[misc,attr-defined]
+            return
 
         original = fixturedef.func
 
-        if inspect.iscoroutinefunction(fixturedef.func):
-            async_timeout_maker = self._get_async_timeout_maker(
-                request.scope, request.getfixturevalue
-            )
-            self._convert_async_coroutine_fixture(fixturedef, request, async_timeout_maker)
+        if inspect.iscoroutinefunction(original):
+            self._async_fixturedefs.add(fixturedef)
+            self._convert_async_coroutine_fixture(fixturedef)
 
-        elif inspect.isasyncgenfunction(fixturedef.func):
-            async_timeout_maker = self._get_async_timeout_maker(
-                request.scope, request.getfixturevalue
-            )
-            self._convert_async_gen_fixture(fixturedef, request, async_timeout_maker)
+        elif inspect.isasyncgenfunction(original):
+            self._async_fixturedefs.add(fixturedef)
+            self._convert_async_gen_fixture(fixturedef)
 
-        elif inspect.isgeneratorfunction(fixturedef.func):
+        elif inspect.isgeneratorfunction(original):
             self._convert_sync_gen_fixture(fixturedef)
 
         else:
@@ -91,33 +187,158 @@ class Converter:
         fixturedef.func.__alt_asyncio_pytest_converted__ = True  # type: ignore[attr-defined]
         fixturedef.func.__alt_asyncio_pytest_original__ = original  # type: ignore[attr-defined]
 
+    def setting_up_fixture(
+        self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
+    ) -> None:
+        """
+        Called before pytest sets up this fixture so that the wrapped fixture
+        knows the request it is being setup for.
+        """
+        self._fixture_requests[fixturedef] = request
+
+        if self.setup_fixtures_concurrently and fixturedef in self._async_fixturedefs:
+            self._start_independent_fixtures(request)
+
+    def finished_setting_up_fixture(self, fixturedef: pytest.FixtureDef[object]) -> None:
+        self._fixture_requests.pop(fixturedef, None)
+
     def convert_pyfunc(self, pyfuncitem: pytest.Function) -> None:
-        if inspect.iscoroutinefunction(pyfuncitem.obj):
-            _obj: Any = pyfuncitem.obj
-            func: Callable[..., Awaitable[object]] = _obj
+        """
+        Wrap the function for this test so that it runs with our loop and
+        context. This only happens once for each test.
+        """
+        if pyfuncitem in self._plain_tests:
+            return
 
-            async_timeout_maker = self._get_async_timeout_maker(
-                "function", pyfuncitem._request.getfixturevalue
-            )
+        obj = pyfuncitem.obj
+        if hasattr(obj, "__alt_asyncio_pytest_converted__"):
+            return
+
+        wrapped: Callable[..., object]
+        if inspect.iscoroutinefunction(obj):
+            func: Callable[..., Awaitable[object]] = obj
+            load_marker = pyfuncitem.get_closest_marker("async_load")
 
             @wraps(func)
             def run_test(*args: object, **kwargs: object) -> object:
-                async_timeout = async_timeout_maker()
-                res = self._run(async_timeout, func, args, kwargs)
+                if (outcome := self._concurrent_outcomes.pop(pyfuncitem, None)) is not None:
+                    # This test was already run with run_concurrent_tests
+                    async_timeout, res = outcome
+                else:
+                    async_timeout = self._get_async_timeout_maker(
+                        "function", pyfuncitem._request
+                    )()
+                    run = func
+                    if load_marker is not None:
+                        run = self._load_runner(pyfuncitem, func, load_marker, async_timeout)
+                    res = self._run(async_timeout, run, args, kwargs)
                 async_timeout.raise_maybe(func)
                 return res
 
-            pyfuncitem.obj = run_test
+            wrapped = run_test
         else:
-            original: Callable[..., object] = pyfuncitem.obj
-            pyfuncitem.obj = machinery.run_sync_with_ctx(self._ctx, original)
+            wrapped = machinery.run_sync_with_ctx(self._ctx, obj)
 
-    def _convert_async_coroutine_fixture(
+        wrapped.__alt_asyncio_pytest_converted__ = True  # type: ignore[attr-defined]
+        wrapped.__alt_asyncio_pytest_original__ = obj  # type: ignore[attr-defined]
+        pyfuncitem.obj = wrapped
+
+    def _load_runner(
         self,
-        fixturedef: pytest.FixtureDef[object],
-        request: pytest.FixtureRequest,
-        async_timeout_maker: base.AsyncTimeoutMaker,
-    ) -> None:
+        pyfuncitem: pytest.Function,
+        func: Callable[..., Awaitable[object]],
+        marker: pytest.Mark,
+        async_timeout: base.AsyncTimeout,
+    ) -> Callable[..., Awaitable[None]]:
+        """
+        Return a function that runs the body of this test many times at once
+        as ``pytest.mark.async_load`` asks for.
+
+        The stats are put on the test for the ``async load`` report section,
+        including when the test times out part of the way through.
+        """
+        load_test = load_testing.LoadTest.from_marker(marker)
+
+        def record(stats: load_testing.LoadStats) -> None:
+            pyfuncitem.stash[load_testing.load_stats_key] = stats
+
+        async def run_load(*args: object, **kwargs: object) -> None:
+            __tracebackhide__ = True
+            if load_test.timeout is not None:
+                async_timeout.set_timeout_seconds(load_test.timeout)
+            first_error = await load_test.run(lambda: func(*args, **kwargs), record=record)
+            load_test.check(pyfuncitem.stash[load_testing.load_stats_key], first_error)
+
+        return run_load
+
+    def prepare_concurrent_test(self, pyfuncitem: pytest.Function) -> None:
+        """
+        Called after a test has been setup to say that it will be run with
+        ``run_concurrent_tests``.
+
+        The timeout is resolved here because it may need fixtures that can only
+        be created whilst the test is the active test for pytest.
+        """
+        self._concurrent_tests[pyfuncitem] = self._get_async_timeout_maker(
+            "function", pyfuncitem._request
+        )
+
+    def concurrent_test_failed(self, pyfuncitem: pytest.Function) -> bool:
+        """
+        Return whether this test raised an error other than a skip when it was
+        run with ``run_concurrent_tests``
+        """
+        outcome = self._concurrent_outcomes.get(pyfuncitem)
+        if outcome is None:
+            return False
+        error = outcome[0].error
+        return error is not None and not isinstance(error, pytest.skip.Exception)
+
+    def forget_concurrent_test(self, pyfuncitem: pytest.Function) -> None:
+        self._concurrent_tests.pop(pyfuncitem, None)
+        self._concurrent_outcomes.pop(pyfuncitem, None)
+
+    def run_concurrent_tests(self, pyfuncitems: Sequence[pytest.Function]) -> None:
+        """
+        Run the bodies of these tests as concurrent tasks on the loop.
+
+        Each test gets its own async_timeout and a copy of our context. The
+        outcome of each test is stored so that when pytest calls the test, it
+        gets the result or error from when it was run here.
+        """
+        __tracebackhide__ = True
+
+        if not pyfuncitems:
+            return
+
+        loop = asyncio.get_event_loop_policy().get_event_loop()
+
+        running: list[tuple[pytest.Function, base.AsyncTimeout, asyncio.Task[object]]] = []
+        for pyfuncitem in pyfuncitems:
+            async_timeout = self._concurrent_tests.pop(pyfuncitem)()
+            _obj: Any = original_test_function(pyfuncitem)
+            func: Callable[..., Awaitable[object]] = _obj
+            kwargs = {arg: pyfuncitem.funcargs[arg] for arg in pyfuncitem._fixtureinfo.argnames}
+            task = self._start_task(
+                loop, self._async_runner(async_timeout, func, (), kwargs), self._ctx.copy()
+            )
+            running.append((pyfuncitem, async_timeout, task))
+
+        self._complete(
+            loop,
+            lambda: asyncio.tasks.gather(
+                *(task for _, _, task in running), return_exceptions=True
+            ),
+        )
+
+        for pyfuncitem, async_timeout, task in running:
+            if task.cancelled():
+                async_timeout.error = asyncio.CancelledError()
+                self._concurrent_outcomes[pyfuncitem] = (async_timeout, None)
+            else:
+                self._concurrent_outcomes[pyfuncitem] = (async_timeout, task.result())
+
+    def _convert_async_coroutine_fixture(self, fixturedef: pytest.FixtureDef[object]) -> None:
         """
         Run our async fixture in our event loop and capture the error from
         inside the loop.
@@ -129,19 +350,19 @@ class Converter:
         def run_fixture(*args: object, **kwargs: object) -> object:
             __tracebackhide__ = True
 
-            async_timeout = async_timeout_maker()
-            res = self._run(async_timeout, func, args, kwargs)
+            if (started := self._started_fixtures.pop(fixturedef, None)) is not None:
+                async_timeout = started.async_timeout
+                res = self._wait(started.task)
+            else:
+                request = self._fixture_requests[fixturedef]
+                async_timeout = self._get_async_timeout_maker(request.scope, request)()
+                res = self._run(async_timeout, func, args, kwargs)
             async_timeout.raise_maybe(func)
             return res
 
         fixturedef.func = run_fixture  # type: ignore[misc]
 
-    def _convert_async_gen_fixture(
-        self,
-        fixturedef: pytest.FixtureDef[object],
-        request: pytest.FixtureRequest,
-        async_timeout_maker: base.AsyncTimeoutMaker,
-    ) -> None:
+    def _convert_async_gen_fixture(self, fixturedef: pytest.FixtureDef[object]) -> None:
         """
         Return the yield'd value from the generator and ensure the generator is
         finished.
@@ -153,43 +374,315 @@ class Converter:
         def run_fixture(*args: object, **kwargs: object) -> object:
             __tracebackhide__ = True
 
-            async_timeout = async_timeout_maker()
+            request = self._fixture_requests[fixturedef]
 
-            if "async_timeout" in kwargs:
-                kwargs["async_timeout"] = async_timeout
+            started = self._started_fixtures.pop(fixturedef, None)
+            if started is not None and started.gen_obj is not None:
+                async_timeout = started.async_timeout
+                gen_obj = started.gen_obj
+            else:
+                async_timeout = self._get_async_timeout_maker(request.scope, request)()
+
+                if "async_timeout" in kwargs:
+                    kwargs["async_timeout"] = async_timeout
 
-            gen_obj = generator(*args, **kwargs)
+                gen_obj = generator(*args, **kwargs)
+
+            async def async_finalizer() -> None:
+                __tracebackhide__ = True
+
+                async_timeout.use_default_timeout()
+                if not isinstance(async_timeout.error, StopAsyncIteration):
+                    await self._async_runner(async_timeout, gen_obj.__anext__, (), {})
+
+                if async_timeout.error is None:
+                    async_timeout.error = ValueError(
+                        "Async generator fixture should only yield once"
+                    )
 
             def finalizer() -> None:
                 """Yield again, to finalize."""
                 __tracebackhide__ = True
 
+                teardown = self._async_teardowns.get(fixturedef)
+                if teardown is not None and teardown.finalizer is finalizer:
+                    del self._async_teardowns[fixturedef]
+
                 if not async_timeout.run_count > 0:
                     return
 
-                async def async_finalizer() -> None:
-                    __tracebackhide__ = True
-
-                    async_timeout.use_default_timeout()
-                    if not isinstance(async_timeout.error, StopAsyncIteration):
-                        await self._async_runner(async_timeout, gen_obj.__anext__, (), {})
-
-                    if async_timeout.error is None:
-                        async_timeout.error = ValueError(
-                            "Async generator fixture should only yield once"
-                        )
-
-                self._run(async_timeout, async_finalizer, (), {})
+                if teardown is not None and teardown.task is not None:
+                    self._wait(teardown.task)
+                    if teardown.seconds is not None:
+                        self._teardown_seconds[fixturedef] = teardown.seconds
+                else:
+                    self._run(async_timeout, async_finalizer, (), {})
                 async_timeout.raise_maybe(generator)
 
             request.addfinalizer(finalizer)
+            if self.teardown_fixtures_concurrently:
+                self._async_teardowns[fixturedef] = _AsyncTeardown(
+                    fixturedef=fixturedef,
+                    node=request.node,
+                    async_timeout=async_timeout,
+                    async_finalizer=async_finalizer,
+                    finalizer=finalizer,
+                )
 
-            res = self._run(async_timeout, gen_obj.__anext__, (), {})
+            if started is not None:
+                res = self._wait(started.task)
+            else:
+                res = self._run(async_timeout, gen_obj.__anext__, (), {})
             async_timeout.raise_maybe(generator)
             return res
 
         fixturedef.func = run_fixture  # type: ignore[misc]
 
+    def _start_independent_fixtures(self, request: pytest.FixtureRequest) -> None:
+        """
+        Start tasks for every async fixture used by the current test that hasn't
+        been setup yet and only depends on fixtures that already have a value.
+
+        These tasks run together whenever the loop is run and are waited on when
+        pytest gets to setting up that fixture. This means pytest still decides
+        the order fixtures are setup in and still caches values and registers
+        finalizers as normal.
+        """
+        pyfuncitem = getattr(request, "_pyfuncitem", None)
+        if not isinstance(pyfuncitem, pytest.Function):
+            return
+
+        fixtureinfo = pyfuncitem._fixtureinfo
+        callspec = getattr(pyfuncitem, "callspec", None)
+        params: dict[str, object] = {} if callspec is None else callspec.params
+
+        loop = asyncio.get_event_loop_policy().get_event_loop()
+
+        for name in fixtureinfo.names_closure:
+            fixturedefs = fixtureinfo.name2fixturedefs.get(name)
+            if not fixturedefs or name in params:
+                continue
+
+            fixturedef = fixturedefs[-1]
+            if fixturedef in self._started_fixtures or fixturedef.cached_result is not None:
+                continue
+
+            if fixturedef.params is not None:
+                continue
+
+            func: Any = original_fixture_function(fixturedef)
+            is_generator = inspect.isasyncgenfunction(func)
+            if not is_generator and not inspect.iscoroutinefunction(func):
+                continue
+
+            kwargs = self._cached_arguments(fixturedef, fixtureinfo.name2fixturedefs, params)
+            if kwargs is None:
+                continue
+
+            async_timeout = self._get_async_timeout_maker(fixturedef.scope, pyfuncitem._request)()
+
+            gen_obj: AsyncGenerator[object] | None = None
+            if is_generator:
+                if "async_timeout" in kwargs:
+                    kwargs["async_timeout"] = async_timeout
+                gen_obj = func(**kwargs)
+                assert gen_obj is not None
+                coro = self._async_runner(async_timeout, gen_obj.__anext__, (), {})
+            else:
+                coro = self._async_runner(async_timeout, func, (), kwargs)
+
+            task = self._start_task(loop, coro, self._ctx)
+            self._started_fixtures[fixturedef] = _StartedFixture(
+                async_timeout=async_timeout, task=task, gen_obj=gen_obj
+            )
+
+    def _cached_arguments(
+        self,
+        fixturedef: pytest.FixtureDef[object],
+        name2fixturedefs: Mapping[str, Sequence[pytest.FixtureDef[Any]]],
+        params: dict[str, object],
+    ) -> dict[str, object] | None:
+        """
+        Return the arguments for this fixture if they all already have a value
+        that pytest would give to the fixture.
+        """
+        kwargs: dict[str, object] = {}
+        scope_index = _PytestScopes.index(fixturedef.scope)
+
+        for argname in fixturedef.argnames:
+            if argname == fixturedef.argname or argname in params:
+                return None
+
+            argdefs = name2fixturedefs.get(argname)
+            if not argdefs:
+                return None
+
+            argdef = argdefs[-1]
+            if _PytestScopes.index(argdef.scope) < scope_index:
+                return None
+
+            cached = argdef.cached_result
+            if cached is None or cached[2] is not None:
+                return None
+
+            kwargs[argname] = cached[0]
+
+        return kwargs
+
+    def discard_started_fixtures(self) -> None:
+        """
+        Cancel any fixtures that were started but never used by pytest. This happens
+        when the setup of a test fails before pytest gets to those fixtures.
+        """
+        started, self._started_fixtures = self._started_fixtures, {}
+
+        for fixture in started.values():
+            loop = fixture.task.get_loop()
+            self._on_loop(loop, fixture.task.cancel)
+            self._complete(
+                loop, functools.partial(asyncio.tasks.gather, fixture.task, return_exceptions=True)
+            )
+
+            if fixture.gen_obj is not None and fixture.async_timeout.run_count > 0:
+                closing = self._aclose(fixture.gen_obj)
+                self._complete(
+                    loop,
+                    lambda: asyncio.tasks.gather(
+                        loop.create_task(closing, context=self._ctx), return_exceptions=True
+                    ),
+                )
+
+    async def _aclose(self, gen_obj: AsyncGenerator[object]) -> None:
+        await gen_obj.aclose()
+
+    def teardown_concurrently(self, item: pytest.Item, nextitem: pytest.Item | None) -> None:
+        """
+        Run the finalizers of async generator fixtures that are about to be torn
+        down together.
+
+        The fixtures that are torn down are those that belong to nodes that pytest
+        will take off the setup state before moving onto nextitem. The finalizer
+        for a fixture is only started once nothing that depends on that fixture is
+        still alive, so this happens in waves. When pytest calls each finalizer
+        it waits on the task that was already started and raises the error for
+        that fixture.
+        """
+        if not self._async_teardowns:
+            return
+
+        stack = list(item.session._setupstate.stack)
+        needed = nextitem.listchain() if nextitem is not None else []
+        common = 0
+        while common < min(len(stack), len(needed)) and stack[common] is needed[common]:
+            common += 1
+        ending = stack[common:]
+
+        pending = {
+            fixturedef: teardown
+            for fixturedef, teardown in self._async_teardowns.items()
+            if teardown.task is None
+            and teardown.async_timeout.run_count > 0
+            and any(teardown.node is node for node in ending)
+        }
+
+        finished: set[pytest.FixtureDef[object]] = set()
+        while pending:
+            ready = [
+                teardown
+                for teardown in pending.values()
+                if not self._blocks_teardown(teardown, finished)
+            ]
+            if not ready:
+                break
+
+            loop = asyncio.get_event_loop_policy().get_event_loop()
+            tasks = []
+            for teardown in ready:
+                teardown.task = self._start_task(
+                    loop,
+                    self._async_runner(teardown.async_timeout, teardown.async_finalizer, (), {}),
+                    self._ctx,
+                    done_callback=functools.partial(
+                        self._finished_teardown, teardown, time.perf_counter()
+                    ),
+                )
+                tasks.append(teardown.task)
+                finished.add(teardown.fixturedef)
+                del pending[teardown.fixturedef]
+
+            self._complete(loop, lambda: asyncio.tasks.gather(*tasks, return_exceptions=True))
+
+    def _finished_teardown(
+        self, teardown: _AsyncTeardown, started: float, task: asyncio.Task[None]
+    ) -> None:
+        teardown.seconds = time.perf_counter() - started
+
+    def concurrent_teardown_seconds(self, fixturedef: pytest.FixtureDef[object]) -> float | None:
+        """
+        Return how long the teardown of this fixture took if it was run by
+        ``teardown_concurrently``, as the finalizer pytest calls only waits for it
+        """
+        return self._teardown_seconds.pop(fixturedef, None)
+
+    def watch_teardown(self, fixturedef: pytest.FixtureDef[object]) -> None:
+        """
+        Remember when the teardown of this fixture starts, for
+        ``teardown_started``. This is called after each setup of the fixture and
+        only adds one finalizer however many times it is called.
+        """
+        if fixturedef in self._watched_teardowns:
+            return
+        self._watched_teardowns.add(fixturedef)
+
+        # Finalizers are run last first, so this runs before the teardown
+        # of the fixture and after anything that depends on it
+        @passive_finalizer
+        def start_teardown() -> None:
+            self._teardown_starts[fixturedef] = time.perf_counter_ns()
+
+        fixturedef.addfinalizer(start_teardown)
+
+    def teardown_started(self, fixturedef: pytest.FixtureDef[object]) -> int | None:
+        """
+        Return ``time.perf_counter_ns()`` from when the teardown of this fixture
+        started if it was watched with ``watch_teardown``
+        """
+        return self._teardown_starts.get(fixturedef)
+
+    def finished_teardown(self, fixturedef: pytest.FixtureDef[object]) -> None:
+        self._watched_teardowns.discard(fixturedef)
+        self._teardown_starts.pop(fixturedef, None)
+
+    def _blocks_teardown(
+        self, teardown: _AsyncTeardown, finished: set[pytest.FixtureDef[object]]
+    ) -> bool:
+        """
+        Return whether pytest would run something before this finalizer that must
+        not happen after it.
+
+        Pytest runs the finalizers of a fixture in reverse order. Those include the
+        teardown of every fixture that depends on this fixture. So if any of those
+        are still alive, or there are finalizers we don't know about that would run
+        before ours, then we can't run this finalizer early.
+        """
+        finalizers = teardown.fixturedef._finalizers
+        if teardown.finalizer not in finalizers:
+            return True
+
+        after_ours = finalizers[finalizers.index(teardown.finalizer) + 1 :]
+        for fin in after_ours:
+            if getattr(fin, "__alt_asyncio_pytest_passive__", False):
+                # Doesn't care when the teardown happens
+                continue
+
+            dependent = getattr(getattr(fin, "func", None), "__self__", None)
+            if not isinstance(dependent, pytest.FixtureDef):
+                return True
+            if dependent.cached_result is not None and dependent not in finished:
+                return True
+
+        return False
+
     def _convert_sync_fixture(self, fixturedef: pytest.FixtureDef[object]) -> None:
         """
         Used to make sure a non-async fixture is run in our
@@ -242,12 +735,45 @@ class Converter:
 
         return None
 
+    def run_for_request(
+        self,
+        request: pytest.FixtureRequest,
+        func: Callable[[base.AsyncTimeout], Awaitable[protocols.T_Ret]],
+    ) -> protocols.T_Ret:
+        """
+        Run this function on the loop for the test this request is for, with
+        the ``async_timeout`` that test would get, from sync code.
+
+        The sync code is already running in our context, so the function gets a
+        copy of it.
+        """
+        __tracebackhide__ = True
+        async_timeout = self._get_async_timeout_maker("function", request)()
+        res = self._run(
+            async_timeout,
+            func,
+            (),
+            {"async_timeout": async_timeout},
+            context=contextvars.copy_context(),
+        )
+        async_timeout.raise_maybe(func)
+        return cast(protocols.T_Ret, res)
+
+    def run_on_loop(self, make: Callable[[], Awaitable[protocols.T_Ret]]) -> protocols.T_Ret:
+        """
+        Run what ``make`` returns on the session loop from sync code that isn't
+        part of a fixture or test.
+        """
+        return self._complete(asyncio.get_event_loop_policy().get_event_loop(), make)
+
     def _run(
         self,
         async_timeout: base.AsyncTimeout,
         func: Callable[..., Awaitable[protocols.T_Ret]],
         args: object,
         kwargs: object,
+        *,
+        context: contextvars.Context | None = None,
     ) -> protocols.T_Ret | None:
         __tracebackhide__ = True
 
@@ -260,35 +786,380 @@ class Converter:
             return
 
         loop = asyncio.get_event_loop_policy().get_event_loop()
-        task = loop.create_task(
-            self._async_runner(async_timeout, func, args, kwargs), context=self._ctx
+        task = self._start_task(
+            loop,
+            self._async_runner(async_timeout, func, args, kwargs),
+            self._ctx if context is None else context,
+            done_callback=silent_done_task,
         )
-        task.add_done_callback(silent_done_task)
-        self._add_new_task(loop, task)
 
-        return loop.run_until_complete(task)
+        return self._wait(task)
+
+    def _wait(self, task: asyncio.Task[protocols.T_Ret]) -> protocols.T_Ret:
+        __tracebackhide__ = True
+        if task.done():
+            # Eager tasks may have finished without needing the loop
+            return task.result()
+
+        return self._complete(task.get_loop(), lambda: task)
+
+    def _on_loop(
+        self, loop: asyncio.AbstractEventLoop, func: Callable[[], protocols.T_Ret]
+    ) -> protocols.T_Ret:
+        """
+        Call this function from the thread that runs this loop.
+
+        Only the loop in ``loop_thread`` is run by another thread. For other
+        loops, the function is called straight away.
+        """
+        if self.loop_thread is not None and self.loop_thread.runs(loop):
+            with self._watching(loop):
+                return self.loop_thread.call(func)
+        return func()
+
+    def _complete(
+        self, loop: asyncio.AbstractEventLoop, make: Callable[[], Awaitable[protocols.T_Ret]]
+    ) -> protocols.T_Ret:
+        """
+        Wait for what ``make`` returns to be done on this loop and return the
+        result. ``make`` is called from the thread that runs this loop.
+        """
+        __tracebackhide__ = True
+        with self._watching(loop):
+            if self.loop_thread is not None and self.loop_thread.runs(loop):
+                return self.loop_thread.wait(
+                    self.loop_thread.call(lambda: asyncio.ensure_future(make()))
+                )
+            return loop.run_until_complete(make())
+
+    def _start_task(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[object, object, protocols.T_Ret],
+        context: contextvars.Context,
+        *,
+        done_callback: Callable[[asyncio.Task[protocols.T_Ret]], object] | None = None,
+    ) -> asyncio.Task[protocols.T_Ret]:
+        """
+        Create a task for this coroutine on the thread that runs this loop and
+        remember it until it is done.
+        """
+
+        def start() -> asyncio.Task[protocols.T_Ret]:
+            task = self._create_task(loop, coro, context)
+            if done_callback is not None:
+                task.add_done_callback(done_callback)
+            self._add_new_task(loop, task)
+            return task
+
+        return self._on_loop(loop, start)
+
+    def _watching(
+        self, loop: asyncio.AbstractEventLoop
+    ) -> contextlib.AbstractContextManager[None]:
+        """
+        Used around everything that runs code from fixtures and tests so that
+        ``loop_watchers`` can see when the loop is blocked.
+        """
+        if not self.loop_watchers or loop in self._watched_loops:
+            # The watchers are already watching this loop further up
+            return contextlib.nullcontext()
+        return self._watching_all(loop)
+
+    @contextlib.contextmanager
+    def _watching_all(self, loop: asyncio.AbstractEventLoop) -> Iterator[None]:
+        self._watched_loops.add(loop)
+        try:
+            with contextlib.ExitStack() as stack:
+                for watcher in self.loop_watchers:
+                    stack.enter_context(watcher.watching(loop))
+                yield
+        finally:
+            self._watched_loops.discard(loop)
+
+    def _create_task(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[object, object, protocols.T_Ret],
+        context: contextvars.Context,
+    ) -> asyncio.Task[protocols.T_Ret]:
+        """
+        Create a task for this coroutine, starting it straight away if we are
+        using eager tasks.
+
+        The loop is marked as running whilst the task starts so that the first
+        step of the coroutine happens straight away and can use the loop as it
+        would when run by the loop. A test or fixture that never has to wait is
+        then done without running the loop at all.
+        """
+        token = _making_own_task.set(True)
+        try:
+            return self._make_task(loop, coro, context)
+        finally:
+            _making_own_task.reset(token)
+
+    def _make_task(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[object, object, protocols.T_Ret],
+        context: contextvars.Context,
+    ) -> asyncio.Task[protocols.T_Ret]:
+        if sys.version_info >= (3, 12) and self.eager_tasks:
+            if asyncio.events._get_running_loop() is loop:
+                # We're already on the thread running the loop
+                return asyncio.Task(coro, loop=loop, context=context, eager_start=True)
+
+            if isinstance(loop, asyncio.BaseEventLoop) and not loop.is_running():
+                # A task only starts eagerly when its loop is running, so mark
+                # the loop as running from this thread, as run_forever does,
+                # whilst the first step of the coroutine runs
+                running = asyncio.events._get_running_loop()
+                loop._thread_id = threading.get_ident()  # type: ignore[attr-defined]
+                asyncio.events._set_running_loop(loop)
+                try:
+                    with self._watching(loop):
+                        return asyncio.Task(coro, loop=loop, context=context, eager_start=True)
+                finally:
+                    loop._thread_id = None  # type: ignore[attr-defined]
+                    asyncio.events._set_running_loop(running)
+
+        return loop.create_task(coro, context=context)
 
     def _get_async_timeout_maker(
-        self, scope: str, getfixturevalue: Callable[[str], object]
+        self, scope: str, request: pytest.FixtureRequest
     ) -> base.AsyncTimeoutMaker:
+        """
+        Return a function that makes the async_timeout for a fixture or test
+        with this scope.
+
+        The default timeout and timeout provider for a scope other than
+        ``function`` are the same for everything in that scope and so are
+        remembered for the node for that scope until one of those fixtures is
+        torn down.
+        """
         assert scope in _PytestScopes
 
-        default_timeout: float = 5
-        for scope in _PytestScopes[_PytestScopes.index(scope) :]:
-            name = "default_async_timeout"
-            if scope != "function":
-                name = f"{scope}_{name}"
+        item = request._pyfuncitem
+        node = None if scope == "function" else _scope_node(item, scope)
 
+        if node is not None and (found := self._timeouts.get((scope, node))) is not None:
+            default_timeout, async_timeout_provider = found
+        else:
+            default_timeout = 5
+            if (name := self._default_timeout_name(scope, item, request)) is not None:
+                default_timeout_fix = request.getfixturevalue(name)
+                assert isinstance(default_timeout_fix, int | float)
+                default_timeout = default_timeout_fix
+
+            provider = request.getfixturevalue("async_timeout")
+            assert isinstance(provider, base.AsyncTimeoutProvider)
+            async_timeout_provider = provider
+
+            if node is not None:
+                self._timeouts[(scope, node)] = (default_timeout, async_timeout_provider)
+
+        return lambda: async_timeout_provider.load(default_timeout=default_timeout)
+
+    def _default_timeout_name(
+        self, scope: str, item: pytest.Item, request: pytest.FixtureRequest
+    ) -> str | None:
+        """
+        Return the name of the closest default timeout fixture for this scope.
+
+        Tests with the same parent can see the same fixtures, so the name is
+        remembered per parent to avoid looking for fixtures that don't exist
+        every time. Unless the test parametrizes one of those fixtures directly.
+        """
+        names = [
+            "default_async_timeout" if s == "function" else f"{s}_default_async_timeout"
+            for s in _PytestScopes[_PytestScopes.index(scope) :]
+        ]
+
+        callspec = getattr(item, "callspec", None)
+        cacheable = callspec is None or not any(name in callspec.params for name in names)
+
+        key = (scope, item.parent)
+        if cacheable and key in self._timeout_names:
+            return self._timeout_names[key]
+
+        found: str | None = None
+        for name in names:
             try:
-                default_timeout_fix = getfixturevalue(name)
+                request.getfixturevalue(name)
             except pytest.FixtureLookupError:
                 pass
             else:
-                assert isinstance(default_timeout_fix, int | float)
-                default_timeout = default_timeout_fix
+                found = name
                 break
 
-        async_timeout_provider = getfixturevalue("async_timeout")
-        assert isinstance(async_timeout_provider, base.AsyncTimeoutProvider)
+        if cacheable:
+            self._timeout_names[key] = found
+        return found
 
-        return lambda: async_timeout_provider.load(default_timeout=default_timeout)
+    def forget_timeouts(self, fixturedef: pytest.FixtureDef[object]) -> None:
+        """
+        Forget the default timeouts we found once a fixture they came from is
+        torn down.
+        """
+        argname = fixturedef.argname
+        if argname == "async_timeout" or argname.endswith("default_async_timeout"):
+            self._timeouts.clear()
+
+
+def _scope_node(item: pytest.Item, scope: str) -> Node | None:
+    """
+    Return the node that fixtures with this scope belong to for this test.
+    """
+    if scope == "session":
+        return item.session
+    elif scope == "package":
+        return item.getparent(pytest.Package)
+    elif scope == "module":
+        return item.getparent(pytest.Module)
+    elif scope == "class":
+        return item.getparent(pytest.Class)
+    else:
+        return None
+
+
+def _is_async(func: object) -> bool:
+    return (
+        inspect.iscoroutinefunction(func)
+        or inspect.isasyncgenfunction(func)
+        or getattr(func, "__alt_asyncio_pytest_needs_loop__", False)
+    )
+
+
+def _find_sync_only(
+    items: Sequence[pytest.Function],
+) -> tuple[set[pytest.Function], set[pytest.FixtureDef[object]]]:
+    """
+    Return the tests and fixtures that don't need to be run in our context.
+
+    That is sync tests that don't use any async fixtures, and the sync fixtures
+    that are only used by those tests. A sync test that shares a fixture with
+    async code must still run in our context so that it sees any context
+    variables that fixture sets, and so must every other fixture it uses.
+    """
+    by_fixtureinfo: dict[int, list[pytest.FixtureDef[object]]] = {}
+    fixturedefs_for: dict[pytest.Function, list[pytest.FixtureDef[object]]] = {}
+    is_async: dict[pytest.FixtureDef[object], bool] = {}
+    users: dict[pytest.FixtureDef[object], list[pytest.Function]] = {}
+
+    needs_ctx: set[pytest.Function] = set()
+    pending: list[pytest.Function] = []
+
+    for item in items:
+        fixtureinfo = item._fixtureinfo
+        if (fixturedefs := by_fixtureinfo.get(id(fixtureinfo))) is None:
+            fixturedefs = by_fixtureinfo[id(fixtureinfo)] = [
+                fixturedef
+                for fixturedefs in fixtureinfo.name2fixturedefs.values()
+                for fixturedef in fixturedefs
+            ]
+            for fixturedef in fixturedefs:
+                if fixturedef not in is_async:
+                    is_async[fixturedef] = _is_async(original_fixture_function(fixturedef))
+
+        fixturedefs_for[item] = fixturedefs
+        if _is_async(original_test_function(item)) or any(is_async[f] for f in fixturedefs):
+            needs_ctx.add(item)
+            pending.append(item)
+        else:
+            for fixturedef in fixturedefs:
+                users.setdefault(fixturedef, []).append(item)
+
+    # Everything used by tests in our context is also in our context
+    # and so are the sync tests that use those fixtures
+    shared: set[pytest.FixtureDef[object]] = set()
+    while pending:
+        for fixturedef in fixturedefs_for[pending.pop()]:
+            if fixturedef in shared:
+                continue
+            shared.add(fixturedef)
+            for user in users.pop(fixturedef, ()):
+                if user not in needs_ctx:
+                    needs_ctx.add(user)
+                    pending.append(user)
+
+    return (
+        {item for item in items if item not in needs_ctx},
+        {fixturedef for fixturedef in is_async if fixturedef not in shared},
+    )
+
+
+def original_test_function(pyfuncitem: pytest.Function) -> object:
+    """
+    Return the function for this test from before we wrapped it
+    """
+    obj = pyfuncitem.obj
+    return getattr(obj, "__alt_asyncio_pytest_original__", obj)
+
+
+def original_fixture_function(fixturedef: pytest.FixtureDef[object]) -> object:
+    """
+    Return the function for this fixture from before we wrapped it
+    """
+    func = fixturedef.func
+    return getattr(func, "__alt_asyncio_pytest_original__", func)
+
+
+def making_own_task() -> bool:
+    """
+    Return whether the task being made is one we use to run a fixture or test,
+    for task factories that only care about the tasks made by the code in them
+    """
+    return _making_own_task.get()
+
+
+@contextlib.contextmanager
+def seeing_tasks(
+    loop: asyncio.AbstractEventLoop,
+    on_task: Callable[[asyncio.Future[object], Coroutine[object, object, object]], None],
+) -> Iterator[None]:
+    """
+    Call ``on_task`` with each task made on this loop, and the coroutine it
+    runs, whilst the code in this block runs.
+
+    This wraps whatever task factory the loop already has, and only puts that
+    back if nothing else has changed the task factory in the meantime.
+    """
+    original = loop.get_task_factory()
+
+    def factory(
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[object, object, object],
+        **kwargs: Any,
+    ) -> asyncio.Future[object]:
+        if original is not None:
+            task = original(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        on_task(task, coro)
+        return task
+
+    loop.set_task_factory(factory)  # type: ignore[arg-type]
+    try:
+        yield
+    finally:
+        if loop.get_task_factory() is factory:
+            loop.set_task_factory(original)
+
+
+def passive_finalizer(finalizer: Callable[[], None]) -> Callable[[], None]:
+    """
+    Mark a finalizer added to a fixture as not caring when it is run compared
+    to the teardown of that fixture. This lets the fixture still be torn down
+    early when ``--async-concurrent-teardown`` is used.
+    """
+    finalizer.__alt_asyncio_pytest_passive__ = True  # type: ignore[attr-defined]
+    return finalizer
+
+
+def needs_loop(fixture: T_Func) -> T_Func:
+    """
+    Mark a sync fixture as one that runs code on the session loop so that
+    ``--async-sync-fast-path`` doesn't leave the tests using it alone.
+    """
+    fixture.__alt_asyncio_pytest_needs_loop__ = True  # type: ignore[attr-defined]
+    return fixture
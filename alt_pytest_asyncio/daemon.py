@@ -0,0 +1,517 @@
+import ast
+import asyncio
+import contextlib
+import glob
+import importlib.util
+import json
+import os
+import pathlib
+import socket
+import sys
+import time
+import traceback
+from collections.abc import Callable, Sequence
+from typing import IO, Any, NoReturn
+
+import pytest
+
+from . import errors, forking
+
+
+def module_files(rootpath: pathlib.Path) -> dict[str, tuple[pathlib.Path, int]]:
+    """
+    Return the file and modification time of each imported module from this
+    project
+    """
+    found: dict[str, tuple[pathlib.Path, int]] = {}
+    for name, module in list(sys.modules.items()):
+        filename = getattr(module, "__file__", None)
+        if not filename:
+            continue
+
+        path = pathlib.Path(filename)
+        if not path.is_relative_to(rootpath) or "site-packages" in path.parts:
+            continue
+
+        with contextlib.suppress(OSError):
+            found[name] = (path, path.stat().st_mtime_ns)
+    return found
+
+
+def imported_modules(name: str, path: pathlib.Path) -> set[str]:
+    """
+    Return the names of the modules that the module with this name and file
+    imports
+    """
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return set()
+
+    package = name if path.name == "__init__.py" else name.rpartition(".")[0]
+    found: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            try:
+                module = importlib.util.resolve_name(
+                    "." * node.level + (node.module or ""), package
+                )
+            except (ImportError, ValueError):
+                continue
+
+            # The names may be modules of their own
+            found.add(module)
+            found.update(f"{module}.{alias.name}" for alias in node.names)
+    return found
+
+
+def forget_changed_modules(modules: dict[str, tuple[pathlib.Path, int]]) -> list[str]:
+    """
+    Remove the modules that changed since ``module_files``, and the modules
+    that import them, from ``sys.modules`` so they are imported again. Return
+    their names.
+
+    A ``conftest.py`` can't be imported again because pytest has already
+    registered it as a plugin, so a change that reaches one needs a restart.
+    """
+    changed: list[str] = []
+    for name, (path, mtime) in modules.items():
+        try:
+            if path.stat().st_mtime_ns == mtime:
+                continue
+        except OSError:
+            pass
+        changed.append(name)
+
+    if not changed:
+        return []
+
+    importers: dict[str, set[str]] = {}
+    for name, (path, _) in modules.items():
+        for imported in imported_modules(name, path):
+            importers.setdefault(imported, set()).add(name)
+
+    # Each stale module and the changed module that made it stale
+    stale = {name: name for name in changed}
+    pending = list(changed)
+    while pending:
+        name = pending.pop()
+        for importer in importers.get(name, ()):
+            if importer not in stale:
+                stale[importer] = stale[name]
+                pending.append(importer)
+
+    for name, cause in stale.items():
+        path = modules[name][0]
+        if path.name != "conftest.py":
+            continue
+
+        if cause == name:
+            raise errors.DaemonNeedsRestart(
+                f"{path} changed since the daemon started, it needs to be restarted"
+            )
+        raise errors.DaemonNeedsRestart(
+            f"{modules[cause][0]} changed since the daemon started and is imported by"
+            f" {path}, the daemon needs to be restarted"
+        )
+
+    for name in changed:
+        forget_bytecode(modules[name][0])
+    for name in stale:
+        sys.modules.pop(name, None)
+    return sorted(stale)
+
+
+def forget_bytecode(path: pathlib.Path) -> None:
+    """
+    Remove the bytecode cached for this file by python and by pytest's
+    assertion rewriting. Both only notice a change to the file if it's at
+    least a second later or changes its size.
+    """
+    with contextlib.suppress(NotImplementedError, ValueError):
+        cached = pathlib.Path(importlib.util.cache_from_source(str(path)))
+        for found in cached.parent.glob(f"{glob.escape(path.stem)}.*.pyc"):
+            with contextlib.suppress(OSError):
+                found.unlink()
+
+
+# The options from the command line of a client that the daemon uses for the
+# tests it runs for that client. These only change which tests are run and how
+# their results are shown
+CLIENT_OPTIONS = (
+    "keyword",
+    "markexpr",
+    "deselect",
+    "ignore",
+    "ignore_glob",
+    "continue_on_collection_errors",
+    "runxfail",
+    "maxfail",
+    "verbose",
+    "tbstyle",
+    "showlocals",
+    "fulltrace",
+    "showcapture",
+    "reportchars",
+    "durations",
+    "durations_min",
+    "disable_warnings",
+    "color",
+    "code_highlight",
+    "no_header",
+    "no_summary",
+)
+
+
+def use_client_options(
+    config: pytest.Config, command_line: Sequence[str], invocation_dir: pathlib.Path
+) -> None:
+    """
+    Use the ``CLIENT_OPTIONS`` from the command line of a client.
+
+    Any other option would need to be used before the daemon collected the
+    tests, so it must be given to the daemon when it starts. The plugins
+    asked for with ``-p`` must already be the same in the daemon.
+    """
+    parser = config._parser
+    given, unknown = parser.parse_known_and_unknown_args(command_line)
+    defaults = parser.parse_known_args([])
+
+    rejected = [arg for arg in unknown if arg.startswith("-")]
+    for dest, value in vars(given).items():
+        if dest in CLIENT_OPTIONS or dest in ("file_or_dir", "async_daemon_connect"):
+            continue
+        if value == getattr(defaults, dest, None):
+            continue
+
+        if dest == "plugins":
+            rejected.extend(f"-p {name}" for name in value if not _has_plugin(config, name))
+        else:
+            rejected.append(_option_name(parser, dest))
+
+    if rejected:
+        raise pytest.UsageError(
+            f"The async daemon can't use {', '.join(rejected)} from the command line,"
+            " start the daemon with them instead"
+        )
+
+    for dest in CLIENT_OPTIONS:
+        value = getattr(given, dest)
+        if dest in ("ignore", "ignore_glob") and value:
+            value = [str(invocation_dir / path) for path in value]
+        setattr(config.option, dest, value)
+
+
+def _has_plugin(config: pytest.Config, name: str) -> bool:
+    if name.startswith("no:"):
+        return config.pluginmanager.is_blocked(name[3:])
+    return config.pluginmanager.has_plugin(name)
+
+
+def _option_name(parser: pytest.Parser, dest: str) -> str:
+    for group in parser._groups:
+        for option in group.options:
+            if option.dest == dest:
+                return option.names()[-1]
+    return dest
+
+
+class _ReuseDirectories:
+    """
+    Give the tests collected for a client the directories that were collected
+    when the daemon started.
+
+    The fixtures from a ``conftest.py`` are only found once, for the
+    directory the ``conftest.py`` is in, and newer versions of pytest only
+    give those fixtures to tests inside that same directory object.
+    """
+
+    def __init__(self, directories: dict[pathlib.Path, pytest.Directory]) -> None:
+        self.directories = directories
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collect_directory(
+        self, path: pathlib.Path, parent: pytest.Collector
+    ) -> pytest.Collector | None:
+        directory = self.directories.get(path)
+        if directory is None or directory.parent is not parent:
+            return None
+        return directory
+
+
+class _CollectErrors:
+    def __init__(self) -> None:
+        self.reports: list[pytest.CollectReport] = []
+
+    @pytest.hookimpl
+    def pytest_collectreport(self, report: pytest.CollectReport) -> None:
+        if report.failed:
+            self.reports.append(report)
+
+
+class Daemon:
+    """
+    A pytest plugin that collects the tests, sets up the session scoped async
+    fixtures they use and then waits for ``DaemonClient`` to ask for tests on
+    a unix socket at ``path``.
+
+    Each request is run in a process forked from this one, so it starts with
+    the fixtures already setup and nothing left behind by earlier requests.
+    That process collects the tests again, importing the modules that changed
+    since the daemon started, and writes the reports to the client.
+
+    The loop in this process runs the whole time, so servers started by those
+    fixtures keep answering. The fixtures are torn down when the daemon is
+    stopped with ctrl-c.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: pathlib.Path,
+        in_worker: Callable[[contextlib.ExitStack], None],
+        running: Callable[[pytest.Item], contextlib.AbstractContextManager[None]],
+    ) -> None:
+        self.path = path
+        self.in_worker = in_worker
+        self.running = running
+        self._directories: dict[pathlib.Path, pytest.Directory] = {}
+
+    @pytest.hookimpl
+    def pytest_collectstart(self, collector: pytest.Collector) -> None:
+        if isinstance(collector, pytest.Directory):
+            self._directories.setdefault(collector.path, collector)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session: pytest.Session) -> bool | None:
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            return None
+        if session.config.option.collectonly:
+            return None
+
+        reporter: Any = session.config.pluginmanager.get_plugin("terminalreporter")
+        last = session.items[-1] if session.items else None
+        try:
+            keep = forking.share_session_fixtures(session, session.items)
+            modules = module_files(session.config.rootpath)
+            if reporter is not None:
+                reporter.write_line(f"async daemon listening on {self.path}")
+
+            loop = asyncio.get_event_loop_policy().get_event_loop()
+            loop.run_until_complete(self._serve(session, keep, modules, reporter))
+        finally:
+            with contextlib.suppress(OSError):
+                self.path.unlink()
+            forking.teardown_session(session, last)
+        return True
+
+    async def _serve(
+        self,
+        session: pytest.Session,
+        keep: int,
+        modules: dict[str, tuple[pathlib.Path, int]],
+        reporter: Any,
+    ) -> None:
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            start = time.monotonic()
+            try:
+                line = await reader.readline()
+                if not line.endswith(b"\n"):
+                    return
+
+                request = json.loads(line)
+                # The child gets a blocking copy of the connection to write to
+                fd = os.dup(writer.get_extra_info("socket").fileno())
+                if (pid := forking.fork(session.config)) == 0:
+                    self._run(session, keep, modules, request, fd)
+                os.close(fd)
+            finally:
+                writer.close()
+
+            exitcode = await self._wait_for(pid)
+            if reporter is not None:
+                took = f"ran {' '.join(request['args'])} in {time.monotonic() - start:.2f}s"
+                if exitcode != 0:
+                    took = f"{took} (the process running the tests exited with {exitcode})"
+                reporter.write_line(took)
+
+        server = await asyncio.start_unix_server(handle, path=str(self.path))
+        async with server:
+            await server.serve_forever()
+
+    async def _wait_for(self, pid: int) -> int:
+        loop = asyncio.get_running_loop()
+        pidfd = os.pidfd_open(pid)
+        exited: asyncio.Future[None] = loop.create_future()
+
+        def on_exit() -> None:
+            if not exited.done():
+                exited.set_result(None)
+
+        loop.add_reader(pidfd, on_exit)
+        try:
+            await exited
+        finally:
+            loop.remove_reader(pidfd)
+            os.close(pidfd)
+
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status)
+
+    def _run(
+        self,
+        session: pytest.Session,
+        keep: int,
+        modules: dict[str, tuple[pathlib.Path, int]],
+        request: dict[str, Any],
+        fd: int,
+    ) -> NoReturn:
+        """
+        Collect and run the tests from this request in a forked process and
+        write the results to ``fd``. This never returns.
+        """
+        config = session.config
+        status = 0
+        os.set_blocking(fd, True)
+        out = os.fdopen(fd, "w")
+        try:
+            forking.in_child(session, keep, quiet=True)
+            with contextlib.ExitStack() as stack:
+                self.in_worker(stack)
+                forget_changed_modules(modules)
+                config.pluginmanager.register(_ReuseDirectories(self._directories))
+
+                use_client_options(
+                    config, request["command_line"], pathlib.Path(request["invocation_dir"])
+                )
+                collect_errors = _CollectErrors()
+                config.pluginmanager.register(collect_errors)
+                session.perform_collect(request["args"])
+
+                forking.send(
+                    out,
+                    collected=len(session.items),
+                    errors=[
+                        config.hook.pytest_report_to_serializable(config=config, report=report)
+                        for report in collect_errors.reports
+                    ],
+                )
+                if not collect_errors.reports or config.option.continue_on_collection_errors:
+                    forking.run_items(config, session.items, out, self.running)
+        except errors.DaemonNeedsRestart as error:
+            status = 1
+            self._send_error(out, str(error), usage=True)
+        except pytest.UsageError as error:
+            status = 1
+            self._send_error(out, "\n".join(error.args), usage=True)
+        except BaseException:
+            status = 1
+            self._send_error(
+                out, f"The daemon failed to run the tests:\n{traceback.format_exc()}", usage=False
+            )
+        finally:
+            with contextlib.suppress(OSError):
+                out.close()
+            os._exit(status)
+
+    def _send_error(self, out: IO[str], error: str, *, usage: bool) -> None:
+        """
+        Send an error to the client, which is shown as a usage error if the
+        client can do something about it and as an internal error otherwise
+        """
+        with contextlib.suppress(OSError):
+            forking.send(out, error=error, usage=usage)
+
+
+class DaemonClient:
+    """
+    A pytest plugin that asks the ``Daemon`` listening at ``path`` to run the
+    tests for this session instead of collecting and running them here.
+    """
+
+    def __init__(self, *, path: pathlib.Path) -> None:
+        self.path = path
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection(self, session: pytest.Session) -> bool:
+        return True
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session: pytest.Session) -> bool:
+        config = session.config
+        with contextlib.ExitStack() as stack:
+            sock = stack.enter_context(socket.socket(socket.AF_UNIX, socket.SOCK_STREAM))
+            try:
+                sock.connect(str(self.path))
+            except OSError as error:
+                raise pytest.UsageError(
+                    f"Failed to connect to the async daemon at {self.path}: {error}"
+                ) from error
+
+            fle = stack.enter_context(sock.makefile("rw"))
+            forking.send(
+                fle,
+                args=self._args(config),
+                command_line=[str(arg) for arg in config.invocation_params.args],
+                invocation_dir=str(config.invocation_params.dir),
+            )
+
+            for line in fle:
+                if not line.endswith("\n"):
+                    break
+
+                found = json.loads(line)
+                if "error" in found:
+                    if found["usage"]:
+                        raise pytest.UsageError(found["error"])
+                    raise errors.DaemonFailed(found["error"])
+
+                if "collected" in found:
+                    self._collected(session, found["collected"], found["errors"])
+                    continue
+
+                forking.log_reports(
+                    config.hook,
+                    found["nodeid"],
+                    tuple(found["location"]),
+                    forking.load_reports(config, found["reports"]),
+                )
+                if session.shouldfail:
+                    raise session.Failed(session.shouldfail)
+                if session.shouldstop:
+                    raise session.Interrupted(session.shouldstop)
+
+        return True
+
+    def _args(self, config: pytest.Config) -> Sequence[str]:
+        """
+        The daemon may have been started from another directory, so paths are
+        made absolute
+        """
+        args = []
+        for arg in config.args:
+            path, sep, rest = arg.partition("::")
+            args.append(f"{config.invocation_params.dir / path}{sep}{rest}")
+        return args
+
+    def _collected(self, session: pytest.Session, count: int, found: Sequence[object]) -> None:
+        config = session.config
+        session.testscollected = count
+        for data in found:
+            config.hook.pytest_collectreport(
+                report=config.hook.pytest_report_from_serializable(config=config, data=data)
+            )
+
+        reporter: Any = config.pluginmanager.get_plugin("terminalreporter")
+        if reporter is not None:
+            reporter.write_line(
+                f"collected {count} item{'s' if count != 1 else ''} in the async daemon"
+            )
+
+        if session.testsfailed and not config.option.continue_on_collection_errors:
+            raise session.Interrupted(
+                f"{session.testsfailed} error{'s' if session.testsfailed != 1 else ''}"
+                " during collection"
+            )
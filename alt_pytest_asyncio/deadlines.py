@@ -0,0 +1,149 @@
+import asyncio
+import heapq
+import time
+from collections.abc import Callable
+
+from . import per_loop, virtual_time
+
+
+class Deadline:
+    """
+    A point in real time after which a callback is called, unless the deadline
+    is moved or cancelled before then.
+
+    Moving a deadline doesn't touch the event loop unless it becomes the
+    earliest deadline for that loop.
+    """
+
+    def __init__(self, loop_deadlines: "_LoopDeadlines", callback: Callable[[], None]) -> None:
+        self.when: float | None = None
+        self._loop_deadlines = loop_deadlines
+        self._callback = callback
+        self._generation = 0
+
+    def remaining_seconds(self) -> float | None:
+        """
+        Return how many seconds are left, or None if the deadline isn't active
+        """
+        if self.when is None:
+            return None
+        return max(0.0, self.when - time.monotonic())
+
+    def set_seconds(self, seconds: float) -> None:
+        """
+        Move the deadline to this many seconds from now
+        """
+        self.set_when(time.monotonic() + seconds)
+
+    def set_when(self, when: float) -> None:
+        """
+        Move the deadline to this ``time.monotonic()`` value
+        """
+        self._loop_deadlines.schedule(self, when)
+
+    def cancel(self) -> None:
+        self._loop_deadlines.forget(self)
+
+    def _fire(self) -> None:
+        self._callback()
+
+
+class _LoopDeadlines:
+    """
+    The deadlines for one event loop, kept in a single heap with one timer on
+    the loop for the earliest of them.
+
+    Moved and cancelled deadlines are left in the heap and skipped when they
+    reach the top, unless there are enough of them that it's worth rebuilding
+    the heap.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self._heap: list[tuple[float, int, int, Deadline]] = []
+        self._count = 0
+        self._stale = 0
+        self._wakeup: asyncio.TimerHandle | None = None
+        self._wakeup_at: float | None = None
+
+    def schedule(self, deadline: Deadline, when: float) -> None:
+        if deadline.when is not None:
+            self._stale += 1
+
+        deadline.when = when
+        deadline._generation += 1
+        self._count += 1
+        heapq.heappush(self._heap, (when, self._count, deadline._generation, deadline))
+
+        if self._wakeup_at is None or when < self._wakeup_at:
+            self._wake_at(when)
+
+        self._compact_maybe()
+
+    def forget(self, deadline: Deadline) -> None:
+        if deadline.when is None:
+            return
+
+        deadline.when = None
+        deadline._generation += 1
+        self._stale += 1
+        self._compact_maybe()
+
+    def _compact_maybe(self) -> None:
+        if self._stale > 64 and self._stale * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if entry[2] == entry[3]._generation]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _wake_at(self, when: float) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+
+        self._wakeup_at = when
+        self._wakeup = virtual_time.call_later_wall_clock(
+            self.loop, max(0.0, when - time.monotonic()), self._fire
+        )
+
+    def _fire(self) -> None:
+        self._wakeup = None
+        self._wakeup_at = None
+
+        now = time.monotonic()
+        due: list[Deadline] = []
+        while self._heap:
+            when, _, generation, deadline = self._heap[0]
+            if generation != deadline._generation:
+                heapq.heappop(self._heap)
+                self._stale -= 1
+                continue
+
+            if when > now:
+                break
+
+            heapq.heappop(self._heap)
+            deadline.when = None
+            deadline._generation += 1
+            due.append(deadline)
+
+        if self._heap:
+            self._wake_at(self._heap[0][0])
+
+        for deadline in due:
+            deadline._fire()
+
+
+class DeadlineManager:
+    """
+    Keeps track of deadlines for each event loop, so that there is only ever
+    one timer on a loop for all the deadlines on that loop.
+    """
+
+    def __init__(self) -> None:
+        self._loops: per_loop.PerLoop[_LoopDeadlines] = per_loop.PerLoop()
+
+    def deadline(self, loop: asyncio.AbstractEventLoop, callback: Callable[[], None]) -> Deadline:
+        """
+        Return a deadline on this loop that isn't active until it's given a time
+        """
+        loop_deadlines = self._loops.setdefault(loop, lambda: _LoopDeadlines(loop))
+        return Deadline(loop_deadlines, callback)
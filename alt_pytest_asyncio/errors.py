@@ -8,3 +8,47 @@ class PluginAlreadyStarted(AltPytestAsyncioError):
 
 class NoAsyncTimeoutInSyncFunctions(AltPytestAsyncioError):
     pass
+
+
+class LoopFactoryNotFound(AltPytestAsyncioError):
+    pass
+
+
+class VirtualTimeNotSupported(AltPytestAsyncioError):
+    pass
+
+
+class HardTimeout(AltPytestAsyncioError):
+    pass
+
+
+class ResourceLeak(AltPytestAsyncioError):
+    pass
+
+
+class ResourceLeakWarning(UserWarning):
+    pass
+
+
+class BenchmarkInAsyncFunction(AltPytestAsyncioError):
+    pass
+
+
+class BenchmarkRegression(AltPytestAsyncioError):
+    pass
+
+
+class LoadTestFailed(AltPytestAsyncioError):
+    pass
+
+
+class SharedSetupFailed(AltPytestAsyncioError):
+    pass
+
+
+class DaemonNeedsRestart(AltPytestAsyncioError):
+    pass
+
+
+class DaemonFailed(AltPytestAsyncioError):
+    pass
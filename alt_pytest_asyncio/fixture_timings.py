@@ -0,0 +1,152 @@
+import dataclasses
+import inspect
+import json
+import pathlib
+import time
+from collections.abc import Generator
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from . import converter
+
+
+@dataclasses.dataclass(kw_only=True)
+class FixtureTiming:
+    """
+    How long a fixture spent being setup and torn down across the session
+    """
+
+    name: str
+    scope: str
+    baseid: str
+    is_async: bool
+    setups: int = 0
+    setup_seconds: float = 0
+    slowest_setup: float = 0
+    teardowns: int = 0
+    teardown_seconds: float = 0
+    slowest_teardown: float = 0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.setup_seconds + self.teardown_seconds
+
+    def add_setup(self, seconds: float) -> None:
+        self.setups += 1
+        self.setup_seconds += seconds
+        self.slowest_setup = max(self.slowest_setup, seconds)
+
+    def add_teardown(self, seconds: float) -> None:
+        self.teardowns += 1
+        self.teardown_seconds += seconds
+        self.slowest_teardown = max(self.slowest_teardown, seconds)
+
+
+class FixtureTimings:
+    """
+    A pytest plugin that times the setup and teardown of each async fixture,
+    and optionally sync fixtures, and adds up those times for each fixture
+    across the session.
+
+    Teardowns run early by ``--async-concurrent-teardown`` are timed by the
+    ``converter`` as the finalizer pytest calls only waits for them to finish.
+
+    The slowest ``show`` fixtures are shown at the end of the session (all of
+    them if ``show`` is 0) and every timing is written to ``json_path`` as JSON
+    if it is given.
+    """
+
+    def __init__(
+        self,
+        *,
+        converter: converter.Converter,
+        show: int | None = None,
+        json_path: pathlib.Path | None = None,
+        include_sync: bool = False,
+    ) -> None:
+        self.converter = converter
+        self.show = show
+        self.json_path = json_path
+        self.include_sync = include_sync
+        self.timings: dict[tuple[str, str, str], FixtureTiming] = {}
+
+    def _timing(self, fixturedef: pytest.FixtureDef[object]) -> FixtureTiming | None:
+        key = (fixturedef.baseid, fixturedef.argname, fixturedef.scope)
+        if (timing := self.timings.get(key)) is not None:
+            return timing
+
+        func = converter.original_fixture_function(fixturedef)
+        is_async = inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func)
+        if not is_async and not self.include_sync:
+            return None
+
+        timing = self.timings[key] = FixtureTiming(
+            name=fixturedef.argname,
+            scope=fixturedef.scope,
+            baseid=fixturedef.baseid,
+            is_async=is_async,
+        )
+        return timing
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(
+        self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
+    ) -> Generator[None, object, object]:
+        if (timing := self._timing(fixturedef)) is None:
+            return (yield)
+
+        start = time.perf_counter()
+        try:
+            return (yield)
+        finally:
+            timing.add_setup(time.perf_counter() - start)
+            self.converter.watch_teardown(fixturedef)
+
+    @pytest.hookimpl
+    def pytest_fixture_post_finalizer(
+        self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
+    ) -> None:
+        seconds = self.converter.concurrent_teardown_seconds(fixturedef)
+        if (start := self.converter.teardown_started(fixturedef)) is not None:
+            if (timing := self._timing(fixturedef)) is not None:
+                if seconds is None:
+                    seconds = (time.perf_counter_ns() - start) / 1e9
+                timing.add_teardown(seconds)
+
+    def slowest(self) -> list[FixtureTiming]:
+        return sorted(self.timings.values(), key=lambda timing: timing.total_seconds, reverse=True)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        if self.json_path is None:
+            return
+
+        self.json_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.json_path, "w") as fle:
+            json.dump([dataclasses.asdict(timing) for timing in self.slowest()], fle, indent=2)
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        if self.show is None or not self.timings:
+            return
+
+        slowest = self.slowest()
+        if self.show:
+            title = f"slowest {self.show} fixture durations"
+            slowest = slowest[: self.show]
+        else:
+            title = "fixture durations"
+
+        terminalreporter.section(title)
+        terminalreporter.line(
+            f"{'total':>9} {'setup':>9} {'setups':>7} {'teardown':>9} {'teardowns':>9}"
+            f"  {'scope':<8} fixture"
+        )
+        for timing in slowest:
+            location = f"{timing.baseid}::" if timing.baseid else ""
+            terminalreporter.line(
+                f"{timing.total_seconds:>8.3f}s {timing.setup_seconds:>8.3f}s {timing.setups:>7}"
+                f" {timing.teardown_seconds:>8.3f}s {timing.teardowns:>9}"
+                f"  {timing.scope:<8} {location}{timing.name}"
+            )
@@ -0,0 +1,396 @@
+import asyncio
+import contextlib
+import dataclasses
+import inspect
+import json
+import os
+import signal
+import sys
+import traceback
+import warnings
+from collections.abc import Callable, Iterator, Sequence
+from typing import IO, Any, NoReturn
+
+import pytest
+from _pytest.outcomes import TEST_OUTCOME
+from _pytest.runner import runtestprotocol
+
+from . import converter
+
+# Reports with long tracebacks are sent as a single line
+READ_LIMIT = 2**26
+
+
+def share_session_fixtures(session: pytest.Session, items: Sequence[pytest.Item]) -> int:
+    """
+    Setup the session and the session scoped async fixtures used by these
+    tests, and the fixtures they depend on, so that processes forked after
+    this get their values.
+
+    A fixture that fails is left in pytest's cache so that each test using
+    it fails as it would without forking.
+
+    Return what ``in_child`` needs to leave the teardown of those fixtures to
+    this process.
+    """
+    setupstate = session._setupstate
+    # The session is the only node that stays setup for every test
+    setupstate.setup(session)  # type: ignore[arg-type]
+    keep = len(setupstate.stack[session][0])
+
+    prepared: set[pytest.FixtureDef[object]] = set()
+    for item in items:
+        if not isinstance(item, pytest.Function):
+            continue
+
+        fixtureinfo = item._fixtureinfo
+        callspec = getattr(item, "callspec", None)
+        params: dict[str, object] = {} if callspec is None else callspec.params
+
+        for name in fixtureinfo.names_closure:
+            fixturedefs = fixtureinfo.name2fixturedefs.get(name)
+            if not fixturedefs or name in params:
+                continue
+
+            fixturedef = fixturedefs[-1]
+            if (
+                fixturedef in prepared
+                or fixturedef.scope != "session"
+                or fixturedef.params is not None
+            ):
+                continue
+
+            func = converter.original_fixture_function(fixturedef)
+            if not inspect.iscoroutinefunction(func) and not inspect.isasyncgenfunction(func):
+                continue
+
+            prepared.add(fixturedef)
+            with _requesting(item), contextlib.suppress(*TEST_OUTCOME):
+                item._request.getfixturevalue(name)
+
+    return keep
+
+
+@contextlib.contextmanager
+def _requesting(item: pytest.Item) -> Iterator[None]:
+    """
+    Make pytest think the nodes between the session and this test are setup,
+    which it wants before fixtures are requested for the test. Nothing is
+    setup for those nodes.
+    """
+    stack = item.session._setupstate.stack
+    pretend = [node for node in item.listchain() if node not in stack]
+    for node in pretend:
+        stack[node] = ([], None)
+    try:
+        yield
+    finally:
+        for node in pretend:
+            del stack[node]
+
+
+def teardown_session(session: pytest.Session, last: pytest.Item | None) -> None:
+    """
+    Teardown the session and report an error from that against the last test,
+    like pytest does
+    """
+    call = pytest.CallInfo.from_call(
+        lambda: session._setupstate.teardown_exact(None),
+        "teardown",
+        reraise=(pytest.exit.Exception, KeyboardInterrupt),
+    )
+    if call.excinfo is not None and last is not None:
+        report = last.ihook.pytest_runtest_makereport(item=last, call=call)
+        last.ihook.pytest_runtest_logreport(report=report)
+
+
+def fork(config: pytest.Config) -> int:
+    # Don't let the child write out what this process has buffered
+    config.get_terminal_writer().flush()
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    with warnings.catch_warnings():
+        # Python warns about forking whilst other threads are running.
+        # The threads from this plugin are started again in the child
+        warnings.simplefilter("ignore", DeprecationWarning)
+        return os.fork()
+
+
+def in_child(session: pytest.Session, keep: int, *, quiet: bool = False) -> None:
+    """
+    Called first in a process forked after ``share_session_fixtures``.
+
+    The files that pytest captures output into are shared with the parent, so
+    the child gets files of its own. With ``quiet`` anything written outside of
+    that capturing is thrown away.
+    """
+    # The fixtures setup before forking are torn down by the parent
+    del session._setupstate.stack[session][0][keep:]
+
+    capman: Any = session.config.pluginmanager.get_plugin("capturemanager")
+    if capman is not None and capman._global_capturing is not None:
+        capman._global_capturing.stop_capturing()
+        capman._global_capturing = None
+
+    if quiet:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        os.close(devnull)
+
+    if capman is not None:
+        capman.start_global_capturing()
+
+
+def run_items(
+    config: pytest.Config,
+    items: Sequence[pytest.Item],
+    out: IO[str],
+    running: Callable[[pytest.Item], contextlib.AbstractContextManager[None]],
+) -> None:
+    """
+    Run these tests without logging them and write a line of JSON with the
+    reports for each test to ``out``
+    """
+    for index, item in enumerate(items):
+        nextitem = items[index + 1] if index + 1 < len(items) else None
+        with running(item):
+            reports = runtestprotocol(item, log=False, nextitem=nextitem)
+
+        send(
+            out,
+            nodeid=item.nodeid,
+            location=item.location,
+            reports=[
+                config.hook.pytest_report_to_serializable(config=config, report=report)
+                for report in reports
+            ],
+        )
+
+
+def send(out: IO[str], **found: object) -> None:
+    out.write(json.dumps(found, default=str) + "\n")
+    out.flush()
+
+
+def load_reports(config: pytest.Config, found: Sequence[object]) -> list[pytest.TestReport]:
+    return [
+        config.hook.pytest_report_from_serializable(config=config, data=data) for data in found
+    ]
+
+
+def log_reports(
+    hook: Any, nodeid: str, location: tuple[str, int | None, str], reports: Sequence[object]
+) -> None:
+    """
+    Log the reports for a test that was run in another process
+    """
+    hook.pytest_runtest_logstart(nodeid=nodeid, location=location)
+    for report in reports:
+        hook.pytest_runtest_logreport(report=report)
+    hook.pytest_runtest_logfinish(nodeid=nodeid, location=location)
+
+
+class _Stopped(Exception):
+    pass
+
+
+@dataclasses.dataclass(kw_only=True)
+class _Forked:
+    pid: int
+    fd: int
+    items: Sequence[pytest.Item]
+    reported: int = 0
+    error: str | None = None
+    exitcode: int | None = None
+
+
+class ForkedWorkers:
+    """
+    A pytest plugin that sets up the session scoped async fixtures used by the
+    tests once and then forks ``count`` workers that each run a share of the
+    tests.
+
+    The workers see the values of those fixtures through the memory they share
+    with this process, run the tests on an event loop of their own and send
+    their reports back to this process, which is where they are logged. This
+    process keeps running its loop whilst it waits for the workers and tears
+    down the fixtures once they are all done.
+
+    ``in_worker`` is called in each worker to give it a loop of its own before
+    it runs any tests, and each test is run inside ``running(item)``.
+    """
+
+    def __init__(
+        self,
+        *,
+        count: int,
+        in_worker: Callable[[contextlib.ExitStack], None],
+        running: Callable[[pytest.Item], contextlib.AbstractContextManager[None]],
+    ) -> None:
+        self.count = count
+        self.in_worker = in_worker
+        self.running = running
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session: pytest.Session) -> bool | None:
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            return None
+        if session.config.option.collectonly:
+            return None
+
+        items = session.items
+        count = min(self.count, len(items))
+        if count < 2:
+            return None
+
+        try:
+            keep = share_session_fixtures(session, items)
+            forked = self._fork(session, items, count, keep)
+
+            finished = False
+            try:
+                loop = asyncio.get_event_loop_policy().get_event_loop()
+                finished = loop.run_until_complete(self._follow_all(session, forked))
+            finally:
+                self._reap(forked, kill=not finished)
+
+            if finished:
+                for worker in forked:
+                    self._report_lost(worker)
+        finally:
+            teardown_session(session, items[-1])
+
+        if session.shouldfail:
+            raise session.Failed(session.shouldfail)
+        if session.shouldstop:
+            raise session.Interrupted(session.shouldstop)
+        return True
+
+    def _fork(
+        self, session: pytest.Session, items: Sequence[pytest.Item], count: int, keep: int
+    ) -> list[_Forked]:
+        forked: list[_Forked] = []
+        for index in range(count):
+            share = items[index * len(items) // count : (index + 1) * len(items) // count]
+            read_fd, write_fd = os.pipe()
+
+            if (pid := fork(session.config)) == 0:
+                os.close(read_fd)
+                for worker in forked:
+                    os.close(worker.fd)
+                self._work(session, share, keep, write_fd)
+
+            os.close(write_fd)
+            forked.append(_Forked(pid=pid, fd=read_fd, items=share))
+
+        return forked
+
+    def _work(
+        self, session: pytest.Session, items: Sequence[pytest.Item], keep: int, write_fd: int
+    ) -> NoReturn:
+        """
+        Run these tests in a worker and write a line of JSON for each test to
+        ``write_fd``. This never returns.
+        """
+        status = 0
+        out = os.fdopen(write_fd, "w")
+        try:
+            in_child(session, keep)
+            with contextlib.ExitStack() as stack:
+                self.in_worker(stack)
+                run_items(session.config, items, out, self.running)
+        except BaseException:
+            status = 1
+            with contextlib.suppress(OSError):
+                send(out, error=traceback.format_exc())
+        finally:
+            with contextlib.suppress(OSError):
+                out.close()
+            os._exit(status)
+
+    async def _follow_all(self, session: pytest.Session, forked: Sequence[_Forked]) -> bool:
+        """
+        Log the reports from the workers as they arrive. Return False if the
+        session was stopped before the workers were done.
+        """
+        tasks = [asyncio.ensure_future(self._follow(session, worker)) for worker in forked]
+        try:
+            await asyncio.gather(*tasks)
+        except _Stopped:
+            return False
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return True
+
+    async def _follow(self, session: pytest.Session, worker: _Forked) -> None:
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=READ_LIMIT)
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader),
+            os.fdopen(worker.fd, "rb", buffering=0),
+        )
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    # This worker's remaining tests are failed by _report_lost
+                    worker.error = f"The report for a test was more than {READ_LIMIT} bytes"
+                    with contextlib.suppress(ProcessLookupError):
+                        os.kill(worker.pid, signal.SIGKILL)
+                    break
+
+                found = json.loads(line)
+                if "error" in found:
+                    worker.error = found["error"]
+                    continue
+
+                item = worker.items[worker.reported]
+                log_reports(
+                    item.ihook,
+                    item.nodeid,
+                    item.location,
+                    load_reports(session.config, found["reports"]),
+                )
+                worker.reported += 1
+
+                if session.shouldfail or session.shouldstop:
+                    raise _Stopped()
+        finally:
+            transport.close()
+
+    def _reap(self, forked: Sequence[_Forked], *, kill: bool) -> None:
+        for worker in forked:
+            if kill:
+                with contextlib.suppress(ProcessLookupError):
+                    os.kill(worker.pid, signal.SIGKILL)
+
+            with contextlib.suppress(ChildProcessError):
+                _, status = os.waitpid(worker.pid, 0)
+                worker.exitcode = os.waitstatus_to_exitcode(status)
+
+    def _report_lost(self, worker: _Forked) -> None:
+        """
+        Fail the tests that a worker didn't send a report for
+        """
+        if worker.error is not None:
+            reason = f"The worker running this test failed:\n{worker.error}"
+        else:
+            reason = f"The worker running this test exited with {worker.exitcode}"
+
+        for item in worker.items[worker.reported :]:
+            report = pytest.TestReport(
+                nodeid=item.nodeid,
+                location=item.location,
+                keywords=dict.fromkeys(item.keywords, 1),
+                outcome="failed",
+                longrepr=reason,
+                when="call",
+            )
+            log_reports(item.ihook, item.nodeid, item.location, [report])
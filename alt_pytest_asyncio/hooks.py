@@ -0,0 +1,18 @@
+import pytest
+
+from . import protocols
+
+
+@pytest.hookspec(firstresult=True)
+def pytest_async_loop_factory(config: pytest.Config) -> protocols.LoopFactory | None:
+    """
+    Return a callable that creates the event loop to run async fixtures and tests on.
+
+    This is called at the start of the session to make the session loop and
+    then for each test using the conftest files that apply to that test. Tests
+    that get a different callable to the session will be run on a loop made by
+    that callable, which is shared with other tests that get the same callable.
+
+    Return None to leave the decision to other implementations of this hook.
+    The default implementation uses the ``--async-loop-factory`` option.
+    """
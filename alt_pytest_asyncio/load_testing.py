@@ -0,0 +1,189 @@
+import asyncio
+import dataclasses
+import time
+from collections.abc import Awaitable, Callable, Generator
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from . import errors
+from .loop_metrics import percentile
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class LoadStats:
+    """
+    What happened when the body of a test was run many times at once
+    """
+
+    concurrency: int
+    iterations: int
+    errors: int
+    seconds: float
+    latencies: tuple[float, ...]
+
+    @property
+    def finished(self) -> int:
+        """
+        How many iterations finished, which is fewer than ``iterations`` when the
+        test timed out
+        """
+        return len(self.latencies)
+
+    @property
+    def ops_per_second(self) -> float:
+        return 0.0 if self.seconds <= 0 else self.finished / self.seconds
+
+    def as_property(self) -> dict[str, float | int]:
+        """
+        Return these stats as something that can go in ``user_properties``
+        """
+        return {
+            "concurrency": self.concurrency,
+            "iterations": self.iterations,
+            "finished": self.finished,
+            "errors": self.errors,
+            "ops_per_second": round(self.ops_per_second, 3),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 3),
+            "max_ms": round(max(self.latencies, default=0.0) * 1000, 3),
+        }
+
+    def format(self) -> str:
+        found = self.as_property()
+        iterations = f"{found['iterations']} iterations"
+        if self.finished < self.iterations:
+            iterations = f"{found['finished']} of {iterations}"
+        return (
+            f"{iterations} with concurrency {found['concurrency']}"
+            f" in {self.seconds:.3f}s: {found['ops_per_second']} ops/s,"
+            f" p50 {found['p50_ms']}ms, p95 {found['p95_ms']}ms, p99 {found['p99_ms']}ms,"
+            f" max {found['max_ms']}ms, {found['errors']} errors"
+        )
+
+
+load_stats_key = pytest.StashKey[LoadStats]()
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class LoadTest:
+    """
+    The options from a ``pytest.mark.async_load`` marker
+    """
+
+    concurrency: int = 10
+    iterations: int = 100
+    min_ops_per_second: float | None = None
+    max_p99: float | None = None
+    max_errors: int = 0
+    timeout: float | None = None
+
+    @classmethod
+    def from_marker(cls, marker: pytest.Mark) -> "LoadTest":
+        if marker.args:
+            raise TypeError("pytest.mark.async_load only takes keyword arguments")
+
+        load_test = cls(**marker.kwargs)
+        if load_test.concurrency < 1 or load_test.iterations < 1:
+            raise ValueError(
+                "pytest.mark.async_load needs a concurrency and iterations of at least 1"
+            )
+        if load_test.timeout is not None and load_test.timeout <= 0:
+            raise ValueError("pytest.mark.async_load needs a timeout of more than 0 seconds")
+        return load_test
+
+    async def run(
+        self, func: Callable[[], Awaitable[object]], *, record: Callable[[LoadStats], None]
+    ) -> BaseException | None:
+        """
+        Await what ``func`` returns ``iterations`` times with no more than
+        ``concurrency`` of them at the same time.
+
+        The stats are given to ``record``, even if this is cancelled before all
+        the iterations are done, and the first error from ``func`` is returned.
+        """
+        remaining = self.iterations
+        latencies: list[float] = []
+        failures: list[Exception] = []
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    await func()
+                except Exception as error:
+                    failures.append(error)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(worker() for _ in range(min(self.concurrency, self.iterations)))
+            )
+        finally:
+            record(
+                LoadStats(
+                    concurrency=self.concurrency,
+                    iterations=self.iterations,
+                    errors=len(failures),
+                    seconds=time.perf_counter() - start,
+                    latencies=tuple(latencies),
+                )
+            )
+        return failures[0] if failures else None
+
+    def check(self, stats: LoadStats, first_error: BaseException | None) -> None:
+        """
+        Complain if these stats don't meet the limits from the marker
+        """
+        __tracebackhide__ = True
+        if stats.errors > self.max_errors:
+            raise errors.LoadTestFailed(
+                f"{stats.errors} of {stats.iterations} iterations failed"
+                f" (max_errors={self.max_errors}), the first with {first_error!r}"
+            ) from first_error
+
+        if self.min_ops_per_second is not None and stats.ops_per_second < self.min_ops_per_second:
+            raise errors.LoadTestFailed(
+                f"Only managed {stats.ops_per_second:.3f} ops/s"
+                f" (min_ops_per_second={self.min_ops_per_second})"
+            )
+
+        p99 = percentile(stats.latencies, 99)
+        if self.max_p99 is not None and p99 > self.max_p99:
+            raise errors.LoadTestFailed(
+                f"The p99 latency was {p99 * 1000:.3f}ms (max_p99={self.max_p99}s)"
+            )
+
+
+class LoadReports:
+    """
+    Shows the stats from tests marked with ``pytest.mark.async_load`` at the end
+    of the session
+    """
+
+    def __init__(self) -> None:
+        self.found: list[tuple[str, str]] = []
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_makereport(
+        self, item: pytest.Item, call: pytest.CallInfo[None]
+    ) -> Generator[None, pytest.TestReport, pytest.TestReport]:
+        report = yield
+        if call.when == "call" and (stats := item.stash.get(load_stats_key, None)) is not None:
+            report.sections.append(("async load", stats.format()))
+            report.user_properties.append(("async_load", stats.as_property()))
+            self.found.append((item.nodeid, stats.format()))
+        return report
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        if not self.found:
+            return
+
+        terminalreporter.section("async load")
+        for nodeid, formatted in self.found:
+            terminalreporter.line(f"{nodeid}: {formatted}")
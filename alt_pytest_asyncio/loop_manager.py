@@ -1,12 +1,44 @@
 import asyncio
 import contextlib
+import importlib
 import sys
 import warnings
 from collections.abc import Coroutine
 from types import TracebackType
 from typing import Self
 
-from . import machinery, protocols
+from . import errors, machinery, protocols
+
+
+def import_loop_factory(spec: str) -> protocols.LoopFactory:
+    """
+    Find the loop factory described by a string like ``module:callable``
+    """
+    module_name, _, attr = spec.partition(":")
+    if not module_name or not attr:
+        raise errors.LoopFactoryNotFound(
+            f"Expected a loop factory in the form 'module:callable', got {spec!r}"
+        )
+
+    try:
+        found: object = importlib.import_module(module_name)
+    except ImportError as error:
+        raise errors.LoopFactoryNotFound(
+            f"Failed to import {module_name!r} for loop factory {spec!r}: {error}"
+        ) from error
+
+    for part in attr.split("."):
+        try:
+            found = getattr(found, part)
+        except AttributeError as error:
+            raise errors.LoopFactoryNotFound(
+                f"Failed to find {attr!r} in {module_name!r} for loop factory {spec!r}"
+            ) from error
+
+    if not callable(found):
+        raise errors.LoopFactoryNotFound(f"Loop factory {spec!r} is not callable")
+
+    return found
 
 
 class Loop(contextlib.AbstractContextManager["Loop"]):
@@ -46,9 +78,15 @@ class Loop(contextlib.AbstractContextManager["Loop"]):
     controlled_loop: asyncio.AbstractEventLoop | None
     _original_loop: asyncio.AbstractEventLoop | None
 
-    def __init__(self, new_loop: bool = True) -> None:
+    def __init__(
+        self,
+        new_loop: bool = True,
+        *,
+        loop_factory: protocols.LoopFactory | None = None,
+    ) -> None:
         self._tasks: list[asyncio.Task[object]] = []
         self._new_loop = new_loop
+        self._loop_factory = loop_factory
 
     def __enter__(self) -> Self:
         with warnings.catch_warnings():
@@ -56,7 +94,10 @@ class Loop(contextlib.AbstractContextManager["Loop"]):
             self._original_loop = asyncio.get_event_loop_policy().get_event_loop()
 
         if self._new_loop:
-            self.controlled_loop = asyncio.new_event_loop()
+            if self._loop_factory is None:
+                self.controlled_loop = asyncio.new_event_loop()
+            else:
+                self.controlled_loop = self._loop_factory()
         else:
             self.controlled_loop = None
 
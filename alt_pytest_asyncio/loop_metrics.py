@@ -0,0 +1,263 @@
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import math
+import time
+from collections.abc import Coroutine, Generator, Iterator, Sequence
+from typing import Any
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from . import converter, virtual_time
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class PhaseMetrics:
+    """
+    What the event loop did during the setup, call or teardown of a test
+    """
+
+    nodeid: str
+    when: str
+    lags: tuple[float, ...]
+    tasks: int
+    callbacks: int
+    iterations: int
+
+    @property
+    def max_lag(self) -> float:
+        return max(self.lags, default=0.0)
+
+    def as_property(self) -> dict[str, float | int]:
+        """
+        Return these metrics as something that can go in ``user_properties``
+        """
+        return {
+            "lag_max_ms": round(self.max_lag * 1000, 3),
+            "lag_p50_ms": round(percentile(self.lags, 50) * 1000, 3),
+            "lag_p99_ms": round(percentile(self.lags, 99) * 1000, 3),
+            "heartbeats": len(self.lags),
+            "tasks": self.tasks,
+            "callbacks": self.callbacks,
+            "iterations": self.iterations,
+        }
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Return the nearest rank percentile of these values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class _CountingReady(collections.deque[asyncio.Handle]):
+    """
+    The ``_ready`` deque of a loop that counts the callbacks the loop runs
+    """
+
+    ran = 0
+
+    def popleft(self) -> asyncio.Handle:
+        handle = super().popleft()
+        if not handle.cancelled():
+            self.ran += 1
+        return handle
+
+
+@dataclasses.dataclass(kw_only=True)
+class _Counts:
+    lags: list[float] = dataclasses.field(default_factory=list)
+    tasks: int = 0
+    callbacks: int = 0
+    iterations: int = 0
+
+
+class LoopMetrics:
+    """
+    Measures what the event loop does whilst it runs async fixtures and tests.
+
+    A heartbeat scheduled every ``interval`` seconds records how late the loop
+    was in running it. The number of tasks created, callbacks run and
+    iterations of the loop are also counted where the loop allows it.
+
+    This is also a pytest plugin that puts the metrics in the
+    ``user_properties`` of each report and summarises them at the end of the
+    session.
+    """
+
+    def __init__(self, *, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.phases: list[PhaseMetrics] = []
+        self._counts = _Counts()
+
+    @contextlib.contextmanager
+    def watching(self, loop: asyncio.AbstractEventLoop) -> Iterator[None]:
+        """
+        Measure what this loop does whilst the code in this block runs
+        """
+        counts = self._counts
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(self._heartbeat(loop, counts))
+            stack.enter_context(self._counting_tasks(loop, counts))
+            if hasattr(loop, "_ready") and hasattr(loop, "_run_once"):
+                stack.enter_context(self._counting_callbacks(loop, counts))
+            yield
+
+    @contextlib.contextmanager
+    def _heartbeat(self, loop: asyncio.AbstractEventLoop, counts: _Counts) -> Iterator[None]:
+        handle: asyncio.TimerHandle | None = None
+        stopped = False
+
+        def beat(expected: float) -> None:
+            nonlocal handle
+            now = time.monotonic()
+            counts.lags.append(max(0.0, now - expected))
+            if not stopped:
+                handle = virtual_time.call_later_wall_clock(
+                    loop, self.interval, beat, now + self.interval
+                )
+
+        def start() -> None:
+            nonlocal handle
+            handle = virtual_time.call_later_wall_clock(
+                loop, self.interval, beat, time.monotonic() + self.interval
+            )
+
+        def stop() -> None:
+            nonlocal stopped
+            stopped = True
+            if handle is not None:
+                handle.cancel()
+
+        # The loop may be running in another thread
+        in_thread = loop.is_running()
+        if in_thread:
+            loop.call_soon_threadsafe(start)
+        else:
+            start()
+
+        try:
+            yield
+        finally:
+            if in_thread and not loop.is_closed():
+                loop.call_soon_threadsafe(stop)
+            else:
+                stop()
+
+    @contextlib.contextmanager
+    def _counting_tasks(self, loop: asyncio.AbstractEventLoop, counts: _Counts) -> Iterator[None]:
+        def count(task: asyncio.Future[object], coro: Coroutine[object, object, object]) -> None:
+            # The tasks that run the fixtures and tests aren't made by them
+            if not converter.making_own_task():
+                counts.tasks += 1
+
+        with converter.seeing_tasks(loop, count):
+            yield
+
+    @contextlib.contextmanager
+    def _counting_callbacks(self, loop: Any, counts: _Counts) -> Iterator[None]:
+        """
+        Count the callbacks and iterations of loops that are based on
+        ``asyncio.BaseEventLoop``.
+
+        This relies on the loop calling ``_run_once`` for each iteration, which
+        takes each callback it runs off the ``_ready`` deque. That deque is
+        replaced with one that counts the callbacks taken off it that aren't
+        cancelled, which includes those for timers and IO that become ready
+        during the iteration.
+        """
+        original_run_once = loop._run_once
+        patched_run_once = "_run_once" in vars(loop)
+        replaced: collections.deque[asyncio.Handle] | None = None
+
+        def run_once() -> None:
+            nonlocal replaced
+            ready = loop._ready
+            if not isinstance(ready, _CountingReady):
+                # Replaced on the thread running the loop and left in place
+                # afterwards, so that only call_soon_threadsafe can race with it
+                replaced = ready
+                ready = loop._ready = _CountingReady(ready)
+            if replaced:
+                # Callbacks added from another thread whilst it was replaced
+                ready.extend(replaced)
+                replaced.clear()
+
+            ran = ready.ran
+            counts.iterations += 1
+            original_run_once()
+            counts.callbacks += ready.ran - ran
+
+        loop._run_once = run_once
+        try:
+            yield
+        finally:
+            if patched_run_once:
+                loop._run_once = original_run_once
+            else:
+                del loop._run_once
+
+    def _take(self, nodeid: str, when: str) -> PhaseMetrics | None:
+        counts, self._counts = self._counts, _Counts()
+        if not any((counts.lags, counts.tasks, counts.callbacks, counts.iterations)):
+            return None
+
+        phase = PhaseMetrics(
+            nodeid=nodeid,
+            when=when,
+            lags=tuple(counts.lags),
+            tasks=counts.tasks,
+            callbacks=counts.callbacks,
+            iterations=counts.iterations,
+        )
+        self.phases.append(phase)
+        return phase
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_makereport(
+        self, item: pytest.Item, call: pytest.CallInfo[None]
+    ) -> Generator[None, pytest.TestReport, pytest.TestReport]:
+        report = yield
+        if (phase := self._take(item.nodeid, call.when)) is not None:
+            report.user_properties.append((f"async_loop_{call.when}", phase.as_property()))
+        return report
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        if not self.phases:
+            return
+
+        terminalreporter.section("async loop metrics")
+        columns: list[tuple[str, list[float], str]] = [
+            ("max lag", [phase.max_lag * 1000 for phase in self.phases], "{:.1f}ms"),
+            ("tasks", [phase.tasks for phase in self.phases], "{:.0f}"),
+            ("callbacks", [phase.callbacks for phase in self.phases], "{:.0f}"),
+            ("iterations", [phase.iterations for phase in self.phases], "{:.0f}"),
+        ]
+
+        terminalreporter.line(
+            f"{'per phase':<12}" + "".join(f"{name:>12}" for name in ("p50", "p90", "p99", "max"))
+        )
+        for name, values, fmt in columns:
+            terminalreporter.line(
+                f"{name:<12}"
+                + "".join(
+                    f"{fmt.format(percentile(values, pct)):>12}" for pct in (50, 90, 99, 100)
+                )
+            )
+
+        terminalreporter.line("")
+        terminalreporter.line("most lag:")
+        worst = sorted(self.phases, key=lambda phase: phase.max_lag, reverse=True)
+        for phase in worst[:5]:
+            terminalreporter.line(
+                f"  {phase.max_lag * 1000:.1f}ms {phase.nodeid} ({phase.when})"
+                f" tasks={phase.tasks} callbacks={phase.callbacks}"
+                f" iterations={phase.iterations}"
+            )
@@ -0,0 +1,89 @@
+import asyncio
+import concurrent.futures
+import threading
+from collections.abc import Callable
+from typing import TypeVar
+
+T_Ret = TypeVar("T_Ret")
+
+
+class LoopThread:
+    """
+    Runs an event loop forever in a thread of its own.
+
+    This means tasks on the loop, like servers started by session scoped
+    fixtures, keep running whilst the main thread is doing something other than
+    running an async fixture or test.
+
+    Everything that touches the loop from another thread must go through
+    ``call`` and ``wait``.
+    """
+
+    def __init__(
+        self, *, loop: asyncio.AbstractEventLoop, name: str = "alt-pytest-asyncio-loop"
+    ) -> None:
+        self.loop = loop
+        self.name = name
+        self._thread: threading.Thread | None = None
+
+    def runs(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return self._thread is not None and loop is self.loop
+
+    def start(self) -> None:
+        started = threading.Event()
+
+        def run() -> None:
+            self.loop.call_soon(started.set)
+            self.loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop(self) -> None:
+        """
+        Stop the loop and wait for the thread to finish. The loop can then be
+        used from this thread again.
+        """
+        if self._thread is None:
+            return
+
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def call(self, func: Callable[[], T_Ret]) -> T_Ret:
+        """
+        Call this function in the thread running the loop and return what it
+        returns.
+        """
+        if self._thread is None or self._thread.ident == threading.get_ident():
+            return func()
+
+        result: concurrent.futures.Future[T_Ret] = concurrent.futures.Future()
+
+        def run() -> None:
+            try:
+                result.set_result(func())
+            except BaseException as error:
+                result.set_exception(error)
+
+        self.loop.call_soon_threadsafe(run)
+        return result.result()
+
+    def wait(self, fut: asyncio.Future[T_Ret]) -> T_Ret:
+        """
+        Wait for this future on the loop to be done and return its result.
+
+        If the wait is interrupted, for example by the hard timeout, the future
+        is cancelled.
+        """
+        done = threading.Event()
+        self.loop.call_soon_threadsafe(fut.add_done_callback, lambda _: done.set())
+        try:
+            done.wait()
+        except BaseException:
+            self.loop.call_soon_threadsafe(fut.cancel)
+            raise
+        return fut.result()
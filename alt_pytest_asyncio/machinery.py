@@ -45,8 +45,23 @@ def cancel_all_tasks(
 
 
 def run_coro_as_main(
-    loop: asyncio.AbstractEventLoop, coro: Coroutine[object, object, None]
+    loop: asyncio.AbstractEventLoop | None,
+    coro: Coroutine[object, object, None],
+    *,
+    loop_factory: Callable[[], asyncio.AbstractEventLoop] | None = None,
 ) -> None:
+    """
+    Run this coroutine till completion on this loop and exit with a short
+    traceback if it fails. The loop is closed afterwards.
+
+    If no loop is provided then one is made with ``loop_factory`` or
+    ``asyncio.new_event_loop()``.
+    """
+    if loop is None:
+        loop = asyncio.new_event_loop() if loop_factory is None else loop_factory()
+    elif loop_factory is not None:
+        raise ValueError("Only one of loop and loop_factory may be provided")
+
     @dataclasses.dataclass(frozen=True, kw_only=True)
     class Captured(Exception):
         error: BaseException
@@ -0,0 +1,47 @@
+import asyncio
+from collections.abc import Callable, Iterator, Mapping
+from typing import Generic, TypeVar
+
+T_Value = TypeVar("T_Value")
+
+
+class PerLoop(Mapping[asyncio.AbstractEventLoop, T_Value], Generic[T_Value]):
+    """
+    Holds a value for each event loop without holding on to loops that have
+    been closed.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[asyncio.AbstractEventLoop, T_Value] = {}
+
+    def __getitem__(self, loop: asyncio.AbstractEventLoop) -> T_Value:
+        return self._values[loop]
+
+    def __iter__(self) -> Iterator[asyncio.AbstractEventLoop]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def setdefault(self, loop: asyncio.AbstractEventLoop, make: Callable[[], T_Value]) -> T_Value:
+        """
+        Return the value for this loop, using ``make`` to create it if this is
+        a loop we haven't seen before.
+        """
+        value = self._values.get(loop)
+        if value is None:
+            # Only look for loops we can forget when we see a new loop
+            for closed in [lp for lp in self._values if lp.is_closed()]:
+                del self._values[closed]
+            value = self._values[loop] = make()
+        return value
+
+    def forget(self, loop: asyncio.AbstractEventLoop, value: T_Value) -> None:
+        """
+        Forget the value for this loop if it is still this value
+        """
+        if self._values.get(loop) is value:
+            del self._values[loop]
+
+    def clear(self) -> None:
+        self._values.clear()
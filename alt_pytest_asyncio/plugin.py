@@ -2,13 +2,42 @@ import asyncio
 import contextlib
 import inspect
 import sys
+import weakref
 from collections.abc import Callable, Iterator
 from types import TracebackType
-from typing import TYPE_CHECKING, NoReturn, cast
+from typing import TYPE_CHECKING, ClassVar, NoReturn, cast
 
 import pytest
 
-from . import base, converter, errors, loop_manager, protocols
+from . import (
+    base,
+    benchmark,
+    concurrency,
+    converter,
+    daemon,
+    deadlines,
+    errors,
+    fixture_timings,
+    forking,
+    hooks,
+    load_testing,
+    loop_manager,
+    loop_metrics,
+    loop_thread,
+    protocols,
+    resource_leaks,
+    stalls,
+    task_leaks,
+    tracing,
+    virtual_time,
+    watchdog,
+    workers,
+)
+
+
+@pytest.hookimpl
+def pytest_addhooks(pluginmanager: pytest.PytestPluginManager) -> None:
+    pluginmanager.add_hookspecs(hooks)
 
 
 @pytest.hookimpl
@@ -24,6 +53,226 @@ def pytest_addoption(parser: pytest.Parser) -> None:
     group.addoption("--default-async-timeout", type=float, dest="default_async_timeout", help=desc)
     parser.addini("default_async_timeout", desc)
 
+    desc = "run eligible async tests concurrently. Tests can opt out with ``pytest.mark.async_concurrent(False)``"
+    group.addoption(
+        "--async-concurrent",
+        action="store_true",
+        default=None,
+        dest="async_concurrent",
+        help=desc,
+    )
+    parser.addini("async_concurrent", desc, type="bool", default=False)
+
+    desc = "the most async tests that will be run at the same time when tests are run concurrently"
+    group.addoption("--async-concurrency", type=int, dest="async_concurrency", help=desc)
+    parser.addini("async_concurrency", desc)
+
+    desc = "setup async fixtures that don't depend on each other at the same time"
+    group.addoption(
+        "--async-concurrent-fixtures",
+        action="store_true",
+        default=None,
+        dest="async_concurrent_fixtures",
+        help=desc,
+    )
+    parser.addini("async_concurrent_fixtures", desc, type="bool", default=False)
+
+    desc = "run the teardown of async generator fixtures that don't depend on each other at the same time"
+    group.addoption(
+        "--async-concurrent-teardown",
+        action="store_true",
+        default=None,
+        dest="async_concurrent_teardown",
+        help=desc,
+    )
+    parser.addini("async_concurrent_teardown", desc, type="bool", default=False)
+
+    desc = "start the tasks for async tests and fixtures eagerly on python 3.12 and above"
+    group.addoption(
+        "--async-eager-tasks",
+        action="store_true",
+        default=None,
+        dest="async_eager_tasks",
+        help=desc,
+    )
+    parser.addini("async_eager_tasks", desc, type="bool", default=False)
+
+    desc = "don't run sync tests and fixtures that have nothing to do with async code in our context, and don't start the plugin if nothing collected is async"
+    group.addoption(
+        "--async-sync-fast-path",
+        action="store_true",
+        default=None,
+        dest="async_sync_fast_path",
+        help=desc,
+    )
+    parser.addini("async_sync_fast_path", desc, type="bool", default=False)
+
+    desc = "seconds the event loop may take to come back from an async fixture or test before the main thread is interrupted, even if it is blocked"
+    group.addoption("--async-hard-timeout", type=float, dest="async_hard_timeout", help=desc)
+    parser.addini("async_hard_timeout", desc)
+
+    desc = "report when the event loop doesn't get to run anything else for more than this many seconds during an async fixture or test"
+    group.addoption("--async-stall-threshold", type=float, dest="async_stall_threshold", help=desc)
+    parser.addini("async_stall_threshold", desc)
+
+    desc = "fail tests where the event loop doesn't get to run anything else for more than this many seconds"
+    group.addoption("--async-stall-fail", type=float, dest="async_stall_fail", help=desc)
+    parser.addini("async_stall_fail", desc)
+
+    desc = "measure the lag and work of the event loop for each async fixture and test"
+    group.addoption(
+        "--async-loop-metrics",
+        default=False,
+        action="store_true",
+        dest="async_loop_metrics",
+        help=desc,
+    )
+    parser.addini("async_loop_metrics", desc, type="bool", default=False)
+
+    desc = "write a timeline of tests, fixtures and tasks to this file in the chrome trace event format"
+    group.addoption("--async-trace", dest="async_trace", help=desc)
+    parser.addini("async_trace", desc)
+
+    desc = (
+        "show the N slowest async fixtures by the time spent in setup and teardown (N=0 for all)"
+    )
+    group.addoption(
+        "--async-fixture-durations", type=int, dest="async_fixture_durations", help=desc
+    )
+    parser.addini("async_fixture_durations", desc)
+
+    desc = (
+        "write the time spent in the setup and teardown of each async fixture to this file as json"
+    )
+    group.addoption(
+        "--async-fixture-durations-json", dest="async_fixture_durations_json", help=desc
+    )
+    parser.addini("async_fixture_durations_json", desc)
+
+    desc = "include sync fixtures in the async fixture durations"
+    group.addoption(
+        "--async-fixture-durations-sync",
+        default=False,
+        action="store_true",
+        dest="async_fixture_durations_sync",
+        help=desc,
+    )
+    parser.addini("async_fixture_durations_sync", desc, type="bool", default=False)
+
+    desc = (
+        "report (or report and cancel) tasks that are still running after the test that made them"
+    )
+    group.addoption(
+        "--async-task-leaks", choices=("report", "cancel"), dest="async_task_leaks", help=desc
+    )
+    parser.addini("async_task_leaks", desc)
+
+    desc = "report, warn or fail tests that leave file descriptors or transports open"
+    group.addoption(
+        "--async-resource-leaks",
+        choices=("report", "warn", "fail"),
+        dest="async_resource_leaks",
+        help=desc,
+    )
+    parser.addini("async_resource_leaks", desc)
+
+    desc = "how many file descriptors or transports a test may leave open before it is reported"
+    group.addoption(
+        "--async-resource-leak-threshold",
+        type=int,
+        dest="async_resource_leak_threshold",
+        help=desc,
+    )
+    parser.addini("async_resource_leak_threshold", desc)
+
+    desc = "write the stats from async_benchmark to this JSON file"
+    group.addoption("--async-benchmark-save", dest="async_benchmark_save", help=desc)
+    parser.addini("async_benchmark_save", desc)
+
+    desc = "fail async_benchmark tests that are slower than the stats in this JSON file"
+    group.addoption("--async-benchmark-compare", dest="async_benchmark_compare", help=desc)
+    parser.addini("async_benchmark_compare", desc)
+
+    desc = "how much slower than the baseline, as a fraction, an async_benchmark may be. Defaults to 0.1"
+    group.addoption(
+        "--async-benchmark-tolerance", type=float, dest="async_benchmark_tolerance", help=desc
+    )
+    parser.addini("async_benchmark_tolerance", desc)
+
+    desc = "how many seconds a pytest-xdist worker waits for another to set up what it shares with async_shared, or for the other workers before cleaning up what it shared. Defaults to 600"
+    group.addoption("--async-shared-timeout", type=float, dest="async_shared_timeout", help=desc)
+    parser.addini("async_shared_timeout", desc)
+
+    desc = "keep the session loop running in a thread of its own for the whole session"
+    group.addoption(
+        "--async-loop-thread",
+        default=False,
+        action="store_true",
+        dest="async_loop_thread",
+        help=desc,
+    )
+    parser.addini("async_loop_thread", desc, type="bool", default=False)
+
+    desc = "setup session scoped async fixtures once and then fork this many processes to run the tests. Only on Linux"
+    group.addoption("--async-fork-workers", type=int, dest="async_fork_workers", help=desc)
+    parser.addini("async_fork_workers", desc)
+
+    desc = "collect the tests, setup session scoped async fixtures and then run the tests asked for by --async-daemon-connect on this unix socket. Only on Linux"
+    group.addoption("--async-daemon", dest="async_daemon", help=desc)
+
+    desc = "run the tests in the --async-daemon listening on this unix socket"
+    group.addoption("--async-daemon-connect", dest="async_daemon_connect", help=desc)
+
+    desc = "a 'module:callable' that returns the event loop to run async fixtures and tests on"
+    group.addoption("--async-loop-factory", dest="async_loop_factory", help=desc)
+    parser.addini("async_loop_factory", desc)
+
+    desc = "make the session loop one that can use virtual time for tests marked with async_virtual_time"
+    group.addoption(
+        "--async-virtual-time-loop",
+        action="store_true",
+        default=None,
+        dest="async_virtual_time_loop",
+        help=desc,
+    )
+    parser.addini("async_virtual_time_loop", desc, type="bool", default=False)
+
+
+@pytest.hookimpl
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        "async_concurrent(enabled=True): run this async test concurrently with the async tests around it",
+    )
+    config.addinivalue_line(
+        "markers",
+        "async_concurrent_cases(limit=None): run the parametrized cases of this async test concurrently with each other",
+    )
+    config.addinivalue_line(
+        "markers",
+        "async_virtual_time(enabled=True): move the event loop clock forward instead of waiting when only timers are pending",
+    )
+    config.addinivalue_line(
+        "markers",
+        "async_load(concurrency=10, iterations=100, min_ops_per_second=None, max_p99=None, max_errors=0, timeout=None):"
+        " run the body of this async test many times at once and report the throughput and latency",
+    )
+
+
+def _uses_loop_thread(config: pytest.Config) -> bool:
+    return bool(config.getoption("async_loop_thread", None) or config.getini("async_loop_thread"))
+
+
+def _float_option(config: pytest.Config, name: str) -> float | None:
+    """
+    Return the value of an option that is a number of seconds, from the command
+    line or otherwise the ini file.
+    """
+    value = config.getoption(name, None)
+    if value is None:
+        value = config.getini(name) or None
+    return None if value is None else float(value)
+
 
 class _ManagedLoop(contextlib.AbstractContextManager[None]):
     _original_loop: asyncio.AbstractEventLoop | None
@@ -63,6 +312,12 @@ class AltPytestAsyncioPlugin:
     def __init__(self, *, managed_loop: asyncio.AbstractEventLoop | None = None) -> None:
         self._managed_loop = managed_loop
         self._converter = converter.Converter()
+        self._concurrent_tests: concurrency.ConcurrentTests | None = None
+        self._item_positions: dict[pytest.Item, int] = {}
+        self._ran_concurrently: set[pytest.Item] = set()
+        self._session_loop_factory: protocols.LoopFactory | None = None
+        self._virtual_time_loop = False
+        self._loops: dict[protocols.LoopFactory, asyncio.AbstractEventLoop] = {}
 
     @pytest.hookimpl(tryfirst=True, hookwrapper=True)
     def pytest_sessionstart(self, session: pytest.Session) -> Iterator[None]:
@@ -70,12 +325,416 @@ class AltPytestAsyncioPlugin:
             raise errors.PluginAlreadyStarted()
 
         self._cm = contextlib.ExitStack()
+        self._converter.sync_fast_path = bool(
+            session.config.getoption("async_sync_fast_path", None)
+            or session.config.getini("async_sync_fast_path")
+        )
+        # The pytest-xdist controller doesn't run any tests itself
+        controller = workers.is_controller(session.config)
+        if controller:
+            session.config.pluginmanager.register(
+                workers.Controller(), "alt_pytest_asyncio_controller"
+            )
+        elif not self._converter.sync_fast_path:
+            self._start_loop(session)
+
+        # Options that gather what happens in each test for the end of the session
+        gathering: list[str] = []
+
+        # The pytest-xdist controller has no tests to watch, trace or time
+        hard_timeout = _float_option(session.config, "async_hard_timeout")
+        if hard_timeout is not None and not controller:
+            hard_timeout_watchdog = watchdog.Watchdog(timeout=hard_timeout)
+            hard_timeout_watchdog.start()
+            self._cm.callback(hard_timeout_watchdog.stop)
+            self._converter.loop_watchers.append(hard_timeout_watchdog)
+
+        stall_threshold = _float_option(session.config, "async_stall_threshold")
+        stall_fail = _float_option(session.config, "async_stall_fail")
+        if stall_threshold is not None:
+            gathering.append("--async-stall-threshold")
+        elif stall_fail is not None:
+            gathering.append("--async-stall-fail")
+            # Only stalls longer than the threshold are found at all
+            stall_threshold = stall_fail
+        if stall_fail is not None and stall_threshold is not None and stall_fail < stall_threshold:
+            raise pytest.UsageError(
+                f"async_stall_fail ({stall_fail}) can't be less than async_stall_threshold"
+                f" ({stall_threshold}) as stalls shorter than the threshold are never found"
+            )
+        if stall_threshold is not None and not controller:
+            detector = stalls.StallDetector(threshold=stall_threshold, fail_after=stall_fail)
+            detector.start()
+            self._cm.callback(detector.stop)
+            session.config.pluginmanager.register(detector, "alt_pytest_asyncio_stalls")
+            self._converter.loop_watchers.append(detector)
+
+        if session.config.getoption("async_loop_metrics", None) or session.config.getini(
+            "async_loop_metrics"
+        ):
+            gathering.append("--async-loop-metrics")
+            metrics = loop_metrics.LoopMetrics()
+            session.config.pluginmanager.register(metrics, "alt_pytest_asyncio_loop_metrics")
+            self._converter.loop_watchers.append(metrics)
+
+        trace_path = session.config.getoption("async_trace", None) or session.config.getini(
+            "async_trace"
+        )
+        if trace_path:
+            gathering.append("--async-trace")
+        if trace_path and not controller:
+            tracer = tracing.Tracer(
+                converter=self._converter,
+                path=workers.per_worker_path(
+                    session.config, session.config.invocation_params.dir / trace_path
+                ),
+            )
+            session.config.pluginmanager.register(tracer, "alt_pytest_asyncio_tracing")
+            self._converter.loop_watchers.append(tracer)
+
+        show_fixtures = session.config.getoption("async_fixture_durations", None)
+        if show_fixtures is None and (ini := session.config.getini("async_fixture_durations")):
+            show_fixtures = int(ini)
+        fixtures_json = session.config.getoption(
+            "async_fixture_durations_json", None
+        ) or session.config.getini("async_fixture_durations_json")
+        if show_fixtures is not None or fixtures_json:
+            gathering.append(
+                "--async-fixture-durations-json" if fixtures_json else "--async-fixture-durations"
+            )
+        if (show_fixtures is not None or fixtures_json) and not controller:
+            timings = fixture_timings.FixtureTimings(
+                converter=self._converter,
+                show=show_fixtures,
+                json_path=(
+                    workers.per_worker_path(
+                        session.config, session.config.invocation_params.dir / fixtures_json
+                    )
+                    if fixtures_json
+                    else None
+                ),
+                include_sync=bool(
+                    session.config.getoption("async_fixture_durations_sync", None)
+                    or session.config.getini("async_fixture_durations_sync")
+                ),
+            )
+            session.config.pluginmanager.register(timings, "alt_pytest_asyncio_fixture_timings")
+
+        task_leaks_mode = session.config.getoption(
+            "async_task_leaks", None
+        ) or session.config.getini("async_task_leaks")
+        if task_leaks_mode:
+            if task_leaks_mode not in ("report", "cancel"):
+                raise pytest.UsageError(
+                    f"async_task_leaks must be 'report' or 'cancel', got {task_leaks_mode!r}"
+                )
+            gathering.append("--async-task-leaks")
+            leak_detector = task_leaks.TaskLeakDetector(cancel=task_leaks_mode == "cancel")
+            session.config.pluginmanager.register(leak_detector, "alt_pytest_asyncio_task_leaks")
+            self._converter.loop_watchers.append(leak_detector)
+
+        resource_leaks_mode = session.config.getoption(
+            "async_resource_leaks", None
+        ) or session.config.getini("async_resource_leaks")
+        if resource_leaks_mode:
+            if resource_leaks_mode not in ("report", "warn", "fail"):
+                raise pytest.UsageError(
+                    "async_resource_leaks must be 'report', 'warn' or 'fail',"
+                    f" got {resource_leaks_mode!r}"
+                )
+            gathering.append("--async-resource-leaks")
+            threshold = session.config.getoption("async_resource_leak_threshold", None)
+            if threshold is None:
+                threshold = int(session.config.getini("async_resource_leak_threshold") or 0)
+            resource_detector = resource_leaks.ResourceLeakDetector(
+                mode=resource_leaks_mode, threshold=threshold
+            )
+            session.config.pluginmanager.register(
+                resource_detector, "alt_pytest_asyncio_resource_leaks"
+            )
+            self._converter.loop_watchers.append(resource_detector)
+
+        benchmark_save = session.config.getoption(
+            "async_benchmark_save", None
+        ) or session.config.getini("async_benchmark_save")
+        benchmark_compare = session.config.getoption(
+            "async_benchmark_compare", None
+        ) or session.config.getini("async_benchmark_compare")
+        baseline = None
+        if benchmark_compare:
+            try:
+                baseline = benchmark.load_baseline(
+                    session.config.invocation_params.dir / benchmark_compare
+                )
+            except (OSError, ValueError, KeyError, TypeError) as error:
+                raise pytest.UsageError(
+                    f"Failed to read the async_benchmark baseline from {benchmark_compare}: {error}"
+                ) from error
+        if benchmark_save:
+            gathering.append("--async-benchmark-save")
+        if benchmark_compare:
+            gathering.append("--async-benchmark-compare")
+        benchmark_tolerance = _float_option(session.config, "async_benchmark_tolerance")
+        benchmarks = benchmark.Benchmarks(
+            converter=self._converter,
+            save_path=(
+                workers.per_worker_path(
+                    session.config, session.config.invocation_params.dir / benchmark_save
+                )
+                if benchmark_save
+                else None
+            ),
+            baseline=baseline,
+            tolerance=0.1 if benchmark_tolerance is None else benchmark_tolerance,
+        )
+        session.config.pluginmanager.register(benchmarks, "alt_pytest_asyncio_benchmarks")
+
+        shared_timeout = _float_option(session.config, "async_shared_timeout")
+        worker = workers.Worker(
+            config=session.config,
+            converter=self._converter,
+            count_timeouts=lambda: LoadedAsyncTimeout.timed_out,
+            timeout=600 if shared_timeout is None else shared_timeout,
+        )
+        session.config.pluginmanager.register(worker, "alt_pytest_asyncio_worker")
+
+        session.config.pluginmanager.register(
+            load_testing.LoadReports(), "alt_pytest_asyncio_load_testing"
+        )
+
+        self._concurrent_tests = concurrency.ConcurrentTests.from_config(session.config)
+        self._converter.setup_fixtures_concurrently = bool(
+            session.config.getoption("async_concurrent_fixtures", None)
+            or session.config.getini("async_concurrent_fixtures")
+        )
+        self._converter.teardown_fixtures_concurrently = bool(
+            session.config.getoption("async_concurrent_teardown", None)
+            or session.config.getini("async_concurrent_teardown")
+        )
+        if self._converter.setup_fixtures_concurrently and _uses_loop_thread(session.config):
+            raise pytest.UsageError(
+                "--async-concurrent-fixtures can't be used with --async-loop-thread"
+            )
+
+        fork_workers = session.config.getoption("async_fork_workers", None)
+        if fork_workers is None and (ini := session.config.getini("async_fork_workers")):
+            fork_workers = int(ini)
+        if fork_workers is not None and fork_workers > 1:
+            if sys.platform != "linux":
+                raise pytest.UsageError("--async-fork-workers is only available on Linux")
+            if _uses_loop_thread(session.config):
+                raise pytest.UsageError(
+                    "--async-fork-workers can't be used with --async-loop-thread"
+                )
+            if controller or hasattr(session.config, "workerinput"):
+                raise pytest.UsageError("--async-fork-workers can't be used with pytest-xdist")
+            if gathering:
+                raise pytest.UsageError(
+                    f"--async-fork-workers can't be used with {', '.join(gathering)}"
+                    " as what they find in the workers isn't sent back"
+                )
+
+            # The workers only run one test at a time
+            self._concurrent_tests = None
+            session.config.pluginmanager.register(
+                forking.ForkedWorkers(
+                    count=fork_workers,
+                    in_worker=self._in_forked_worker,
+                    running=self._running,
+                ),
+                "alt_pytest_asyncio_forking",
+            )
+
+        if daemon_path := session.config.getoption("async_daemon", None):
+            if sys.platform != "linux":
+                raise pytest.UsageError("--async-daemon is only available on Linux")
+            if _uses_loop_thread(session.config):
+                raise pytest.UsageError("--async-daemon can't be used with --async-loop-thread")
+            if controller or hasattr(session.config, "workerinput"):
+                raise pytest.UsageError("--async-daemon can't be used with pytest-xdist")
+            if fork_workers is not None and fork_workers > 1:
+                raise pytest.UsageError("--async-daemon can't be used with --async-fork-workers")
+            if gathering:
+                raise pytest.UsageError(
+                    f"--async-daemon can't be used with {', '.join(gathering)}"
+                    " as what they find in each run isn't sent back"
+                )
+
+            self._concurrent_tests = None
+            session.config.pluginmanager.register(
+                daemon.Daemon(
+                    path=session.config.invocation_params.dir / daemon_path,
+                    in_worker=self._in_forked_worker,
+                    running=self._running,
+                ),
+                "alt_pytest_asyncio_daemon",
+            )
+        elif connect_path := session.config.getoption("async_daemon_connect", None):
+            session.config.pluginmanager.register(
+                daemon.DaemonClient(path=session.config.invocation_params.dir / connect_path),
+                "alt_pytest_asyncio_daemon_client",
+            )
+        yield
+
+    def _start_loop(self, session: pytest.Session) -> None:
+        """
+        Create the session loop
+        """
+        self._session_loop_factory = session.config.hook.pytest_async_loop_factory(
+            config=session.config
+        )
+        self._virtual_time_loop = bool(
+            session.config.getoption("async_virtual_time_loop", None)
+            or session.config.getini("async_virtual_time_loop")
+        )
         if self._managed_loop is None:
-            self._cm.enter_context(loop_manager.Loop(new_loop=True))
+            self._cm.enter_context(self._new_session_loop())
         else:
             self._cm.enter_context(_ManagedLoop(loop=self._managed_loop))
 
-        yield
+        if session.config.getoption("async_eager_tasks", None) or session.config.getini(
+            "async_eager_tasks"
+        ):
+            if sys.version_info >= (3, 12):
+                self._converter.eager_tasks = True
+                self._use_eager_tasks(asyncio.get_event_loop_policy().get_event_loop())
+            else:
+                session.config.issue_config_time_warning(
+                    pytest.PytestConfigWarning(
+                        "Eager tasks are only available from python 3.12 and will not be used"
+                    ),
+                    stacklevel=2,
+                )
+
+        if _uses_loop_thread(session.config):
+            loop = asyncio.get_event_loop_policy().get_event_loop()
+            if not loop.is_running():
+                thread = loop_thread.LoopThread(
+                    loop=loop,
+                    name=f"alt-pytest-asyncio-loop-{workers.worker_id(session.config)}",
+                )
+                thread.start()
+                self._cm.callback(thread.stop)
+                self._converter.loop_thread = thread
+
+    def _new_session_loop(self) -> loop_manager.Loop:
+        loop_factory = self._session_loop_factory
+        if (
+            loop_factory is None
+            and self._virtual_time_loop
+            and virtual_time.default_loop_supports_virtual_time()
+        ):
+            loop_factory = virtual_time.VirtualTimeEventLoop
+        return loop_manager.Loop(new_loop=True, loop_factory=loop_factory)
+
+    def _in_forked_worker(self, stack: contextlib.ExitStack) -> None:
+        """
+        Give a process forked by ``--async-fork-workers`` or ``--async-daemon``
+        a loop and helper threads of its own. The loop is closed when the
+        stack is closed.
+        """
+        # What the parent process has entered is left for the parent to close
+        self._cm.pop_all()
+
+        for watcher in self._converter.loop_watchers:
+            if isinstance(watcher, watchdog.Watchdog | stalls.StallDetector):
+                watcher.after_fork()
+
+        # The loops from the parent process are left alone as they share
+        # file descriptors with the parent
+        self._loops = {}
+        manager = stack.enter_context(self._new_session_loop())
+        if self._converter.eager_tasks:
+            assert manager.controlled_loop is not None
+            self._use_eager_tasks(manager.controlled_loop)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_async_loop_factory(self, config: pytest.Config) -> protocols.LoopFactory | None:
+        """Use the loop factory from the options if there is one"""
+        spec = config.getoption("async_loop_factory", None) or config.getini("async_loop_factory")
+        if not spec:
+            return None
+
+        try:
+            return loop_manager.import_loop_factory(spec)
+        except errors.LoopFactoryNotFound as error:
+            raise pytest.UsageError(str(error)) from error
+
+    def _use_eager_tasks(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Make tasks created on this loop start eagerly until the session is over
+        """
+        if sys.version_info >= (3, 12):
+            self._cm.callback(loop.set_task_factory, loop.get_task_factory())
+            loop.set_task_factory(asyncio.eager_task_factory)
+
+    def _loop_for(self, item: pytest.Item) -> asyncio.AbstractEventLoop | None:
+        """
+        Return the loop this test should use if it's not the session loop
+        """
+        loop_factory = item.ihook.pytest_async_loop_factory(config=item.config)
+        if loop_factory is None or loop_factory is self._session_loop_factory:
+            return None
+
+        if (loop := self._loops.get(loop_factory)) is None:
+            session_loop = asyncio.get_event_loop_policy().get_event_loop()
+            manager = loop_manager.Loop(new_loop=True, loop_factory=loop_factory)
+            self._cm.enter_context(manager)
+            asyncio.set_event_loop(session_loop)
+
+            assert manager.controlled_loop is not None
+            loop = self._loops[loop_factory] = manager.controlled_loop
+            if self._converter.eager_tasks:
+                self._use_eager_tasks(loop)
+
+        return loop
+
+    @pytest.hookimpl
+    def pytest_collection_finish(self, session: pytest.Session) -> None:
+        if self._concurrent_tests is not None:
+            self._item_positions = {item: i for i, item in enumerate(session.items)}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(
+        self, item: pytest.Item, nextitem: pytest.Item | None
+    ) -> bool | None:
+        """Run batches of eligible async tests concurrently"""
+        if item in self._ran_concurrently:
+            self._ran_concurrently.discard(item)
+            return True
+
+        if self._concurrent_tests is None:
+            return None
+
+        batch, after = self._concurrent_tests.batch_for(item, nextitem, self._item_positions)
+        if len(batch) < 2:
+            return None
+
+        self._ran_concurrently.update(batch[1:])
+        concurrency.run_batch(self._converter, batch, nextitem=after)
+        return True
+
+    @pytest.hookimpl(hookwrapper=True, specname="pytest_runtest_protocol")
+    def pytest_runtest_protocol_loop(
+        self, item: pytest.Item, nextitem: pytest.Item | None
+    ) -> Iterator[None]:
+        """Run the test on the loop it asks for and with virtual time if it wants that"""
+        with self._running(item):
+            yield
+
+    @contextlib.contextmanager
+    def _running(self, item: pytest.Item) -> Iterator[None]:
+        with contextlib.ExitStack() as stack:
+            loop = asyncio.get_event_loop_policy().get_event_loop()
+            if (item_loop := self._loop_for(item)) is not None:
+                asyncio.set_event_loop(item_loop)
+                stack.callback(asyncio.set_event_loop, loop)
+                loop = item_loop
+
+            if isinstance(loop, virtual_time.VirtualTimeEventLoop):
+                stack.enter_context(loop.using_virtual_time(virtual_time.uses_virtual_time(item)))
+
+            yield
 
     @pytest.hookimpl(tryfirst=True, hookwrapper=True)
     def pytest_sessionfinish(self, session: pytest.Session, exitstatus: int) -> Iterator[None]:
@@ -91,28 +750,86 @@ class AltPytestAsyncioPlugin:
             if _cm := getattr(self, "_cm", None):
                 _cm.close()
 
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(
+        self, session: pytest.Session, config: pytest.Config, items: list[pytest.Item]
+    ) -> None:
+        """Convert async fixtures and tests once, rather than every time they are used"""
+        if not self._converter.convert_items(items):
+            # Nothing was collected that needs us
+            self._cm.close()
+            config.pluginmanager.unregister(self)
+            return
+
+        if self._converter.sync_fast_path:
+            self._start_loop(session)
+
     @pytest.hookimpl(tryfirst=True, hookwrapper=True)
     def pytest_fixture_setup(
         self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
     ) -> Iterator[None]:
         """Convert async fixtures to sync fixtures"""
-        self._converter.convert_fixturedef(fixturedef, request)
+        # This does nothing for fixtures that were converted during collection
+        self._converter.convert_fixturedef(fixturedef)
+        self._converter.setting_up_fixture(fixturedef, request)
+        try:
+            yield
+        finally:
+            self._converter.finished_setting_up_fixture(fixturedef)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_fixture_post_finalizer(
+        self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
+    ) -> None:
+        self._converter.forget_timeouts(fixturedef)
+        # After the tracer and fixture timings have seen when the teardown started
+        self._converter.finished_teardown(fixturedef)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item: pytest.Item) -> Iterator[None]:
+        """Make sure fixtures that were started early don't outlive a failed setup"""
+        try:
+            if virtual_time.uses_virtual_time(item):
+                loop = asyncio.get_event_loop_policy().get_event_loop()
+                if not isinstance(loop, virtual_time.VirtualTimeEventLoop):
+                    raise errors.VirtualTimeNotSupported(
+                        f"The current event loop ({type(loop).__name__}) doesn't support virtual time,"
+                        " the session loop only does with --async-virtual-time-loop"
+                    )
+            yield
+        finally:
+            self._converter.discard_started_fixtures()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(
+        self, item: pytest.Item, nextitem: pytest.Item | None
+    ) -> Iterator[None]:
+        """Run the teardown of independent async generator fixtures together"""
+        if self._converter.teardown_fixtures_concurrently:
+            self._converter.teardown_concurrently(item, nextitem)
         yield
 
     @pytest.hookimpl(tryfirst=True, hookwrapper=True)
     def pytest_pyfunc_call(self, pyfuncitem: pytest.Function) -> Iterator[None]:
         """Convert async tests to sync tests"""
+        # This does nothing for tests that were converted during collection
         self._converter.convert_pyfunc(pyfuncitem)
         yield
 
 
 class LoadedAsyncTimeout(base.AsyncTimeout):
+    deadline_manager: ClassVar[deadlines.DeadlineManager] = deadlines.DeadlineManager()
+
+    # How many fixtures and tests have been cancelled for taking too long
+    timed_out: ClassVar[int] = 0
+
     def __init__(self, *, default_timeout: float) -> None:
         self.error: BaseException | None = None
         self.timeout: float = default_timeout
         self.cancelled: bool = False
         self.run_count: int = 0
-        self._timeout: asyncio.TimerHandle | None = None
+        self._deadline: deadlines.Deadline | None = None
+        self._task_ref: weakref.ref[asyncio.Task[object]] | None = None
 
     def use_default_timeout(self) -> None:
         self.set_timeout_seconds(self.timeout)
@@ -127,23 +844,71 @@ class LoadedAsyncTimeout(base.AsyncTimeout):
             return gettrace is not None and gettrace() is not None
 
     def set_timeout_seconds(self, timeout: float) -> None:
-        if self._timeout:
-            self._timeout.cancel()
-
         self.timeout = timeout
+
         current_task = asyncio.current_task()
+        if current_task is None:
+            return
+
+        deadline = self._deadline
+        if deadline is None or self._task_ref is None or self._task_ref() is not current_task:
+            if deadline is not None:
+                deadline.cancel()
+
+            # Only hold onto the task weakly so that finished tests aren't kept alive
+            # by timeouts that haven't fired yet
+            task_ref = self._task_ref = weakref.ref(current_task)
+            deadline = self._deadline = self.deadline_manager.deadline(
+                current_task.get_loop(), lambda: self._timeout_task(task_ref)
+            )
+            current_task.add_done_callback(lambda _: deadline.cancel())
+
+        # The timeout is always in real seconds, even if the loop is using virtual time
+        deadline.set_seconds(timeout)
+
+    def remaining_seconds(self) -> float | None:
+        """
+        Return how many seconds are left before the current fixture or test is
+        cancelled, or None if it isn't running.
+        """
+        if self._deadline is None:
+            return None
+        return self._deadline.remaining_seconds()
 
-        def timeout_task(task: asyncio.Task[object] | None) -> None:
-            if timeout < self.timeout:
-                return
+    @contextlib.contextmanager
+    def budget(self, seconds: float) -> Iterator[None]:
+        """
+        Make sure the code in this block doesn't take more than this many seconds.
 
-            if task and not task.done():
-                # If the debugger is active then don't cancel, so that debugging may continue
-                if not self.debugger_enabled():
-                    self.cancelled = True
-                    task.cancel()
+        The original timeout applies again after the block unless it would have
+        been reached first.
+        """
+        deadline = self._deadline
+        remaining = None if deadline is None else deadline.remaining_seconds()
+        if deadline is None or deadline.when is None or remaining is None or remaining <= seconds:
+            # The timeout we already have will be reached first
+            yield
+            return
 
-        self._timeout = asyncio.get_event_loop().call_later(timeout, timeout_task, current_task)
+        original_when = deadline.when
+        original_timeout = self.timeout
+        self.timeout = seconds
+        deadline.set_seconds(seconds)
+        try:
+            yield
+        finally:
+            if not self.cancelled:
+                self.timeout = original_timeout
+                deadline.set_when(original_when)
+
+    def _timeout_task(self, task_ref: "weakref.ref[asyncio.Task[object]]") -> None:
+        task = task_ref()
+        if task and not task.done():
+            # If the debugger is active then don't cancel, so that debugging may continue
+            if not self.debugger_enabled():
+                self.cancelled = True
+                LoadedAsyncTimeout.timed_out += 1
+                task.cancel()
 
     def raise_maybe(self, func: Callable[..., object]) -> None:
         __tracebackhide__ = True
@@ -208,6 +973,32 @@ def async_timeout() -> protocols.AsyncTimeoutProvider:
     return AsyncTimeoutProvider(timeout_factory=LoadedAsyncTimeout)
 
 
+@pytest.fixture(scope="session")
+def async_shared(pytestconfig: pytest.Config) -> workers.SharedResources:
+    """
+    Gives an object for setting something up in only one pytest-xdist worker
+    and sharing it with the other workers. See
+    ``alt_pytest_asyncio.workers.SharedResources``.
+    """
+    worker = pytestconfig.pluginmanager.get_plugin("alt_pytest_asyncio_worker")
+    assert isinstance(worker, workers.Worker)
+    return worker.shared
+
+
+@pytest.fixture()
+@converter.needs_loop
+def async_benchmark(request: pytest.FixtureRequest) -> benchmark.AsyncBenchmark:
+    """
+    Gives a callable that times how long an awaitable takes on the loop for
+    the test. See ``alt_pytest_asyncio.benchmark.AsyncBenchmark``.
+
+    This can only be used from sync tests.
+    """
+    benchmarks = request.config.pluginmanager.get_plugin("alt_pytest_asyncio_benchmarks")
+    assert isinstance(benchmarks, benchmark.Benchmarks)
+    return benchmark.AsyncBenchmark(benchmarks=benchmarks, request=request)
+
+
 if TYPE_CHECKING:
     _ATP: protocols.AsyncTimeoutProvider = cast(AsyncTimeoutProvider, None)
     _ATPF: protocols.AsyncTimeout = cast(AsyncTimeoutProvider, None)
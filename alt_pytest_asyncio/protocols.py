@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 from collections.abc import Coroutine
 from typing import TYPE_CHECKING, NoReturn, ParamSpec, Protocol, TypeVar, cast
 
@@ -14,8 +15,20 @@ class Loop(Protocol):
     def run_until_complete(self, coro: Coroutine[object, object, T_Ret]) -> T_Ret: ...
 
 
+class LoopFactory(Protocol):
+    def __call__(self) -> asyncio.AbstractEventLoop: ...
+
+
+class LoopWatcher(Protocol):
+    def watching(
+        self, loop: asyncio.AbstractEventLoop
+    ) -> contextlib.AbstractContextManager[None]: ...
+
+
 class AsyncTimeout(Protocol):
     def set_timeout_seconds(self, timeout: float) -> None: ...
+    def remaining_seconds(self) -> float | None: ...
+    def budget(self, seconds: float) -> contextlib.AbstractContextManager[None]: ...
 
 
 class AsyncTimeoutFactory(Protocol):
@@ -25,6 +38,8 @@ class AsyncTimeoutFactory(Protocol):
 class AsyncTimeoutProvider(Protocol):
     def load(self, *, default_timeout: float) -> base.AsyncTimeout: ...
     def set_timeout_seconds(self, timeout: float) -> NoReturn: ...
+    def remaining_seconds(self) -> NoReturn: ...
+    def budget(self, seconds: float) -> NoReturn: ...
 
 
 if TYPE_CHECKING:
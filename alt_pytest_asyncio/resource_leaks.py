@@ -0,0 +1,161 @@
+import asyncio
+import contextlib
+import dataclasses
+import os
+import warnings
+from collections.abc import Generator, Iterator
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from . import errors
+
+
+def open_fds() -> int | None:
+    """
+    Return how many file descriptors this process has open, or None if that
+    can't be found on this platform.
+    """
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def live_transports(loop: asyncio.AbstractEventLoop) -> int | None:
+    """
+    Return how many transports on this loop haven't been closed, or None if the
+    loop doesn't keep track of its transports.
+    """
+    # Selector event loops keep a weak map of file descriptor to transport
+    transports = getattr(loop, "_transports", None)
+    if transports is None:
+        return None
+    return sum(1 for transport in list(transports.values()) if not transport.is_closing())
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class ResourceGrowth:
+    """
+    The resources a test left open and the ``ResourceWarning`` seen during it
+    """
+
+    nodeid: str
+    fds: int | None
+    transports: int | None
+    resource_warnings: tuple[str, ...]
+
+    def exceeds(self, threshold: int) -> bool:
+        return (self.fds or 0) > threshold or (self.transports or 0) > threshold
+
+    def format(self) -> str:
+        counts = []
+        if self.fds:
+            counts.append(f"{self.fds:+} file descriptors")
+        if self.transports:
+            counts.append(f"{self.transports:+} transports")
+        if self.resource_warnings:
+            counts.append(f"{len(self.resource_warnings)} ResourceWarning")
+
+        lines = [f"{self.nodeid}: {', '.join(counts)}"]
+        lines.extend(f"  {warning}" for warning in self.resource_warnings)
+        return "\n".join(lines)
+
+
+class ResourceLeakDetector:
+    """
+    Counts the open file descriptors and live transports on the loop before each
+    test is setup and after it is torn down. It also collects the
+    ``ResourceWarning`` raised whilst the loop runs async fixtures and tests.
+
+    Tests that leave more than ``threshold`` file descriptors or transports open
+    are reported at the end of the session and with ``mode`` of "warn" or
+    "fail" also get a warning or a teardown error. Tests that caused a
+    ``ResourceWarning`` are always reported.
+    """
+
+    def __init__(self, *, mode: str = "report", threshold: int = 0) -> None:
+        self.mode = mode
+        self.threshold = threshold
+        self.growths: list[ResourceGrowth] = []
+        self._before: tuple[int | None, int | None] = (None, None)
+        self._resource_warnings: list[str] = []
+
+    @contextlib.contextmanager
+    def watching(self, loop: asyncio.AbstractEventLoop) -> Iterator[None]:
+        """
+        Collect the ``ResourceWarning`` raised whilst the code in this block runs
+        """
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            try:
+                yield
+            finally:
+                for warning in caught:
+                    if issubclass(warning.category, ResourceWarning):
+                        self._resource_warnings.append(
+                            f"{warning.filename}:{warning.lineno}: {warning.message}"
+                        )
+
+        # Give everything back to whatever was recording warnings before us
+        for warning in caught:
+            with warnings.catch_warnings():
+                warnings.simplefilter("always", ResourceWarning)
+                warnings.warn_explicit(
+                    warning.message,
+                    warning.category,
+                    warning.filename,
+                    warning.lineno,
+                    source=warning.source,
+                )
+
+    def _counts(self) -> tuple[int | None, int | None]:
+        loop = asyncio.get_event_loop_policy().get_event_loop()
+        return open_fds(), None if loop.is_closed() else live_transports(loop)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        self._before = self._counts()
+        self._resource_warnings = []
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_teardown(
+        self, item: pytest.Item, nextitem: pytest.Item | None
+    ) -> Generator[None, None, None]:
+        result = yield
+
+        fds, transports = self._counts()
+        fds_before, transports_before = self._before
+        growth = ResourceGrowth(
+            nodeid=item.nodeid,
+            fds=None if fds is None or fds_before is None else fds - fds_before,
+            transports=(
+                None
+                if transports is None or transports_before is None
+                else transports - transports_before
+            ),
+            resource_warnings=tuple(self._resource_warnings),
+        )
+        self._resource_warnings = []
+
+        exceeded = growth.exceeds(self.threshold)
+        if exceeded or growth.resource_warnings:
+            self.growths.append(growth)
+
+        if exceeded and self.mode == "warn":
+            warnings.warn(errors.ResourceLeakWarning(growth.format()), stacklevel=1)
+        elif exceeded and self.mode == "fail":
+            raise errors.ResourceLeak(growth.format())
+
+        return result
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        if not self.growths:
+            return
+
+        terminalreporter.section("async resource leaks")
+        for growth in self.growths:
+            terminalreporter.line(growth.format())
@@ -0,0 +1,229 @@
+import asyncio
+import contextlib
+import dataclasses
+import os
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Generator, Iterator
+from types import FrameType
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Stall:
+    """
+    A time the event loop didn't get to run anything else for too long
+    """
+
+    nodeid: str
+    when: str
+    seconds: float
+    stack: tuple[str, ...]
+
+    def format(self) -> str:
+        return (
+            f"{self.nodeid} ({self.when}) blocked the event loop for {self.seconds * 1000:.0f}ms\n"
+            + "".join(self.stack)
+        )
+
+
+def _blocking_stack(frame: FrameType | None) -> tuple[str, ...]:
+    """
+    Return the formatted stack for this frame, starting from the callback the
+    event loop was running.
+    """
+    if frame is None:
+        return ()
+
+    summary = traceback.extract_stack(frame)
+    start = 0
+    for i, frame_summary in enumerate(summary):
+        if frame_summary.name == "_run" and frame_summary.filename.endswith(
+            os.path.join("asyncio", "events.py")
+        ):
+            start = i + 1
+
+    return tuple(traceback.StackSummary.from_list(summary[start:]).format())
+
+
+class StallDetector:
+    """
+    Watches for the event loop not getting to run anything else for more than
+    ``threshold`` seconds whilst it runs an async fixture or test, and records
+    what the thread running the loop was doing at the time.
+
+    A helper thread regularly schedules a callback on the loop. If that callback
+    hasn't run after ``threshold`` seconds, the stack of the thread running the
+    loop is sampled, which shows the code that is blocking the loop.
+
+    This is also a pytest plugin that puts the stalls in the reports for
+    the tests they happened in and in the terminal summary. Tests with a stall
+    longer than ``fail_after`` seconds are failed.
+    """
+
+    def __init__(self, *, threshold: float, fail_after: float | None = None) -> None:
+        self.threshold = threshold
+        self.fail_after = fail_after
+        self.stalls: list[Stall] = []
+
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._ident: int | None = None
+        self._generation = 0
+        self._ticked = threading.Event()
+        self._stalled: tuple[float, tuple[str, ...]] | None = None
+        self._pending: list[tuple[float, tuple[str, ...]]] = []
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._watch, name="alt-pytest-asyncio-stalls", daemon=True
+        )
+        self._thread.start()
+
+    def after_fork(self) -> None:
+        """
+        Start the helper thread again in a process forked from this one, as
+        only the thread that forked is copied into the new process.
+        """
+        self._cond = threading.Condition()
+        self._ticked = threading.Event()
+        if self._thread is not None and not self._stopped:
+            self.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._ticked.set()
+            self._cond.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @contextlib.contextmanager
+    def watching(self, loop: asyncio.AbstractEventLoop) -> Iterator[None]:
+        """
+        Look for stalls in this loop whilst the code in this block runs
+        """
+        with self._cond:
+            previous = (self._loop, self._ident)
+            self._loop = loop
+            # The loop may be running in another thread
+            self._ident = getattr(loop, "_thread_id", None) or threading.get_ident()
+            self._generation += 1
+            self._cond.notify()
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._loop, self._ident = previous
+                self._generation += 1
+                self._record_stall()
+                self._ticked.set()
+                self._cond.notify()
+
+    def _tick(self) -> None:
+        with self._cond:
+            self._record_stall()
+            self._ticked.set()
+
+    def _record_stall(self) -> None:
+        """
+        Record the stall we're in, now that the loop has come back.
+
+        This is done from the thread running the loop so that the stall is
+        there before the report for the current test is made.
+        """
+        if self._stalled is not None:
+            posted, stack = self._stalled
+            self._stalled = None
+            self._pending.append((time.monotonic() - posted, stack))
+
+    def _watch(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped and self._loop is None:
+                    self._cond.wait()
+                if self._stopped or self._loop is None:
+                    return
+
+                loop, ident, generation = self._loop, self._ident, self._generation
+                self._ticked.clear()
+
+            posted = time.monotonic()
+            try:
+                loop.call_soon_threadsafe(self._tick)
+            except RuntimeError:
+                # The loop was closed under us
+                with self._cond:
+                    self._cond.wait_for(lambda: self._generation != generation or self._stopped)
+                continue
+
+            if not self._ticked.wait(self.threshold):
+                with self._cond:
+                    if not self._ticked.is_set() and self._generation == generation:
+                        assert ident is not None
+                        stack = _blocking_stack(sys._current_frames().get(ident))
+                        self._stalled = (posted, stack)
+
+                self._ticked.wait()
+
+            # Don't keep the loop busy with our callbacks
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._generation != generation or self._stopped,
+                    timeout=self.threshold / 2,
+                )
+
+    def _take_pending(self, nodeid: str, when: str) -> list[Stall]:
+        with self._cond:
+            pending, self._pending = self._pending, []
+
+        stalls = [
+            Stall(nodeid=nodeid, when=when, seconds=seconds, stack=stack)
+            for seconds, stack in pending
+        ]
+        self.stalls.extend(stalls)
+        return stalls
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_makereport(
+        self, item: pytest.Item, call: pytest.CallInfo[None]
+    ) -> Generator[None, pytest.TestReport, pytest.TestReport]:
+        report = yield
+
+        stalls = self._take_pending(item.nodeid, call.when)
+        if not stalls:
+            return report
+
+        text = "\n".join(stall.format() for stall in stalls)
+        report.sections.append((f"async stalls {call.when}", text))
+
+        if (
+            self.fail_after is not None
+            and report.passed
+            and any(stall.seconds >= self.fail_after for stall in stalls)
+        ):
+            report.outcome = "failed"
+            report.longrepr = (
+                f"The event loop was blocked for longer than {self.fail_after} seconds\n\n{text}"
+            )
+
+        return report
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        if not self.stalls:
+            return
+
+        terminalreporter.section("async stalls")
+        for stall in sorted(self.stalls, key=lambda stall: stall.seconds, reverse=True):
+            terminalreporter.write(stall.format())
+            terminalreporter.line("")
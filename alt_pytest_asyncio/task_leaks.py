@@ -0,0 +1,221 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import dataclasses
+import os
+import traceback
+from collections.abc import Generator, Iterator
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from . import converter
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class TaskLeak:
+    """
+    A task that was still running after the test or fixture that made it was
+    finished
+    """
+
+    nodeid: str
+    fixture: str | None
+    task: str
+    stack: tuple[str, ...]
+    cancelled: bool
+
+    def format(self) -> str:
+        made_by = self.nodeid if self.fixture is None else f"{self.fixture} for {self.nodeid}"
+        action = "was cancelled" if self.cancelled else "is still running"
+        return f"{self.task} made by {made_by} {action}\n" + "".join(self.stack)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class _Made:
+    task: asyncio.Future[object]
+    nodeid: str
+    fixture: str | None
+    stack: traceback.StackSummary
+
+
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+
+def _creation_stack() -> traceback.StackSummary:
+    """
+    Return the stack that made a task, starting from the callback the event
+    loop was running and without the frames from asyncio and this module.
+    """
+    summary = traceback.extract_stack()
+    start = 0
+    for i, frame in enumerate(summary):
+        if frame.name == "_run" and frame.filename == os.path.join(_ASYNCIO_DIR, "events.py"):
+            start = i + 1
+
+    return traceback.StackSummary.from_list(
+        [
+            frame
+            for frame in summary[start:]
+            if not frame.filename.startswith(_ASYNCIO_DIR) and frame.filename != __file__
+        ]
+    )
+
+
+def _runs_in_this_thread(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+class TaskLeakDetector:
+    """
+    Remembers the tasks made on the loop whilst async fixtures and tests run
+    and looks for any that are still running once the test that made them is
+    torn down.
+
+    Tasks made during the setup of a fixture that isn't function scoped belong
+    to that fixture and are looked at when that fixture is torn down instead.
+
+    Tasks that are left running are reported against the test that made them
+    and when ``cancel`` is True they are also cancelled, waiting up to
+    ``cancel_timeout`` seconds for them to finish.
+    """
+
+    def __init__(self, *, cancel: bool = False, cancel_timeout: float = 5) -> None:
+        self.cancel = cancel
+        self.cancel_timeout = cancel_timeout
+        self.leaks: list[TaskLeak] = []
+        self._nodeid = ""
+        self._fixtures: list[pytest.FixtureDef[object]] = []
+        self._made: dict[str | pytest.FixtureDef[object], list[_Made]] = {}
+        self._pending: list[TaskLeak] = []
+
+    @contextlib.contextmanager
+    def watching(self, loop: asyncio.AbstractEventLoop) -> Iterator[None]:
+        """
+        Remember the tasks made on this loop whilst the code in this block runs
+        """
+        with converter.seeing_tasks(loop, lambda task, coro: self._remember(task)):
+            yield
+
+    def _remember(self, task: asyncio.Future[object]) -> None:
+        if task.done():
+            return
+
+        owner: str | pytest.FixtureDef[object] = self._nodeid
+        fixture: str | None = None
+        if self._fixtures:
+            owner = self._fixtures[-1]
+            fixture = owner.argname
+
+        made = self._made.setdefault(owner, [])
+        made.append(
+            _Made(task=task, nodeid=self._nodeid, fixture=fixture, stack=_creation_stack())
+        )
+
+    def _check(self, made: list[_Made]) -> None:
+        # Tasks that were cancelled but haven't had a chance to finish yet have
+        # been cleaned up as far as the test is concerned
+        running = [
+            m
+            for m in made
+            if not m.task.done() and not (isinstance(m.task, asyncio.Task) and m.task.cancelling())
+        ]
+        if not running:
+            return
+
+        if self.cancel:
+            by_loop: dict[asyncio.AbstractEventLoop, list[asyncio.Future[object]]] = {}
+            for m in running:
+                by_loop.setdefault(m.task.get_loop(), []).append(m.task)
+
+            for loop, tasks in by_loop.items():
+                if loop.is_closed():
+                    continue
+
+                if not loop.is_running():
+                    loop.run_until_complete(self._cancel(tasks))
+                elif not _runs_in_this_thread(loop):
+                    # Tasks may only be cancelled from the thread running their
+                    # loop, like the one from --async-loop-thread
+                    concurrent.futures.wait(
+                        [asyncio.run_coroutine_threadsafe(self._cancel(tasks), loop)]
+                    )
+                else:
+                    for task in tasks:
+                        task.cancel()
+
+        for m in running:
+            name = m.task.get_name() if isinstance(m.task, asyncio.Task) else repr(m.task)
+            coro = m.task.get_coro() if isinstance(m.task, asyncio.Task) else None
+            leak = TaskLeak(
+                nodeid=m.nodeid,
+                fixture=m.fixture,
+                task=f"{name} ({getattr(coro, '__qualname__', coro)})",
+                stack=tuple(m.stack.format()),
+                cancelled=self.cancel,
+            )
+            self.leaks.append(leak)
+            self._pending.append(leak)
+
+    async def _cancel(self, tasks: list[asyncio.Future[object]]) -> None:
+        for task in tasks:
+            task.cancel()
+        await asyncio.wait(tasks, timeout=self.cancel_timeout)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        self._nodeid = item.nodeid
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(
+        self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
+    ) -> Generator[None, object, object]:
+        if fixturedef.scope == "function":
+            return (yield)
+
+        self._fixtures.append(fixturedef)
+        try:
+            return (yield)
+        finally:
+            self._fixtures.pop()
+
+    @pytest.hookimpl
+    def pytest_fixture_post_finalizer(
+        self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
+    ) -> None:
+        if (made := self._made.pop(fixturedef, None)) is not None:
+            self._check(made)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_teardown(
+        self, item: pytest.Item, nextitem: pytest.Item | None
+    ) -> Generator[None, None, None]:
+        try:
+            return (yield)
+        finally:
+            self._check(self._made.pop(item.nodeid, []))
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_makereport(
+        self, item: pytest.Item, call: pytest.CallInfo[None]
+    ) -> Generator[None, pytest.TestReport, pytest.TestReport]:
+        report = yield
+        if call.when == "teardown" and self._pending:
+            leaks, self._pending = self._pending, []
+            report.sections.append(
+                ("async task leaks", "\n".join(leak.format() for leak in leaks))
+            )
+        return report
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        if not self.leaks:
+            return
+
+        terminalreporter.section("async task leaks")
+        for leak in self.leaks:
+            terminalreporter.write(leak.format())
+            terminalreporter.line("")
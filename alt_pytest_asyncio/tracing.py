@@ -0,0 +1,157 @@
+import asyncio
+import contextlib
+import json
+import os
+import pathlib
+import threading
+import time
+from collections.abc import Coroutine, Generator, Iterator
+
+import pytest
+
+from . import converter
+
+
+class Tracer:
+    """
+    Records a timeline of the session that can be opened with Perfetto or
+    ``chrome://tracing``.
+
+    The setup, call and teardown of each test, the setup and teardown of each
+    fixture and the tasks created on the loop whilst async fixtures and tests
+    run are all recorded as spans and written to ``path`` in the Chrome trace
+    event format when the session is finished.
+    """
+
+    def __init__(self, *, converter: converter.Converter, path: pathlib.Path) -> None:
+        self.converter = converter
+        self.path = path
+        self.events: list[dict[str, object]] = []
+        self._pid = os.getpid()
+        self._start = time.perf_counter_ns()
+        self._nodeid = ""
+        self._fixture_args: dict[pytest.FixtureDef[object], dict[str, object]] = {}
+
+    def _now(self) -> int:
+        """
+        Microseconds since the tracer was made
+        """
+        return (time.perf_counter_ns() - self._start) // 1000
+
+    def _complete(self, name: str, category: str, start: int, args: dict[str, object]) -> None:
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start,
+                "dur": self._now() - start,
+                "pid": self._pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: object) -> Iterator[None]:
+        """
+        Record the code in this block as a span
+        """
+        start = self._now()
+        try:
+            yield
+        finally:
+            self._complete(name, category, start, args)
+
+    @contextlib.contextmanager
+    def watching(self, loop: asyncio.AbstractEventLoop) -> Iterator[None]:
+        """
+        Record the tasks created on this loop whilst the code in this block runs
+        """
+        nodeid = self._nodeid
+
+        def record(task: asyncio.Future[object], coro: Coroutine[object, object, object]) -> None:
+            self._record_task(task, coro, nodeid)
+
+        with converter.seeing_tasks(loop, record):
+            yield
+
+    def _record_task(
+        self, task: asyncio.Future[object], coro: Coroutine[object, object, object], nodeid: str
+    ) -> None:
+        event: dict[str, object] = {
+            "name": getattr(coro, "__qualname__", type(coro).__name__),
+            "cat": "task",
+            "id": id(task),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        self.events.append({**event, "ph": "b", "ts": self._now(), "args": {"nodeid": nodeid}})
+
+        def done(task: asyncio.Future[object]) -> None:
+            outcome = "cancelled" if task.cancelled() else "done"
+            if outcome == "done" and task.exception() is not None:
+                outcome = "error"
+
+            # The name of the task may be changed after it's made
+            args = {"outcome": outcome}
+            if isinstance(task, asyncio.Task):
+                args["task"] = task.get_name()
+            self.events.append({**event, "ph": "e", "ts": self._now(), "args": args})
+
+        task.add_done_callback(done)
+
+    def write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as fle:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, fle)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_setup(self, item: pytest.Item) -> Generator[None, None, None]:
+        self._nodeid = item.nodeid
+        with self.span(f"setup {item.nodeid}", "test", nodeid=item.nodeid):
+            return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_call(self, item: pytest.Item) -> Generator[None, None, None]:
+        self._nodeid = item.nodeid
+        with self.span(f"call {item.nodeid}", "test", nodeid=item.nodeid):
+            return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_teardown(
+        self, item: pytest.Item, nextitem: pytest.Item | None
+    ) -> Generator[None, None, None]:
+        self._nodeid = item.nodeid
+        with self.span(f"teardown {item.nodeid}", "test", nodeid=item.nodeid):
+            return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(
+        self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
+    ) -> Generator[None, object, object]:
+        args: dict[str, object] = {
+            "scope": fixturedef.scope,
+            "nodeid": request.node.nodeid,
+            "baseid": fixturedef.baseid,
+        }
+        try:
+            with self.span(fixturedef.argname, "fixture setup", **args):
+                return (yield)
+        finally:
+            self._fixture_args[fixturedef] = args
+            self.converter.watch_teardown(fixturedef)
+
+    @pytest.hookimpl
+    def pytest_fixture_post_finalizer(
+        self, fixturedef: pytest.FixtureDef[object], request: pytest.FixtureRequest
+    ) -> None:
+        args = self._fixture_args.pop(fixturedef, None)
+        started = self.converter.teardown_started(fixturedef)
+        if args is not None and started is not None:
+            start = (started - self._start) // 1000
+            self._complete(fixturedef.argname, "fixture teardown", start, args)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        self.write()
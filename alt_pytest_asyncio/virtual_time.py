@@ -0,0 +1,185 @@
+import asyncio
+import contextlib
+import heapq
+import selectors
+import time
+import warnings
+from collections.abc import Callable, Iterator, Mapping
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from _typeshed import FileDescriptorLike
+
+
+class _VirtualTimeSelector(selectors.BaseSelector):
+    """
+    Wraps the selector for a ``VirtualTimeEventLoop`` so that when the loop
+    would otherwise block waiting for the next timer, the virtual clock is moved
+    forward instead.
+    """
+
+    def __init__(self, selector: selectors.BaseSelector, loop: "VirtualTimeEventLoop") -> None:
+        self._selector = selector
+        self._loop = loop
+
+    def register(
+        self, fileobj: "FileDescriptorLike", events: int, data: object = None
+    ) -> selectors.SelectorKey:
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj: "FileDescriptorLike") -> selectors.SelectorKey:
+        return self._selector.unregister(fileobj)
+
+    def modify(
+        self, fileobj: "FileDescriptorLike", events: int, data: object = None
+    ) -> selectors.SelectorKey:
+        return self._selector.modify(fileobj, events, data)
+
+    def get_key(self, fileobj: "FileDescriptorLike") -> selectors.SelectorKey:
+        return self._selector.get_key(fileobj)
+
+    def get_map(self) -> Mapping["FileDescriptorLike", selectors.SelectorKey]:
+        return self._selector.get_map()
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def select(self, timeout: float | None = None) -> list[tuple[selectors.SelectorKey, int]]:
+        loop = self._loop
+        wall_clock = loop._wall_clock_timeout()
+
+        if loop.virtual_time and timeout is not None and timeout > 0:
+            # Only skip ahead if nothing is ready to be worked on right now
+            ready = self._selector.select(0)
+            if ready:
+                return ready
+
+            if wall_clock is None or wall_clock > 0:
+                loop.advance_virtual_time(timeout)
+                timeout = 0
+
+        if wall_clock is not None and (timeout is None or wall_clock < timeout):
+            timeout = wall_clock
+
+        ready = self._selector.select(timeout)
+        loop._run_wall_clock_timers()
+        return ready
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """
+    A selector event loop that can run on a virtual clock.
+
+    When ``virtual_time`` is True and the loop has nothing to do other than wait
+    for timers, the clock is moved forward to the next timer instead of waiting
+    for it. This means ``asyncio.sleep`` and timeouts using the loop's clock
+    finish straight away as far as the wall clock is concerned.
+
+    Note that the loop can't know about work happening outside of it, like
+    in threads or subprocesses, and so the clock may be moved forward while that
+    work is happening.
+
+    Use ``call_later_wall_clock`` to schedule something in real seconds regardless
+    of whether virtual time is being used.
+    """
+
+    def __init__(self, *, virtual_time: bool = False) -> None:
+        self.virtual_time = virtual_time
+        self._offset = 0.0
+        self._wall_clock_timers: list[tuple[float, int, asyncio.TimerHandle]] = []
+        self._wall_clock_count = 0
+        super().__init__(selector=_VirtualTimeSelector(selectors.DefaultSelector(), self))
+
+    def time(self) -> float:
+        return time.monotonic() + self._offset
+
+    def advance_virtual_time(self, seconds: float) -> None:
+        """
+        Move the loop's clock forward by this many seconds
+        """
+        if seconds > 0:
+            self._offset += seconds
+
+    @contextlib.contextmanager
+    def using_virtual_time(self, enabled: bool = True) -> Iterator[None]:
+        """
+        Use virtual time (or not) for the duration of this context manager
+        """
+        original = self.virtual_time
+        self.virtual_time = enabled
+        try:
+            yield
+        finally:
+            self.virtual_time = original
+
+    def call_later_wall_clock(
+        self, delay: float, callback: Callable[..., object], *args: object
+    ) -> asyncio.TimerHandle:
+        """
+        Like ``call_later`` but ``delay`` is always in real seconds
+        """
+        when = time.monotonic() + delay
+        handle = asyncio.TimerHandle(when, callback, args, self)
+        self._wall_clock_count += 1
+        heapq.heappush(self._wall_clock_timers, (when, self._wall_clock_count, handle))
+        return handle
+
+    def _wall_clock_timeout(self) -> float | None:
+        while self._wall_clock_timers and self._wall_clock_timers[0][2].cancelled():
+            heapq.heappop(self._wall_clock_timers)
+
+        if not self._wall_clock_timers:
+            return None
+
+        return max(0, self._wall_clock_timers[0][0] - time.monotonic())
+
+    def _run_wall_clock_timers(self) -> None:
+        now = time.monotonic()
+        while self._wall_clock_timers and self._wall_clock_timers[0][0] <= now:
+            _, _, handle = heapq.heappop(self._wall_clock_timers)
+            if not handle.cancelled():
+                self._ready.append(handle)  # type: ignore[attr-defined]
+
+
+def call_later_wall_clock(
+    loop: asyncio.AbstractEventLoop,
+    delay: float,
+    callback: Callable[..., object],
+    *args: object,
+) -> asyncio.TimerHandle:
+    """
+    Call this callback after this many real seconds, even if the loop is using
+    virtual time.
+    """
+    if isinstance(loop, VirtualTimeEventLoop):
+        return loop.call_later_wall_clock(delay, callback, *args)
+    return loop.call_later(delay, callback, *args)
+
+
+def default_loop_supports_virtual_time() -> bool:
+    """
+    Return whether it's safe to use a ``VirtualTimeEventLoop`` in place of the
+    loop the current event loop policy would create.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        policy = asyncio.get_event_loop_policy()
+
+    if type(policy) is not asyncio.DefaultEventLoopPolicy:
+        return False
+    return policy._loop_factory is asyncio.SelectorEventLoop  # type: ignore[attr-defined]
+
+
+def uses_virtual_time(item: pytest.Item) -> bool:
+    """
+    Return whether this test has asked to be run with virtual time
+    """
+    marker = item.get_closest_marker("async_virtual_time")
+    if marker is None:
+        return False
+    elif marker.args:
+        return bool(marker.args[0])
+    else:
+        return bool(marker.kwargs.get("enabled", True))
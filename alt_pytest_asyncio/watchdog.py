@@ -0,0 +1,213 @@
+import _thread
+import asyncio
+import contextlib
+import faulthandler
+import io
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from types import FrameType
+
+from . import errors
+
+
+class Watchdog:
+    """
+    A thread that watches for the event loop not coming back from running a
+    fixture or test in time.
+
+    ``async_timeout`` can only cancel a task when it next awaits something, so
+    blocking code inside a coroutine stops the whole session. When the loop
+    takes longer than ``timeout`` seconds to come back, the stacks of every
+    thread and of the current task are dumped and the main thread is
+    interrupted with ``alt_pytest_asyncio.errors.HardTimeout``.
+
+    If the main thread still hasn't come back after another ``timeout``
+    seconds, the stacks are written to stderr and the process exits.
+    """
+
+    def __init__(self, *, timeout: float) -> None:
+        self.timeout = timeout
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopped = False
+        self._deadline: float | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._interrupt: int | None = None
+        self._interrupted = False
+        self._generation = 0
+        self._watched: int | None = None
+        self._fired: tuple[int, str] | None = None
+        self._original_handler: signal._HANDLER = None
+        self._stderr_fd: int | None = None
+
+    def start(self) -> None:
+        """
+        Start the watchdog thread. This must be called from the main thread.
+        """
+        self._original_handler = signal.signal(signal.SIGINT, self._on_sigint)
+
+        # Keep our own copy of stderr so that we can still write to it if stderr
+        # is being captured when we need to give up
+        self._stderr_fd = os.dup(2)
+        self._start_thread()
+
+    def _start_thread(self) -> None:
+        self._thread = threading.Thread(
+            target=self._watch, name="alt-pytest-asyncio-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def after_fork(self) -> None:
+        """
+        Start the watchdog thread again in a process forked from this one, as
+        only the thread that forked is copied into the new process.
+        """
+        self._cond = threading.Condition()
+        if self._thread is not None and not self._stopped:
+            self._start_thread()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if signal.getsignal(signal.SIGINT) == self._on_sigint:
+            signal.signal(signal.SIGINT, self._original_handler)
+
+        if self._stderr_fd is not None:
+            os.close(self._stderr_fd)
+            self._stderr_fd = None
+
+    @contextlib.contextmanager
+    def watching(self, loop: asyncio.AbstractEventLoop) -> Iterator[None]:
+        """
+        Watch for this loop not coming back from the code in this block in time
+        """
+        is_main = threading.current_thread() is threading.main_thread()
+        with self._cond:
+            previous = (
+                self._deadline,
+                self._loop,
+                self._interrupt,
+                self._interrupted,
+                self._watched,
+            )
+            self._generation += 1
+            self._watched = self._generation
+            self._deadline = time.monotonic() + self.timeout
+            self._loop = loop
+            self._interrupt = threading.get_ident() if is_main else None
+            self._interrupted = False
+            self._cond.notify()
+
+        try:
+            yield
+        finally:
+            # The watchdog may be interrupting this thread right as the block
+            # finishes, so the state is restored where that can't stop it. The
+            # interrupt is then ignored as this block is no longer watched
+            with self._sigint_blocked(is_main), self._cond:
+                (
+                    self._deadline,
+                    self._loop,
+                    self._interrupt,
+                    self._interrupted,
+                    self._watched,
+                ) = previous
+
+    @contextlib.contextmanager
+    def _sigint_blocked(self, is_main: bool) -> Iterator[None]:
+        if not is_main or not hasattr(signal, "pthread_sigmask"):
+            yield
+            return
+
+        previous = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT})
+        try:
+            yield
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, previous)
+
+    def _on_sigint(self, signum: int, frame: FrameType | None) -> None:
+        __tracebackhide__ = True
+        if (fired := self._fired) is not None:
+            self._fired = None
+            generation, report = fired
+            if generation == self._watched:
+                raise errors.HardTimeout(report)
+            # This interrupt is for a block that finished before it arrived
+            return
+
+        if callable(self._original_handler):
+            self._original_handler(signum, frame)
+        else:
+            signal.default_int_handler(signum, frame)
+
+    def _watch(self) -> None:
+        with self._cond:
+            while not self._stopped:
+                if self._deadline is None:
+                    self._cond.wait()
+                    continue
+
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+
+                if self._interrupted:
+                    self._give_up()
+                else:
+                    self._interrupted = True
+                    self._fire()
+                    # Dumping the stacks can take a while, so the time to come
+                    # back from the interrupt starts once it's sent
+                    self._deadline = time.monotonic() + self.timeout
+
+    def _fire(self) -> None:
+        report = (
+            f"The event loop didn't come back within the hard timeout of {self.timeout} seconds\n\n"
+            f"{self._dump()}"
+        )
+
+        if self._interrupt is None:
+            # Only the main thread can be interrupted with a signal handler
+            sys.stderr.write(report)
+            return
+
+        assert self._watched is not None
+        self._fired = (self._watched, report)
+        if hasattr(signal, "pthread_kill"):
+            # A real signal also interrupts blocking system calls like sleep
+            signal.pthread_kill(self._interrupt, signal.SIGINT)
+        else:
+            _thread.interrupt_main()
+
+    def _give_up(self) -> None:
+        if self._stderr_fd is not None:
+            report = (
+                "The event loop didn't come back after being interrupted by the hard timeout\n\n"
+                f"{self._dump()}"
+            )
+            os.write(self._stderr_fd, report.encode(errors="replace"))
+        os._exit(1)
+
+    def _dump(self) -> str:
+        with tempfile.TemporaryFile(mode="w+") as fle:
+            faulthandler.dump_traceback(file=fle, all_threads=True)
+            fle.seek(0)
+            threads = fle.read()
+
+        task_stack = io.StringIO()
+        if self._loop is not None and (task := asyncio.current_task(self._loop)) is not None:
+            task.print_stack(file=task_stack)
+
+        return f"Threads:\n{threads}\nCurrent task:\n{task_stack.getvalue() or 'None'}\n"
@@ -0,0 +1,374 @@
+import asyncio
+import contextlib
+import dataclasses
+import json
+import os
+import pathlib
+import re
+import time
+import warnings
+from collections.abc import AsyncIterator, Callable, Generator
+from typing import Any, TypeVar
+
+import pytest
+from _pytest.terminal import TerminalReporter
+
+from . import converter, errors
+
+T_Value = TypeVar("T_Value")
+
+_NAME = re.compile(r"^[\w.-]+$")
+
+
+def worker_id(config: pytest.Config) -> str:
+    """
+    Return the id of this pytest-xdist worker, or "master" if this isn't one
+    """
+    workerinput: dict[str, Any] | None = getattr(config, "workerinput", None)
+    return "master" if workerinput is None else str(workerinput["workerid"])
+
+
+def worker_count(config: pytest.Config) -> int:
+    workerinput: dict[str, Any] | None = getattr(config, "workerinput", None)
+    return 1 if workerinput is None else int(workerinput.get("workercount", 1))
+
+
+def is_controller(config: pytest.Config) -> bool:
+    """
+    Return whether this is the pytest-xdist process that hands tests to workers
+    and so doesn't run any tests itself
+    """
+    return not hasattr(config, "workerinput") and config.pluginmanager.has_plugin("dsession")
+
+
+def per_worker_path(config: pytest.Config, path: pathlib.Path) -> pathlib.Path:
+    """
+    Return a path that won't be written to by other pytest-xdist workers
+    """
+    if not hasattr(config, "workerinput"):
+        return path
+    return path.with_name(f"{path.stem}.{worker_id(config)}{path.suffix}")
+
+
+def _write_atomic(path: pathlib.Path, content: str) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(content)
+    os.replace(tmp, path)
+
+
+def _read_owner(path: pathlib.Path) -> tuple[str, int | None]:
+    """
+    Return the id and pid of the worker that wrote this owner file. The pid is
+    None when the worker hasn't written it yet
+    """
+    worker, _, pid = path.read_text().partition("\n")
+    return worker, int(pid) if pid else None
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedResources:
+    """
+    Lets one pytest-xdist worker set something up and the other workers use
+    it. This is the object given by the ``async_shared`` fixture.
+
+    Workers find each other with files in ``directory``. The worker that sets
+    something up keeps it until every worker is done, waiting up to
+    ``timeout`` seconds for them. The other workers wait up to ``timeout``
+    seconds for it to be set up, unless the worker setting it up dies first.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: pathlib.Path | None,
+        worker_id: str = "master",
+        worker_count: int = 1,
+        timeout: float = 600,
+        poll_interval: float = 0.05,
+    ) -> None:
+        self.directory = directory
+        self.worker_id = worker_id
+        self.worker_count = worker_count
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.owned: list[str] = []
+
+    @property
+    def coordinating(self) -> bool:
+        return self.directory is not None and self.worker_count > 1
+
+    @contextlib.asynccontextmanager
+    async def share(
+        self,
+        name: str,
+        setup: Callable[[], contextlib.AbstractAsyncContextManager[T_Value]],
+    ) -> AsyncIterator[T_Value]:
+        """
+        Enter what ``setup()`` returns in only one worker and give every worker
+        the value it provides. Under pytest-xdist that value is passed between
+        workers as JSON.
+        """
+        if not _NAME.match(name):
+            raise ValueError(f"Shared names may only have letters, numbers, '.' and '-': {name!r}")
+
+        if not self.coordinating:
+            async with setup() as value:
+                yield value
+            return
+
+        assert self.directory is not None
+        folder = self.directory / "shared" / name
+        folder.mkdir(parents=True, exist_ok=True)
+
+        try:
+            fd = os.open(folder / "owner", os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            yield await self._wait_for_value(name, folder)
+            return
+
+        with os.fdopen(fd, "w") as fle:
+            fle.write(f"{self.worker_id}\n{os.getpid()}")
+        self.owned.append(name)
+
+        shared = False
+        try:
+            async with setup() as value:
+                _write_atomic(folder / "value.json", json.dumps(value))
+                shared = True
+                try:
+                    yield value
+                finally:
+                    await self.wait_for_workers()
+        except BaseException as error:
+            if not shared:
+                _write_atomic(folder / "error", f"{type(error).__name__}: {error}")
+            raise
+
+    async def _wait_for_value(self, name: str, folder: pathlib.Path) -> Any:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            # The owner may write the value and then die, so see if it's alive first
+            owner, pid = _read_owner(folder / "owner")
+            alive = pid is None or _is_alive(pid)
+
+            if (value := folder / "value.json").exists():
+                return json.loads(value.read_text())
+            if (error := folder / "error").exists():
+                raise errors.SharedSetupFailed(
+                    f"Setting up {name} in worker {owner} failed: {error.read_text()}"
+                )
+            if not alive:
+                raise errors.SharedSetupFailed(
+                    f"Worker {owner} stopped before it finished setting up {name}"
+                )
+            if time.monotonic() > deadline:
+                raise errors.SharedSetupFailed(
+                    f"Gave up waiting for worker {owner} to set up {name}"
+                    f" after {self.timeout} seconds"
+                )
+            await asyncio.sleep(self.poll_interval)
+
+    def mark_done(self) -> None:
+        """
+        Tell the other workers this worker has finished its tests
+        """
+        if self.coordinating:
+            assert self.directory is not None
+            done = self.directory / "done"
+            done.mkdir(parents=True, exist_ok=True)
+            (done / self.worker_id).touch()
+
+    def all_done(self) -> bool:
+        if not self.coordinating:
+            return True
+        assert self.directory is not None
+        done = self.directory / "done"
+        return done.exists() and len(list(done.iterdir())) >= self.worker_count
+
+    async def wait_for_workers(self) -> None:
+        """
+        Wait for every worker to finish its tests so that what this worker
+        shared can be cleaned up
+        """
+        self.mark_done()
+        deadline = time.monotonic() + self.timeout
+        while not self.all_done():
+            if time.monotonic() > deadline:
+                warnings.warn(
+                    f"Gave up waiting for other workers to finish after {self.timeout} seconds"
+                    f" before cleaning up {', '.join(self.owned)}",
+                    stacklevel=1,
+                )
+                return
+            await asyncio.sleep(self.poll_interval)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class WorkerSummary:
+    """
+    What happened in one pytest-xdist worker, sent back to the controller
+    """
+
+    worker_id: str
+    tests: int
+    async_timeouts: int
+    max_loop_lag: float | None
+    stalls: int
+    task_leaks: int
+    resource_leaks: int
+    shared: tuple[str, ...]
+
+    def as_dict(self) -> dict[str, object]:
+        return {**dataclasses.asdict(self), "shared": list(self.shared)}
+
+    @classmethod
+    def from_dict(cls, found: dict[str, Any]) -> "WorkerSummary":
+        return cls(**{**found, "shared": tuple(found["shared"])})
+
+    def format(self) -> str:
+        parts = [f"{self.tests} tests", f"{self.async_timeouts} async timeouts"]
+        if self.max_loop_lag is not None:
+            parts.append(f"max loop lag {self.max_loop_lag * 1000:.1f}ms")
+        parts.extend(
+            [
+                f"{self.stalls} stalls",
+                f"{self.task_leaks} task leaks",
+                f"{self.resource_leaks} resource leaks",
+            ]
+        )
+        if self.shared:
+            parts.append(f"shared {', '.join(self.shared)}")
+        return f"{self.worker_id}: {', '.join(parts)}"
+
+
+class Worker:
+    """
+    A pytest plugin for the process running tests, that makes sure things
+    shared with ``async_shared`` outlive every worker using them and, in a
+    pytest-xdist worker, sends a ``WorkerSummary`` back to the controller.
+    """
+
+    def __init__(
+        self,
+        *,
+        config: pytest.Config,
+        converter: converter.Converter,
+        count_timeouts: Callable[[], int],
+        timeout: float = 600,
+    ) -> None:
+        self.config = config
+        self.converter = converter
+        self.count_timeouts = count_timeouts
+        self.timeout = timeout
+        self.tests = 0
+        self._timeouts_before = count_timeouts()
+        self._shared: SharedResources | None = None
+
+    @property
+    def shared(self) -> SharedResources:
+        if self._shared is None:
+            directory = None
+            if hasattr(self.config, "workerinput"):
+                # Each worker has its own directory in the basetemp for the run
+                tmp_path_factory: pytest.TempPathFactory = self.config._tmp_path_factory  # type: ignore[attr-defined]
+                directory = tmp_path_factory.getbasetemp().parent / "alt_pytest_asyncio"
+            self._shared = SharedResources(
+                directory=directory,
+                worker_id=worker_id(self.config),
+                worker_count=worker_count(self.config),
+                timeout=self.timeout,
+            )
+        return self._shared
+
+    @pytest.hookimpl
+    def pytest_runtest_logfinish(self, nodeid: str) -> None:
+        self.tests += 1
+
+    @pytest.hookimpl(tryfirst=True, wrapper=True)
+    def pytest_runtest_teardown(
+        self, item: pytest.Item, nextitem: pytest.Item | None
+    ) -> Generator[None, None, None]:
+        if nextitem is None:
+            shared = self.shared
+            shared.mark_done()
+            if shared.owned and not shared.all_done():
+                # Wait outside the teardown of the shared fixtures so the
+                # wait doesn't count towards their timeout
+                self.converter.run_on_loop(shared.wait_for_workers)
+        return (yield)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        self.shared.mark_done()
+
+        workeroutput: dict[str, object] | None = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput["alt_pytest_asyncio"] = self.summary().as_dict()
+
+    def summary(self) -> WorkerSummary:
+        pluginmanager = self.config.pluginmanager
+        metrics = pluginmanager.get_plugin("alt_pytest_asyncio_loop_metrics")
+        stalls = pluginmanager.get_plugin("alt_pytest_asyncio_stalls")
+        task_leaks = pluginmanager.get_plugin("alt_pytest_asyncio_task_leaks")
+        resource_leaks = pluginmanager.get_plugin("alt_pytest_asyncio_resource_leaks")
+        return WorkerSummary(
+            worker_id=worker_id(self.config),
+            tests=self.tests,
+            async_timeouts=self.count_timeouts() - self._timeouts_before,
+            max_loop_lag=(
+                None
+                if metrics is None
+                else max((phase.max_lag for phase in metrics.phases), default=0.0)
+            ),
+            stalls=0 if stalls is None else len(stalls.stalls),
+            task_leaks=0 if task_leaks is None else len(task_leaks.leaks),
+            resource_leaks=0 if resource_leaks is None else len(resource_leaks.growths),
+            shared=tuple(self.shared.owned),
+        )
+
+
+class Controller:
+    """
+    A pytest plugin for the pytest-xdist controller that shows the summary
+    from each worker at the end of the session
+    """
+
+    def __init__(self) -> None:
+        self.summaries: list[WorkerSummary] = []
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node: Any, error: object) -> None:
+        found = getattr(node, "workeroutput", {}).get("alt_pytest_asyncio")
+        if found is not None:
+            self.summaries.append(WorkerSummary.from_dict(found))
+
+    @pytest.hookimpl
+    def pytest_terminal_summary(self, terminalreporter: TerminalReporter) -> None:
+        if not self.summaries:
+            return
+
+        summaries = sorted(self.summaries, key=lambda summary: summary.worker_id)
+        lags = [s.max_loop_lag for s in summaries if s.max_loop_lag is not None]
+        total = WorkerSummary(
+            worker_id="total",
+            tests=sum(s.tests for s in summaries),
+            async_timeouts=sum(s.async_timeouts for s in summaries),
+            max_loop_lag=max(lags) if lags else None,
+            stalls=sum(s.stalls for s in summaries),
+            task_leaks=sum(s.task_leaks for s in summaries),
+            resource_leaks=sum(s.resource_leaks for s in summaries),
+            shared=tuple(name for s in summaries for name in s.shared),
+        )
+
+        terminalreporter.section("async workers")
+        for summary in [*summaries, total]:
+            terminalreporter.line(summary.format())
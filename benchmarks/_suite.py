@@ -0,0 +1,107 @@
+"""
+Helpers for timing pytest runs of generated test suites.
+
+Each benchmark generates a suite of tests, runs pytest against it in a new
+process and reports how long each test took. Only the time pytest spends
+running tests is measured, so starting pytest and collection aren't included.
+"""
+
+import argparse
+import dataclasses
+import math
+import pathlib
+import subprocess
+import sys
+import tempfile
+import textwrap
+from collections.abc import Callable, Sequence
+
+MakeFiles = Callable[[int], dict[str, str]]
+
+TIMING_CONFTEST = """
+import pathlib
+import time
+
+import pytest
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtestloop(session):
+    start = time.perf_counter()
+    try:
+        return (yield)
+    finally:
+        pathlib.Path("elapsed.txt").write_text(str(time.perf_counter() - start))
+"""
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Scenario:
+    name: str
+    make_files: MakeFiles
+    args: Sequence[str] = ()
+
+    # Use this many tests instead of the number from the command line
+    count: int | None = None
+
+
+def parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--tests", type=int, default=2000, help="The number of tests in the large suite"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="The best of this many runs is used")
+    return parser
+
+
+def time_pytest(files: dict[str, str], args: Sequence[str], *, repeat: int) -> float:
+    """
+    Return the fastest time in seconds it took pytest to run the tests in these files
+    """
+    best = math.inf
+    with tempfile.TemporaryDirectory() as directory:
+        path = pathlib.Path(directory)
+        (path / "pytest.ini").write_text("[pytest]\n")
+        files = {"conftest.py": TIMING_CONFTEST, **files}
+        for name, source in files.items():
+            (path / name).parent.mkdir(parents=True, exist_ok=True)
+            (path / name).write_text(textwrap.dedent(source))
+
+        cmd = [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-q",
+            "-p",
+            "no:cacheprovider",
+            "-p",
+            "alt_pytest_asyncio.enable",
+            *args,
+        ]
+        for _ in range(repeat):
+            subprocess.run(cmd, cwd=path, check=True, stdout=subprocess.DEVNULL)
+            best = min(best, float((path / "elapsed.txt").read_text()))
+
+    return best
+
+
+def per_test_seconds(scenario: Scenario, *, count: int, repeat: int) -> float:
+    """
+    Return how long each test in the scenario takes
+    """
+    if scenario.count is not None:
+        count = scenario.count
+    return time_pytest(scenario.make_files(count), scenario.args, repeat=repeat) / count
+
+
+def main(description: str, scenarios: Sequence[Scenario]) -> None:
+    options = parser(description).parse_args()
+
+    baseline: float | None = None
+    print(f"{'scenario':<40} {'per test':>12} {'relative':>10}")
+    for scenario in scenarios:
+        took = per_test_seconds(scenario, count=options.tests, repeat=options.repeat)
+        if baseline is None:
+            baseline = took
+        relative = took / baseline if baseline > 0 else math.nan
+        print(f"{scenario.name:<40} {took * 1e6:>10.1f}us {relative:>9.2f}x")
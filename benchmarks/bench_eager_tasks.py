@@ -0,0 +1,51 @@
+"""
+Compare the per test overhead of async tests with and without ``--async-eager-tasks``.
+
+The tests use a cached module fixture and a function fixture that never waits
+on anything, which is the case eager tasks help the most with.
+
+Usage::
+
+    python -m benchmarks.bench_eager_tasks --tests 2000
+"""
+
+import sys
+
+from benchmarks import _suite
+
+HEADER = """
+import pytest
+
+
+@pytest.fixture(scope="module")
+async def cached() -> int:
+    return 1
+
+
+@pytest.fixture()
+async def immediate(cached: int) -> int:
+    return cached + 1
+
+"""
+
+
+def make_files(count: int) -> dict[str, str]:
+    tests = "".join(
+        f"""
+async def test_{i}(immediate: int) -> None:
+    assert immediate == 2
+"""
+        for i in range(count)
+    )
+    return {"test_suite.py": HEADER + tests}
+
+
+if __name__ == "__main__":
+    scenarios = [_suite.Scenario(name="default", make_files=make_files)]
+    if sys.version_info >= (3, 12):
+        scenarios.append(
+            _suite.Scenario(
+                name="eager tasks", make_files=make_files, args=["--async-eager-tasks"]
+            )
+        )
+    _suite.main(__doc__ or "", scenarios)
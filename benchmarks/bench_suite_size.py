@@ -0,0 +1,55 @@
+"""
+Show how the per test overhead of async tests changes as the suite grows.
+
+If the plugin does work for each test that depends on how many tests have
+already run then the larger suites will take longer per test.
+
+Usage::
+
+    python -m benchmarks.bench_suite_size --tests 5000
+"""
+
+from benchmarks import _suite
+
+HEADER = """
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+async def cached() -> int:
+    return 1
+
+
+@pytest.fixture()
+async def per_test(cached: int) -> AsyncGenerator[int]:
+    await asyncio.sleep(0)
+    yield cached + 1
+    await asyncio.sleep(0)
+
+"""
+
+
+def make_files(count: int) -> dict[str, str]:
+    tests = "".join(
+        f"""
+async def test_{i}(per_test: int) -> None:
+    await asyncio.sleep(0)
+"""
+        for i in range(count)
+    )
+    return {"test_suite.py": HEADER + tests}
+
+
+if __name__ == "__main__":
+    options = _suite.parser(__doc__ or "").parse_args()
+    sizes = sorted({max(1, options.tests // 10), options.tests})
+    _suite.main(
+        __doc__ or "",
+        [
+            _suite.Scenario(name=f"{size} tests", make_files=make_files, count=size)
+            for size in sizes
+        ],
+    )
@@ -0,0 +1,66 @@
+"""
+Compare the per test overhead of sync tests with and without ``--async-sync-fast-path``.
+
+The tests are plain sync tests that use a sync generator fixture. The mixed
+suites also have one async test so that the plugin can't step aside entirely.
+
+Usage::
+
+    python -m benchmarks.bench_sync_tests --tests 2000
+"""
+
+from benchmarks import _suite
+
+HEADER = """
+from collections.abc import Iterator
+
+import pytest
+
+
+@pytest.fixture()
+def value() -> Iterator[int]:
+    yield 1
+
+"""
+
+ASYNC_TEST = """
+async def test_async() -> None:
+    pass
+"""
+
+
+def make_files(count: int) -> dict[str, str]:
+    tests = "".join(
+        f"""
+def test_{i}(value: int) -> None:
+    assert value == 1
+"""
+        for i in range(count)
+    )
+    return {"test_suite.py": HEADER + tests}
+
+
+def make_mixed_files(count: int) -> dict[str, str]:
+    files = make_files(count - 1)
+    files["test_async.py"] = ASYNC_TEST
+    return files
+
+
+if __name__ == "__main__":
+    _suite.main(
+        __doc__ or "",
+        [
+            _suite.Scenario(name="sync only", make_files=make_files),
+            _suite.Scenario(
+                name="sync only, fast path",
+                make_files=make_files,
+                args=["--async-sync-fast-path"],
+            ),
+            _suite.Scenario(name="mixed", make_files=make_mixed_files),
+            _suite.Scenario(
+                name="mixed, fast path",
+                make_files=make_mixed_files,
+                args=["--async-sync-fast-path"],
+            ),
+        ],
+    )
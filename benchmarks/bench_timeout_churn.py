@@ -0,0 +1,46 @@
+"""
+Time suites where tests and fixtures change their ``async_timeout`` often.
+
+Every change to a timeout moves its deadline, and every async fixture and test
+gets a deadline of its own.
+
+Usage::
+
+    python -m benchmarks.bench_timeout_churn --tests 2000
+"""
+
+from benchmarks import _suite
+
+CHANGES = 50
+
+HEADER = f"""
+import pytest
+
+import alt_pytest_asyncio
+
+AsyncTimeout = alt_pytest_asyncio.protocols.AsyncTimeout
+
+
+@pytest.fixture()
+async def adjusted(async_timeout: AsyncTimeout) -> int:
+    for i in range({CHANGES}):
+        async_timeout.set_timeout_seconds(5 + i)
+    return 1
+
+"""
+
+
+def make_files(count: int) -> dict[str, str]:
+    tests = "".join(
+        f"""
+async def test_{i}(adjusted: int, async_timeout: AsyncTimeout) -> None:
+    for i in range({CHANGES}):
+        async_timeout.set_timeout_seconds(10 - i * 0.1)
+"""
+        for i in range(count)
+    )
+    return {"test_suite.py": HEADER + tests}
+
+
+if __name__ == "__main__":
+    _suite.main(__doc__ or "", [_suite.Scenario(name="timeout churn", make_files=make_files)])
@@ -0,0 +1,70 @@
+"""
+Time suites with deep graphs of async fixtures across many scopes.
+
+Every async fixture and test needs a default timeout, which is found by looking
+for the ``default_async_timeout`` fixtures for its scope and the scopes above it.
+These suites have many async fixtures in classes where most of those fixtures
+don't exist.
+
+Usage::
+
+    python -m benchmarks.bench_timeout_resolution --tests 2000
+"""
+
+from benchmarks import _suite
+
+DEPTH = 10
+PER_CLASS = 20
+
+HEADER = """
+import pytest
+
+
+@pytest.fixture(scope="session")
+async def session_root() -> int:
+    return 0
+
+
+@pytest.fixture(scope="module")
+async def module_root(session_root: int) -> int:
+    return session_root + 1
+
+"""
+
+
+def make_class(index: int, tests: int) -> str:
+    fixtures: list[str] = []
+    previous = "module_root"
+    for depth in range(DEPTH):
+        scope = "class" if depth < DEPTH // 2 else "function"
+        fixtures.append(
+            f"""
+    @pytest.fixture(scope="{scope}")
+    async def fixture_{depth}(self, {previous}: int) -> int:
+        return {previous} + 1
+"""
+        )
+        previous = f"fixture_{depth}"
+
+    body = "".join(
+        f"""
+    async def test_{i}(self, {previous}: int) -> None:
+        assert {previous} == {DEPTH + 1}
+"""
+        for i in range(tests)
+    )
+    return f"\n\nclass TestClass{index}:{''.join(fixtures)}{body}"
+
+
+def make_files(count: int) -> dict[str, str]:
+    classes: list[str] = []
+    remaining = count
+    while remaining > 0:
+        tests = min(PER_CLASS, remaining)
+        classes.append(make_class(len(classes), tests))
+        remaining -= tests
+    return {"test_suite.py": HEADER + "".join(classes)}
+
+
+if __name__ == "__main__":
+    _suite.main(__doc__ or "", [_suite.Scenario(name="deep fixtures", make_files=make_files)])
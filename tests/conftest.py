@@ -1 +1,10 @@
+import pytest
+
 pytest_plugins = ["pytester", "alt_pytest_asyncio.enable"]
+
+
+def run(pytester: pytest.Pytester, *args: str) -> pytest.RunResult:
+    """
+    Run pytest with this plugin in a subprocess for the files made with pytester
+    """
+    return pytester.runpytest_subprocess("--tb", "short", "-p", "alt_pytest_asyncio.enable", *args)
@@ -0,0 +1,163 @@
+import json
+
+import pytest
+
+from alt_pytest_asyncio.benchmark import BenchmarkStats, format_seconds
+from tests.conftest import run
+
+
+def test_stats_from_times() -> None:
+    stats = BenchmarkStats.from_times(name="a", iterations=10, batch=2, times=[0.2, 0.4, 0.6])
+    assert stats.rounds == 3
+    assert stats.min == pytest.approx(0.01)
+    assert stats.median == pytest.approx(0.02)
+    assert stats.p99 == pytest.approx(0.03)
+    assert stats.ops_per_second == pytest.approx(50)
+
+
+def test_format_seconds() -> None:
+    assert format_seconds(2) == "2.000s"
+    assert format_seconds(0.0015) == "1.500ms"
+    assert format_seconds(0.0000025) == "2.500us"
+    assert format_seconds(0.0000000025) == "2.5ns"
+
+
+BENCHMARKS = """
+    import asyncio
+
+    import pytest
+
+    from alt_pytest_asyncio.benchmark import AsyncBenchmark
+
+
+    async def tiny() -> None:
+        await asyncio.sleep(0)
+
+
+    def test_tiny(async_benchmark: AsyncBenchmark) -> None:
+        stats = async_benchmark(tiny, max_time=0.05)
+        assert stats.rounds >= 5
+        assert stats.iterations > 1
+        assert 0 < stats.min <= stats.median <= stats.p99
+
+
+    def test_batched(async_benchmark: AsyncBenchmark) -> None:
+        stats = async_benchmark(tiny, name="batched", batch=10, rounds=3)
+        assert stats.rounds == 3
+        assert stats.batch == 10
+
+
+    @pytest.fixture()
+    def default_async_timeout() -> float:
+        return 0.05
+
+
+    def test_timeout_is_per_round(async_benchmark: AsyncBenchmark) -> None:
+        async def slow() -> None:
+            await asyncio.sleep(0.02)
+
+        stats = async_benchmark(slow, rounds=5)
+        assert stats.median >= 0.02
+    """
+
+
+def test_it_benchmarks_and_saves(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(BENCHMARKS)
+    result = run(pytester, "--async-benchmark-save", "bench.json")
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*= async benchmarks =*",
+            "*min*median*p99*ops/s*rounds*baseline*benchmark",
+            "*test_it_benchmarks_and_saves.py::test_tiny",
+            "*test_it_benchmarks_and_saves.py::test_batched::batched",
+            "*test_it_benchmarks_and_saves.py::test_timeout_is_per_round*",
+        ]
+    )
+
+    saved = json.loads((pytester.path / "bench.json").read_text())
+    names = [stats["name"] for stats in saved["benchmarks"]]
+    assert names[:2] == [
+        "test_it_benchmarks_and_saves.py::test_tiny",
+        "test_it_benchmarks_and_saves.py::test_batched::batched",
+    ]
+    assert saved["benchmarks"][1]["batch"] == 10
+    assert saved["benchmarks"][0]["ops_per_second"] > 0
+
+
+def test_fails_when_slower_than_the_baseline(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        from alt_pytest_asyncio.benchmark import AsyncBenchmark
+
+
+        def test_slow(async_benchmark: AsyncBenchmark) -> None:
+            async_benchmark(lambda: asyncio.sleep(0.01), rounds=5)
+        """
+    )
+    baseline = {
+        "name": "test_fails_when_slower_than_the_baseline.py::test_slow",
+        "rounds": 5,
+        "iterations": 1,
+        "batch": 1,
+        "min": 0.0001,
+        "median": 0.0001,
+        "p99": 0.0001,
+        "mean": 0.0001,
+    }
+    (pytester.path / "baseline.json").write_text(json.dumps({"benchmarks": [baseline]}))
+
+    result = run(pytester, "--async-benchmark-compare", "baseline.json")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*BenchmarkRegression: test_fails_when_slower_than_the_baseline.py::test_slow is slower"
+            " than the baseline: median *ms compared to 100.000us (+*%, tolerance 10%)"
+        ]
+    )
+
+    result = run(
+        pytester,
+        "--async-benchmark-compare",
+        "baseline.json",
+        "--async-benchmark-tolerance",
+        "1000",
+    )
+    result.assert_outcomes(passed=1)
+
+
+def test_complains_in_async_tests(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        from alt_pytest_asyncio.benchmark import AsyncBenchmark
+
+
+        async def test_async(async_benchmark: AsyncBenchmark) -> None:
+            async_benchmark(lambda: asyncio.sleep(0))
+        """
+    )
+    result = run(pytester, "--async-sync-fast-path")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(
+        ["*BenchmarkInAsyncFunction: The async_benchmark fixture can only be used from sync tests"]
+    )
+
+
+def test_works_with_the_sync_fast_path(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        from alt_pytest_asyncio.benchmark import AsyncBenchmark
+
+
+        def test_sync(async_benchmark: AsyncBenchmark) -> None:
+            async_benchmark(lambda: asyncio.sleep(0), rounds=2)
+        """
+    )
+    result = run(pytester, "--async-sync-fast-path")
+    result.assert_outcomes(passed=1)
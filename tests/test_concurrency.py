@@ -0,0 +1,285 @@
+import pytest
+
+from tests.conftest import run
+
+TESTS = """
+import asyncio
+
+import pytest
+
+started: list[str] = []
+
+
+async def wait_for_others(name: str, count: int) -> None:
+    started.append(name)
+    while len(started) < count:
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture(scope="module")
+async def shared() -> str:
+    return "shared"
+
+
+async def test_one(shared: str) -> None:
+    await wait_for_others("one", 3)
+
+
+async def test_two() -> None:
+    await wait_for_others("two", 3)
+
+
+@pytest.mark.parametrize("value", [1])
+async def test_three(value: int) -> None:
+    await wait_for_others("three", 3)
+"""
+
+
+def test_runs_tests_concurrently(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(TESTS)
+    pytester.makeini(
+        """
+        [pytest]
+        default_async_timeout = 2
+        """
+    )
+
+    result = run(pytester, "--async-concurrent", "-v")
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*::test_one PASSED*",
+            "*::test_two PASSED*",
+            "*::test_three?1? PASSED*",
+        ]
+    )
+
+
+def test_can_be_enabled_with_ini(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(TESTS)
+    pytester.makeini(
+        """
+        [pytest]
+        default_async_timeout = 2
+        async_concurrent = true
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=3)
+
+
+def test_does_not_run_concurrently_by_default(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(TESTS)
+
+    result = run(pytester, "--default-async-timeout", "0.2")
+    result.assert_outcomes(passed=1, failed=2)
+
+
+def test_respects_the_concurrency_limit(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(TESTS)
+
+    result = run(
+        pytester,
+        "--async-concurrent",
+        "--async-concurrency",
+        "2",
+        "--default-async-timeout",
+        "0.3",
+    )
+    result.assert_outcomes(passed=1, failed=2)
+
+
+def test_can_opt_in_and_out_with_a_marker(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        pytestmark = pytest.mark.async_concurrent
+
+        started: list[str] = []
+
+
+        async def wait_for_others(name: str, count: int) -> None:
+            started.append(name)
+            while len(started) < count:
+                await asyncio.sleep(0.01)
+
+
+        async def test_one() -> None:
+            await wait_for_others("one", 2)
+
+
+        async def test_two() -> None:
+            await wait_for_others("two", 2)
+
+
+        @pytest.mark.async_concurrent(False)
+        async def test_three() -> None:
+            assert started == ["one", "two"]
+            await wait_for_others("three", 4)
+        """
+    )
+
+    result = run(pytester, "--default-async-timeout", "0.5")
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.fnmatch_lines(["*_ test_three _*", "*Took too long to complete*"])
+
+
+def test_tests_with_function_fixtures_are_not_run_concurrently(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        order: list[str] = []
+
+
+        @pytest.fixture()
+        async def per_test() -> None:
+            pass
+
+
+        async def test_one(per_test: None) -> None:
+            await asyncio.sleep(0.1)
+            order.append("one")
+
+
+        async def test_two(per_test: None) -> None:
+            order.append("two")
+
+
+        def test_order() -> None:
+            assert order == ["one", "two"]
+        """
+    )
+
+    result = run(pytester, "--async-concurrent")
+    result.assert_outcomes(passed=3)
+
+
+def test_reports_failures_and_timeouts_for_each_test(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import alt_pytest_asyncio
+
+        AsyncTimeout = alt_pytest_asyncio.protocols.AsyncTimeout
+
+
+        async def test_passes() -> None:
+            await asyncio.sleep(0.2)
+
+
+        async def test_fails() -> None:
+            print("PRINTED FROM A TEST")
+            assert False, "NOPE"
+
+
+        async def test_times_out(async_timeout: AsyncTimeout) -> None:
+            async_timeout.set_timeout_seconds(0.05)
+            await asyncio.sleep(1)
+        """
+    )
+
+    result = run(pytester, "--async-concurrent")
+    result.assert_outcomes(passed=1, failed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*_ test_fails _*",
+            "*AssertionError: NOPE",
+            "*stdout (concurrent batch)*",
+            "PRINTED FROM A TEST",
+            "*_ test_times_out _*",
+            "*Took too long to complete: *(timeout=0.05)",
+        ]
+    )
+    assert result.stdout.str().count("PRINTED FROM A TEST") == 1
+
+
+def test_reports_failures_finding_the_timeout_as_setup_errors(
+    pytester: pytest.Pytester,
+) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.fixture
+        def default_async_timeout() -> float:
+            raise ValueError("NO TIMEOUT")
+
+
+        async def test_one() -> None:
+            pass
+
+
+        async def test_two() -> None:
+            pass
+
+
+        def test_after() -> None:
+            pass
+        """
+    )
+
+    result = run(pytester, "--async-concurrent")
+    result.assert_outcomes(passed=1, errors=2)
+    result.stdout.fnmatch_lines(["*ERROR at setup of test_one*", "*ValueError: NO TIMEOUT"])
+
+
+def test_can_run_the_cases_of_a_parametrized_test_concurrently(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        running: list[int] = []
+        most: dict[str, int] = {}
+
+
+        async def track(name: str) -> None:
+            running.append(1)
+            most[name] = max(most.get(name, 0), len(running))
+            await asyncio.sleep(0.05)
+            running.pop()
+
+
+        @pytest.mark.async_concurrent_cases(limit=4)
+        @pytest.mark.parametrize("value", range(10))
+        async def test_cases(value: int) -> None:
+            await track("cases")
+            assert value != 7
+
+
+        @pytest.mark.async_concurrent_cases
+        @pytest.mark.parametrize("value", range(3))
+        async def test_other_cases(value: int) -> None:
+            await track("other")
+
+
+        async def test_not_marked() -> None:
+            await track("not_marked")
+
+
+        def test_most() -> None:
+            assert most == {"cases": 4, "other": 3, "not_marked": 1}
+        """
+    )
+
+    result = run(pytester, "-v")
+    result.assert_outcomes(passed=14, failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*::test_cases?6? PASSED*",
+            "*::test_cases?7? FAILED*",
+            "*::test_cases?8? PASSED*",
+            "*_ test_cases?7? _*",
+            "*assert 7 != 7",
+        ]
+    )
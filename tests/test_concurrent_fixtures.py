@@ -0,0 +1,138 @@
+import pytest
+
+from tests.conftest import run
+
+FIXTURES = """
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+
+started: list[str] = []
+events: list[str] = []
+
+
+async def wait_for_others(name: str, count: int) -> None:
+    started.append(name)
+    while len(started) < count:
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture(scope="module")
+def config() -> str:
+    return "config"
+
+
+@pytest.fixture(scope="module")
+async def database(config: str) -> AsyncGenerator[str]:
+    await wait_for_others("database", 3)
+    events.append("database setup")
+    yield f"database:{config}"
+    events.append("database teardown")
+
+
+@pytest.fixture()
+async def cache() -> str:
+    await wait_for_others("cache", 3)
+    events.append("cache setup")
+    return "cache"
+
+
+@pytest.fixture()
+async def server() -> AsyncGenerator[str]:
+    await wait_for_others("server", 3)
+    events.append("server setup")
+    yield "server"
+    events.append("server teardown")
+
+
+@pytest.fixture()
+async def client(database: str, cache: str, server: str) -> str:
+    assert sorted(events) == ["cache setup", "database setup", "server setup"]
+    return f"client:{database}:{cache}:{server}"
+"""
+
+
+def test_sets_up_independent_fixtures_together(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        FIXTURES
+        + """
+
+async def test_it(client: str) -> None:
+    assert client == "client:database:config:cache:server"
+
+
+def test_after() -> None:
+    assert sorted(events[:3]) == ["cache setup", "database setup", "server setup"]
+    assert events[3:] == ["server teardown"]
+"""
+    )
+
+    result = run(pytester, "--async-concurrent-fixtures", "--default-async-timeout", "1")
+    result.assert_outcomes(passed=2)
+
+
+def test_does_not_setup_fixtures_together_by_default(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        FIXTURES
+        + """
+
+async def test_it(client: str) -> None:
+    pass
+"""
+    )
+
+    result = run(pytester, "--default-async-timeout", "0.2")
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*Took too long to complete*"])
+
+
+def test_reports_errors_against_the_fixture_that_failed(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        from collections.abc import AsyncGenerator
+
+        import pytest
+
+        events: list[str] = []
+
+
+        @pytest.fixture()
+        async def broken() -> None:
+            await asyncio.sleep(0.05)
+            raise ValueError("broken fixture")
+
+
+        @pytest.fixture()
+        async def works() -> AsyncGenerator[None]:
+            try:
+                events.append("works setup")
+                yield
+            finally:
+                events.append("works teardown")
+
+
+        async def test_it(works: None, broken: None) -> None:
+            pass
+
+
+        async def test_other_order(broken: None, works: None) -> None:
+            pass
+
+
+        def test_after() -> None:
+            assert events == ["works setup", "works teardown", "works setup", "works teardown"]
+        """
+    )
+
+    result = run(pytester, "--async-concurrent-fixtures")
+    result.assert_outcomes(errors=2, passed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*_ ERROR at setup of test_it _*",
+            "*ValueError: broken fixture",
+            "*_ ERROR at setup of test_other_order _*",
+            "*ValueError: broken fixture",
+        ]
+    )
@@ -0,0 +1,148 @@
+import pytest
+
+from tests.conftest import run
+
+FIXTURES = """
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+
+stopping: list[str] = []
+events: list[str] = []
+
+
+async def wait_for_others(name: str, count: int) -> None:
+    stopping.append(name)
+    while len(stopping) < count:
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture(scope="module")
+async def server() -> AsyncGenerator[str]:
+    yield "server"
+    await wait_for_others("server", 2)
+    events.append("server teardown")
+
+
+@pytest.fixture(scope="module")
+async def pool() -> AsyncGenerator[str]:
+    yield "pool"
+    await wait_for_others("pool", 2)
+    events.append("pool teardown")
+
+
+@pytest.fixture(scope="module")
+async def uses_pool(pool: str) -> AsyncGenerator[str]:
+    yield pool
+    events.append("uses_pool teardown")
+
+
+@pytest.fixture(scope="module")
+async def uses_server(server: str) -> AsyncGenerator[str]:
+    yield server
+    events.append("uses_server teardown")
+
+
+async def test_one(uses_pool: str, uses_server: str) -> None:
+    pass
+
+
+async def test_two(uses_pool: str, uses_server: str) -> None:
+    pass
+"""
+
+
+def test_tears_down_independent_fixtures_together(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_one=FIXTURES)
+    pytester.makepyfile(
+        test_two="""
+        def test_order() -> None:
+            import test_one
+
+            events = test_one.events
+            assert events.index("uses_server teardown") < events.index("server teardown")
+            assert events.index("uses_pool teardown") < events.index("pool teardown")
+            assert len(events) == 4
+        """
+    )
+
+    result = run(pytester, "--async-concurrent-teardown", "--default-async-timeout", "1")
+    result.assert_outcomes(passed=3)
+
+
+def test_sync_dependents_stop_fixtures_being_torn_down_early(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from collections.abc import AsyncGenerator, Iterator
+
+        import pytest
+
+        events: list[str] = []
+
+
+        @pytest.fixture(scope="module")
+        async def pool() -> AsyncGenerator[str]:
+            yield "pool"
+            events.append("pool teardown")
+
+
+        @pytest.fixture(scope="module")
+        def uses_pool(pool: str) -> Iterator[str]:
+            yield pool
+            events.append("uses_pool teardown")
+
+
+        async def test_one(uses_pool: str) -> None:
+            pass
+        """
+    )
+    pytester.makepyfile(
+        test_two="""
+        def test_order() -> None:
+            import test_sync_dependents_stop_fixtures_being_torn_down_early as test_one
+
+            assert test_one.events == ["uses_pool teardown", "pool teardown"]
+        """
+    )
+
+    result = run(pytester, "--async-concurrent-teardown")
+    result.assert_outcomes(passed=2)
+
+
+def test_does_not_teardown_together_by_default(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_one=FIXTURES)
+
+    result = run(pytester, "--default-async-timeout", "0.2")
+    result.assert_outcomes(passed=2, errors=1)
+    result.stdout.fnmatch_lines(["*Took too long to complete*"])
+
+
+def test_reports_each_teardown_error(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        from collections.abc import AsyncGenerator
+
+        import pytest
+
+
+        @pytest.fixture(scope="module")
+        async def one() -> AsyncGenerator[None]:
+            yield
+            raise ValueError("one failed")
+
+
+        @pytest.fixture(scope="module")
+        async def two() -> AsyncGenerator[None]:
+            yield
+            raise ValueError("two failed")
+
+
+        async def test_it(one: None, two: None) -> None:
+            pass
+        """
+    )
+
+    result = run(pytester, "--async-concurrent-teardown")
+    result.assert_outcomes(passed=1, errors=1)
+    result.stdout.fnmatch_lines(["*ValueError: one failed", "*ValueError: two failed"])
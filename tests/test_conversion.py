@@ -0,0 +1,124 @@
+import pytest
+
+from tests.conftest import run
+
+
+def test_converts_fixtures_and_tests_before_they_are_run(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(
+        """
+        import pytest
+
+        converted: dict[str, object] = {}
+
+
+        @pytest.hookimpl(trylast=True)
+        def pytest_collection_finish(session: pytest.Session) -> None:
+            for item in session.items:
+                assert isinstance(item, pytest.Function)
+                assert getattr(item.obj, "__alt_asyncio_pytest_converted__", False)
+                for fixturedefs in item._fixtureinfo.name2fixturedefs.values():
+                    for fixturedef in fixturedefs:
+                        assert getattr(fixturedef.func, "__alt_asyncio_pytest_converted__", False)
+                        converted.setdefault(fixturedef.argname, fixturedef.func)
+        """
+    )
+    pytester.makepyfile(
+        """
+        from collections.abc import AsyncGenerator
+
+        import pytest
+
+        import conftest
+
+
+        @pytest.fixture()
+        async def value() -> int:
+            return 1
+
+
+        @pytest.fixture()
+        async def gen(value: int) -> AsyncGenerator[int]:
+            yield value + 1
+
+
+        @pytest.mark.parametrize("n", [1, 2, 3])
+        async def test_one(gen: int, n: int, request: pytest.FixtureRequest) -> None:
+            assert gen == 2
+            for name in ("value", "gen"):
+                fixturedef = request._fixture_defs[name]
+                assert fixturedef.func is conftest.converted[name]
+
+
+        class TestClass:
+            async def test_two(self, value: int) -> None:
+                assert value == 1
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=4)
+
+
+def test_converts_fixtures_on_classes_and_leaves_unittest_alone(
+    pytester: pytest.Pytester,
+) -> None:
+    pytester.makeconftest(
+        """
+        import pytest
+        from _pytest.unittest import TestCaseFunction
+
+
+        @pytest.hookimpl(trylast=True)
+        def pytest_collection_finish(session: pytest.Session) -> None:
+            for item in session.items:
+                converted = getattr(item.obj, "__alt_asyncio_pytest_converted__", False)
+                if isinstance(item, TestCaseFunction):
+                    assert not converted, item.nodeid
+                    continue
+
+                assert converted, item.nodeid
+                for fixturedefs in item._fixtureinfo.name2fixturedefs.values():
+                    for fixturedef in fixturedefs:
+                        assert getattr(fixturedef.func, "__alt_asyncio_pytest_converted__", False)
+        """
+    )
+    pytester.makepyfile(
+        """
+        import asyncio
+        import unittest
+        from collections.abc import AsyncGenerator
+
+        import pytest
+
+
+        class TestThings:
+            @pytest.fixture(scope="class")
+            async def shared(self) -> list[str]:
+                return []
+
+            @pytest.fixture()
+            async def gen(self, shared: list[str]) -> AsyncGenerator[list[str]]:
+                shared.append("setup")
+                yield shared
+                shared.append("teardown")
+
+            async def test_one(self, gen: list[str]) -> None:
+                assert gen == ["setup"]
+
+            async def test_two(self, gen: list[str]) -> None:
+                assert gen == ["setup", "teardown", "setup"]
+
+
+        class TestCase(unittest.TestCase):
+            def test_sync(self) -> None:
+                self.assertEqual(1, 1)
+
+
+        class TestAsyncCase(unittest.IsolatedAsyncioTestCase):
+            async def test_async(self) -> None:
+                self.assertIsNotNone(asyncio.get_running_loop())
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=4)
@@ -0,0 +1,337 @@
+import contextlib
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import time
+from collections.abc import Iterator
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    sys.platform != "linux", reason="--async-daemon is only available on Linux"
+)
+
+
+def connect(pytester: pytest.Pytester, *args: str) -> pytest.RunResult:
+    """
+    Run the tests in the daemon. pytester.runpytest_subprocess isn't used as the
+    --basetemp it adds can't be given to the daemon by a client
+    """
+    return pytester.run(
+        sys.executable,
+        "-m",
+        "pytest",
+        "--tb",
+        "short",
+        "-p",
+        "alt_pytest_asyncio.enable",
+        "--async-daemon-connect",
+        "d.sock",
+        *args,
+    )
+
+
+@pytest.fixture
+def daemon(pytester: pytest.Pytester) -> Iterator[subprocess.Popen[str]]:
+    pytester.makeconftest(
+        """
+        import asyncio
+        import os
+
+        import pytest
+
+
+        @pytest.fixture(scope="session")
+        async def server():
+            with open("setup.txt", "a") as fle:
+                fle.write(f"{os.getpid()}\\n")
+
+            async def answer(reader, writer):
+                writer.write(b"hello\\n")
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(answer, "127.0.0.1", 0)
+            async with server:
+                yield {"port": server.sockets[0].getsockname()[1], "parent": os.getpid()}
+
+            with open("teardown.txt", "a") as fle:
+                fle.write(f"{os.getpid()}\\n")
+
+
+        def pytest_collection_modifyitems(items):
+            if os.path.exists("explode"):
+                raise RuntimeError("Something went wrong in the daemon")
+        """
+    )
+    pytester.makepyfile(
+        test_one="""
+        import asyncio
+        import os
+
+
+        async def test_talks_to_server(server):
+            assert server["parent"] != os.getpid()
+            reader, writer = await asyncio.open_connection("127.0.0.1", server["port"])
+            assert await reader.readline() == b"hello\\n"
+            writer.close()
+            await writer.wait_closed()
+
+
+        async def test_answer(server):
+            assert 1 == 2
+        """
+    )
+
+    with start_daemon(pytester) as process:
+        yield process
+
+
+@contextlib.contextmanager
+def start_daemon(pytester: pytest.Pytester) -> Iterator[subprocess.Popen[str]]:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "pytest",
+            "-p",
+            "alt_pytest_asyncio.enable",
+            "-p",
+            "no:cacheprovider",
+            "--async-daemon",
+            "d.sock",
+        ],
+        cwd=pytester.path,
+        # Cache bytecode like python normally does
+        env={
+            name: value for name, value in os.environ.items() if name != "PYTHONDONTWRITEBYTECODE"
+        },
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while not (pytester.path / "d.sock").exists():
+            assert process.poll() is None, process.communicate()[0]
+            assert time.monotonic() < deadline, "The daemon didn't start"
+            time.sleep(0.05)
+
+        yield process
+    finally:
+        if process.poll() is None:
+            process.send_signal(signal.SIGINT)
+        try:
+            process.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+
+
+def test_keeps_session_fixtures_alive_between_runs(
+    pytester: pytest.Pytester, daemon: subprocess.Popen[str]
+) -> None:
+    result = connect(pytester)
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["collected 2 items in the async daemon", "*assert 1 == 2*"])
+
+    # Changed test modules are imported again
+    test_one = pytester.path / "test_one.py"
+    test_one.write_text(test_one.read_text().replace("1 == 2", "2 == 2"))
+
+    result = connect(pytester, "-k", "answer")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["collected 1 item in the async daemon"])
+
+    result = connect(pytester, "test_one.py::test_nope")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+
+    daemon.send_signal(signal.SIGINT)
+    out, _ = daemon.communicate(timeout=30)
+    assert len([line for line in out.splitlines() if line.startswith("ran ")]) == 3, out
+
+    setup = (pytester.path / "setup.txt").read_text().split()
+    assert setup == [str(daemon.pid)]
+    assert (pytester.path / "teardown.txt").read_text().split() == setup
+    assert not (pytester.path / "d.sock").exists()
+
+
+def test_imports_modules_that_use_a_changed_module_again(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(
+        """
+        import conftest_helpers
+        """
+    )
+    pytester.makepyfile(
+        conftest_helpers="""
+        VALUE = 1
+        """,
+        helpers="""
+        VALUE = 1
+        """,
+        test_helpers="""
+        from helpers import VALUE
+
+
+        def test_value():
+            assert VALUE == 2
+        """,
+    )
+
+    with start_daemon(pytester):
+        result = connect(pytester)
+        result.assert_outcomes(failed=1)
+
+        # Changed within the same second and to the same size, which python
+        # doesn't notice when it checks the bytecode it cached
+        helpers = pytester.path / "helpers.py"
+        before = helpers.stat()
+        helpers.write_text(helpers.read_text().replace("1", "2"))
+        os.utime(helpers, ns=(before.st_atime_ns, before.st_mtime_ns + 1))
+
+        result = connect(pytester)
+        result.assert_outcomes(passed=1)
+
+        conftest_helpers = pytester.path / "conftest_helpers.py"
+        conftest_helpers.write_text(conftest_helpers.read_text().replace("1", "2"))
+
+        result = connect(pytester)
+        assert result.ret == pytest.ExitCode.USAGE_ERROR
+        result.stderr.fnmatch_lines(
+            [
+                "*conftest_helpers.py changed since the daemon started and is imported by"
+                " *conftest.py, the daemon needs to be restarted"
+            ]
+        )
+
+
+def test_finds_fixtures_from_conftest_files_in_other_directories(
+    pytester: pytest.Pytester,
+) -> None:
+    fixture = """
+        import os
+
+        import pytest
+
+
+        @pytest.fixture(scope="session")
+        async def {0}():
+            with open("setup.txt", "a") as fle:
+                fle.write("{0}\\n")
+            return os.getpid()
+        """
+    test = """
+        import os
+
+
+        async def test_{0}({0}):
+            assert {0} != os.getpid()
+        """
+    pytester.mkdir("folder")
+    pytester.mkpydir("package")
+    for name in ("folder", "package"):
+        (pytester.path / name / "conftest.py").write_text(textwrap.dedent(fixture.format(name)))
+        (pytester.path / name / f"test_{name}.py").write_text(textwrap.dedent(test.format(name)))
+
+    with start_daemon(pytester):
+        result = connect(pytester)
+        result.assert_outcomes(passed=2)
+
+        result = connect(pytester, "package/test_package.py")
+        result.assert_outcomes(passed=1)
+
+    assert sorted((pytester.path / "setup.txt").read_text().split()) == ["folder", "package"]
+
+
+def test_uses_the_options_from_the_client(
+    pytester: pytest.Pytester, daemon: subprocess.Popen[str]
+) -> None:
+    result = connect(pytester, "--deselect", "test_one.py::test_answer", "-v")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*test_talks_to_server PASSED*"])
+
+    result = connect(pytester, "-x", "--tb", "line", "-p", "no:cacheprovider")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*test_one.py:*: assert 1 == 2"])
+
+    result = connect(pytester, "--ignore", "test_one.py")
+    assert result.ret == pytest.ExitCode.NO_TESTS_COLLECTED
+
+
+def test_refuses_options_the_daemon_can_not_use(
+    pytester: pytest.Pytester, daemon: subprocess.Popen[str]
+) -> None:
+    result = connect(
+        pytester,
+        "--default-async-timeout",
+        "1",
+        "--async-concurrent",
+        "-p",
+        "no:doctest",
+    )
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(
+        [
+            "*The async daemon can't use -p no:doctest, --default-async-timeout,"
+            " --async-concurrent from the command line,"
+            " start the daemon with them instead"
+        ]
+    )
+
+
+def test_asks_for_a_restart_when_a_conftest_changes(
+    pytester: pytest.Pytester, daemon: subprocess.Popen[str]
+) -> None:
+    conftest = pytester.path / "conftest.py"
+    conftest.write_text(conftest.read_text() + "\n# changed\n")
+
+    result = connect(pytester)
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*conftest.py changed since the daemon started*restarted*"])
+
+
+def test_reports_failures_in_the_daemon_as_internal_errors(
+    pytester: pytest.Pytester, daemon: subprocess.Popen[str]
+) -> None:
+    (pytester.path / "explode").touch()
+
+    result = connect(pytester)
+    assert result.ret == pytest.ExitCode.INTERNAL_ERROR
+    result.stdout.fnmatch_lines(
+        [
+            "*DaemonFailed: The daemon failed to run the tests:*",
+            "*RuntimeError: Something went wrong in the daemon*",
+        ]
+    )
+
+
+def test_complains_when_there_is_no_daemon(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        def test_one() -> None:
+            pass
+        """
+    )
+    result = connect(pytester)
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*Failed to connect to the async daemon at*d.sock*"])
+
+
+def test_can_not_be_started_with_options_that_gather_results_from_each_test(
+    pytester: pytest.Pytester,
+) -> None:
+    pytester.makepyfile(
+        """
+        def test_one() -> None:
+            pass
+        """
+    )
+    result = pytester.runpytest_subprocess(
+        "-p", "alt_pytest_asyncio.enable", "--async-daemon", "d.sock", "--async-loop-metrics"
+    )
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(
+        ["*--async-daemon can't be used with --async-loop-metrics as what they find*"]
+    )
@@ -0,0 +1,143 @@
+import asyncio
+import functools
+import time
+
+import pytest
+
+from alt_pytest_asyncio import Loop
+from alt_pytest_asyncio.deadlines import DeadlineManager
+from tests.conftest import run
+
+
+class TestDeadlineManager:
+    def test_it_only_has_one_timer_on_the_loop(self) -> None:
+        with Loop() as loop:
+            controlled = loop.controlled_loop
+            assert controlled is not None
+            manager = DeadlineManager()
+            fired: list[str] = []
+
+            async def check() -> None:
+                deadlines = []
+                for name in ("three", "one", "two"):
+                    deadline = manager.deadline(controlled, functools.partial(fired.append, name))
+                    deadlines.append(deadline)
+
+                deadlines[0].set_seconds(0.3)
+                deadlines[1].set_seconds(0.1)
+                deadlines[2].set_seconds(0.2)
+
+                # Moving deadlines later doesn't add more timers
+                for _ in range(100):
+                    deadlines[0].set_seconds(0.3)
+                scheduled = controlled._scheduled  # type: ignore[attr-defined]
+                assert len([handle for handle in scheduled if not handle.cancelled()]) == 1
+
+                await asyncio.sleep(0.5)
+
+            loop.run_until_complete(check())
+            assert fired == ["one", "two", "three"]
+
+    def test_deadlines_can_be_moved_and_cancelled(self) -> None:
+        with Loop() as loop:
+            controlled = loop.controlled_loop
+            assert controlled is not None
+            manager = DeadlineManager()
+            fired: list[tuple[str, float]] = []
+            start = time.monotonic()
+
+            async def check() -> None:
+                extended = manager.deadline(
+                    controlled, lambda: fired.append(("extended", time.monotonic() - start))
+                )
+                shrunk = manager.deadline(
+                    controlled, lambda: fired.append(("shrunk", time.monotonic() - start))
+                )
+                cancelled = manager.deadline(controlled, lambda: fired.append(("cancelled", 0)))
+
+                extended.set_seconds(0.05)
+                shrunk.set_seconds(10)
+                cancelled.set_seconds(0.05)
+
+                extended.set_seconds(0.2)
+                shrunk.set_seconds(0.1)
+                cancelled.cancel()
+                assert cancelled.remaining_seconds() is None
+
+                remaining = extended.remaining_seconds()
+                assert remaining is not None and 0.1 < remaining <= 0.2
+
+                await asyncio.sleep(0.3)
+
+            loop.run_until_complete(check())
+            assert [name for name, _ in fired] == ["shrunk", "extended"]
+            assert fired[0][1] >= 0.1
+            assert fired[1][1] >= 0.2
+
+    def test_it_forgets_closed_loops(self) -> None:
+        manager = DeadlineManager()
+
+        for _ in range(20):
+            loop = asyncio.new_event_loop()
+            try:
+                manager.deadline(loop, lambda: None)
+            finally:
+                loop.close()
+            assert len(manager._loops) == 1
+
+
+def test_tests_can_see_how_long_they_have_left(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import alt_pytest_asyncio
+
+        AsyncTimeout = alt_pytest_asyncio.protocols.AsyncTimeout
+
+
+        async def test_it(async_timeout: AsyncTimeout) -> None:
+            remaining = async_timeout.remaining_seconds()
+            assert remaining is not None and 4 < remaining <= 5
+
+            async_timeout.set_timeout_seconds(20)
+            remaining = async_timeout.remaining_seconds()
+            assert remaining is not None and 19 < remaining <= 20
+
+            with async_timeout.budget(1):
+                remaining = async_timeout.remaining_seconds()
+                assert remaining is not None and remaining <= 1
+
+                with async_timeout.budget(30):
+                    # The budget we're already in is shorter
+                    remaining = async_timeout.remaining_seconds()
+                    assert remaining is not None and remaining <= 1
+
+            remaining = async_timeout.remaining_seconds()
+            assert remaining is not None and 19 < remaining <= 20
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=1)
+
+
+def test_budgets_cancel_the_test(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import alt_pytest_asyncio
+
+        AsyncTimeout = alt_pytest_asyncio.protocols.AsyncTimeout
+
+
+        async def test_it(async_timeout: AsyncTimeout) -> None:
+            with async_timeout.budget(0.1):
+                await asyncio.sleep(1)
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*Took too long to complete*(timeout=0.1)"])
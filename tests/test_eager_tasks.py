@@ -0,0 +1,135 @@
+import sys
+
+import pytest
+
+from tests.conftest import run
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="Eager tasks need python 3.12")
+def test_runs_tasks_eagerly(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        from collections.abc import AsyncGenerator
+
+        import pytest
+
+        events: list[str] = []
+
+
+        @pytest.fixture(scope="module")
+        async def cached() -> AsyncGenerator[str]:
+            assert asyncio.get_running_loop() is asyncio.get_event_loop()
+            yield "cached"
+            await asyncio.sleep(0.01)
+            events.append("cached teardown")
+
+
+        @pytest.fixture()
+        async def per_test(cached: str) -> str:
+            return f"per_test:{cached}"
+
+
+        async def test_create_task_is_eager(per_test: str) -> None:
+            assert per_test == "per_test:cached"
+
+            started: list[bool] = []
+
+            async def background() -> None:
+                started.append(True)
+                await asyncio.sleep(0.01)
+
+            task = asyncio.create_task(background())
+            assert started == [True]
+            await task
+
+
+        async def test_sleeping_still_works(per_test: str) -> None:
+            await asyncio.sleep(0.01)
+            assert asyncio.current_task() is not None
+
+
+        def test_after() -> None:
+            assert events == []
+        """
+    )
+
+    result = run(pytester, "--async-eager-tasks")
+    result.assert_outcomes(passed=3)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="Eager tasks need python 3.12")
+def test_timeouts_still_work_with_eager_tasks(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import alt_pytest_asyncio
+
+        AsyncTimeout = alt_pytest_asyncio.protocols.AsyncTimeout
+
+
+        async def test_hangs(async_timeout: AsyncTimeout) -> None:
+            async_timeout.set_timeout_seconds(0.05)
+            await asyncio.sleep(1)
+        """
+    )
+
+    result = run(pytester, "--async-eager-tasks")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*Took too long to complete*(timeout=0.05)"])
+
+
+@pytest.mark.skipif(sys.version_info >= (3, 12), reason="Eager tasks are available")
+def test_warns_without_eager_tasks(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        async def test_it() -> None:
+            pass
+        """
+    )
+
+    result = run(pytester, "--async-eager-tasks")
+    result.assert_outcomes(passed=1, warnings=1)
+    result.stdout.fnmatch_lines(["*Eager tasks are only available from python 3.12*"])
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="Eager tasks need python 3.12")
+def test_tests_that_never_wait_do_not_run_the_loop(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        completed: list[str] = []
+
+        original = asyncio.BaseEventLoop.run_until_complete
+
+
+        def run_until_complete(self, future):
+            completed.append(repr(future))
+            return original(self, future)
+
+
+        asyncio.BaseEventLoop.run_until_complete = run_until_complete
+
+
+        @pytest.fixture()
+        async def value() -> str:
+            return "value"
+
+
+        async def test_never_waits(value: str) -> None:
+            assert value == "value"
+            assert asyncio.get_running_loop() is not None
+
+
+        def test_loop_never_ran() -> None:
+            asyncio.BaseEventLoop.run_until_complete = original
+            assert completed == []
+        """
+    )
+
+    result = run(pytester, "--async-eager-tasks")
+    result.assert_outcomes(passed=2)
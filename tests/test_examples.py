@@ -72,8 +72,11 @@ def example_dir_factory(tmp_path_factory: pytest.TempPathFactory, name: str) ->
     return Factory()
 
 
+@pytest.mark.parametrize("extra_args", [(), ("--async-loop-thread",)], ids=["", "loop_thread"])
 @pytest.mark.parametrize("name", available_examples)
-async def test_shows_correctly_for_failing_fixtures(name: str, pytester: pytest.Pytester) -> None:
+async def test_shows_correctly_for_failing_fixtures(
+    name: str, extra_args: tuple[str, ...], pytester: pytest.Pytester
+) -> None:
     examples = importlib.resources.files("alt_pytest_asyncio_test_driver") / "examples" / name
     assert examples.is_dir()
     expected = (examples / "expected").read_text()
@@ -89,7 +92,7 @@ async def test_shows_correctly_for_failing_fixtures(name: str, pytester: pytest.
         timeout_args.extend(["--default-async-timeout", "0.09"])
 
     result = pytester.runpytest_subprocess(
-        "--tb", "short", "-p", "alt_pytest_asyncio.enable", *timeout_args
+        "--tb", "short", "-p", "alt_pytest_asyncio.enable", *timeout_args, *extra_args
     )
     assert not result.errlines
 
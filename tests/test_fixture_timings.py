@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from tests.conftest import run
+
+FIXTURES = """
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Iterator
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+async def slow_setup() -> str:
+    await asyncio.sleep(0.2)
+    return "slow_setup"
+
+
+@pytest.fixture()
+async def slow_teardown() -> AsyncGenerator[str]:
+    yield "slow_teardown"
+    await asyncio.sleep(0.05)
+
+
+@pytest.fixture()
+def sync_fixture() -> Iterator[str]:
+    time.sleep(0.05)
+    yield "sync"
+
+
+@pytest.mark.parametrize("i", range(3))
+async def test_it(i: int, slow_setup: str, slow_teardown: str, sync_fixture: str) -> None:
+    pass
+"""
+
+
+def test_it_times_async_fixtures(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(FIXTURES)
+
+    result = run(
+        pytester,
+        "--async-fixture-durations",
+        "1",
+        "--async-fixture-durations-json",
+        "timings.json",
+    )
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*= slowest 1 fixture durations =*",
+            "*total*setup*setups*teardown*teardowns*scope*fixture",
+            "*0.2*s *0.2*s       1 *0.0*s         1  module   *::slow_setup",
+            "*=*",
+        ]
+    )
+
+    timings = {
+        timing["name"]: timing
+        for timing in json.loads((pytester.path / "timings.json").read_text())
+    }
+    assert set(timings) == {"slow_setup", "slow_teardown"}
+
+    slow_setup = timings["slow_setup"]
+    assert (slow_setup["scope"], slow_setup["is_async"]) == ("module", True)
+    assert (slow_setup["setups"], slow_setup["teardowns"]) == (1, 1)
+    assert slow_setup["setup_seconds"] >= 0.2
+
+    slow_teardown = timings["slow_teardown"]
+    assert (slow_teardown["setups"], slow_teardown["teardowns"]) == (3, 3)
+    assert slow_teardown["teardown_seconds"] >= 0.15
+    assert slow_teardown["slowest_teardown"] >= 0.05
+    assert slow_teardown["setup_seconds"] < slow_teardown["teardown_seconds"]
+
+
+def test_it_times_teardowns_run_concurrently(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        from collections.abc import AsyncGenerator
+
+        import pytest
+
+
+        @pytest.fixture()
+        async def first() -> AsyncGenerator[None]:
+            yield
+            await asyncio.sleep(0.2)
+
+
+        @pytest.fixture()
+        async def second() -> AsyncGenerator[None]:
+            yield
+            await asyncio.sleep(0.2)
+
+
+        async def test_it(first: None, second: None) -> None:
+            pass
+        """
+    )
+
+    result = run(
+        pytester,
+        "--async-concurrent-teardown",
+        "--async-fixture-durations-json",
+        "timings.json",
+        "--durations",
+        "1",
+    )
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["0.2*s teardown *::test_it"])
+
+    timings = json.loads((pytester.path / "timings.json").read_text())
+    assert sorted(timing["name"] for timing in timings) == ["first", "second"]
+    for timing in timings:
+        assert timing["teardowns"] == 1
+        assert 0.2 <= timing["teardown_seconds"] < 0.4
+
+
+def test_it_can_include_sync_fixtures(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(FIXTURES)
+
+    result = run(pytester, "-o", "async_fixture_durations=0", "--async-fixture-durations-sync")
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(["*= fixture durations =*", "*module   *::slow_setup"])
+    for name in ("slow_teardown", "sync_fixture"):
+        result.stdout.fnmatch_lines([f"*function *::{name}"])
+
+
+def test_it_only_applies_when_asked_for(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(FIXTURES)
+
+    result = run(pytester)
+    result.assert_outcomes(passed=3)
+    assert "fixture durations" not in result.stdout.str()
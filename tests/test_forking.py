@@ -0,0 +1,251 @@
+import sys
+
+import pytest
+
+from tests.conftest import run
+
+pytestmark = pytest.mark.skipif(
+    sys.platform != "linux", reason="--async-fork-workers is only available on Linux"
+)
+
+
+def test_sets_up_session_fixtures_once_for_every_worker(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(
+        """
+        import asyncio
+        import os
+
+        import pytest
+
+
+        @pytest.fixture(scope="session")
+        async def prepared():
+            with open("setup.txt", "a") as fle:
+                fle.write(f"{os.getpid()}\\n")
+            yield {"parent": os.getpid(), "loop": asyncio.get_running_loop()}
+            with open("teardown.txt", "a") as fle:
+                fle.write(f"{os.getpid()}\\n")
+
+
+        @pytest.fixture(scope="module")
+        async def per_module():
+            return os.getpid()
+        """
+    )
+    tests = """
+        import asyncio
+        import os
+
+
+        async def test_{0}_one(prepared, per_module):
+            assert per_module == os.getpid()
+            assert prepared["parent"] != os.getpid()
+            assert prepared["loop"] is not asyncio.get_running_loop()
+            with open("ran.txt", "a") as fle:
+                fle.write(f"{{os.getpid()}}\\n")
+
+
+        async def test_{0}_two(prepared):
+            await asyncio.sleep(0.01)
+            with open("ran.txt", "a") as fle:
+                fle.write(f"{{os.getpid()}}\\n")
+
+
+        def test_{0}_sync(prepared):
+            assert prepared["parent"] != os.getpid()
+        """
+    pytester.makepyfile(test_a=tests.format("a"), test_b=tests.format("b"))
+
+    result = run(pytester, "--async-fork-workers", "2", "-v")
+    result.assert_outcomes(passed=6)
+
+    parent = (pytester.path / "setup.txt").read_text().split()
+    assert len(parent) == 1
+    assert (pytester.path / "teardown.txt").read_text().split() == parent
+
+    workers = set((pytester.path / "ran.txt").read_text().split())
+    assert len(workers) == 2
+    assert parent[0] not in workers
+
+
+def test_reports_failures_from_workers(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import os
+
+        import pytest
+
+
+        @pytest.fixture(scope="session")
+        async def broken():
+            raise ValueError("nope")
+
+
+        async def test_passes():
+            pass
+
+
+        async def test_fails():
+            print("from the worker")
+            assert False
+
+
+        async def test_broken_fixture(broken):
+            pass
+
+
+        async def test_crashes():
+            os._exit(3)
+
+
+        async def test_after_crash():
+            pass
+        """
+    )
+    result = run(pytester, "--async-fork-workers", "2")
+    result.assert_outcomes(passed=1, failed=3, errors=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*ValueError: nope*",
+            "*Captured stdout call*",
+            "from the worker",
+            "*The worker running this test exited with 3*",
+        ]
+    )
+
+
+def test_stops_the_workers_after_maxfail(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+
+        async def test_fails():
+            assert False
+
+
+        async def test_slow():
+            await asyncio.sleep(0.5)
+
+
+        async def test_slower():
+            await asyncio.sleep(30)
+        """
+    )
+    result = run(pytester, "--async-fork-workers", "2", "-x")
+    result.assert_outcomes(failed=1)
+    assert result.duration < 20
+
+
+def test_can_not_be_used_with_the_loop_thread(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        def test_one() -> None:
+            pass
+        """
+    )
+    result = run(pytester, "--async-fork-workers", "2", "--async-loop-thread")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*--async-fork-workers can't be used with --async-loop-thread*"])
+
+
+def test_fails_the_tests_a_killed_worker_did_not_report(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import os
+        import signal
+
+
+        async def test_one():
+            pass
+
+
+        async def test_two():
+            pass
+
+
+        async def test_killed():
+            os.kill(os.getpid(), signal.SIGKILL)
+
+
+        async def test_not_reached():
+            pass
+        """
+    )
+    result = run(pytester, "--async-fork-workers", "2", "-v")
+    result.assert_outcomes(passed=2, failed=2)
+    result.stdout.fnmatch_lines_random(
+        [
+            "*::test_one PASSED*",
+            "*::test_two PASSED*",
+            "*::test_killed FAILED*",
+            "*::test_not_reached FAILED*",
+        ]
+    )
+    result.stdout.fnmatch_lines(["*The worker running this test exited with -9*"])
+
+
+def test_fails_the_rest_of_a_worker_when_a_report_is_too_big(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(
+        """
+        from alt_pytest_asyncio import forking
+
+        forking.READ_LIMIT = 20000
+        """
+    )
+    pytester.makepyfile(
+        """
+        async def test_one():
+            pass
+
+
+        async def test_two():
+            pass
+
+
+        async def test_loud():
+            print("x" * 50000)
+
+
+        async def test_after_loud():
+            pass
+        """
+    )
+    result = run(pytester, "--async-fork-workers", "2", "-v")
+    result.assert_outcomes(passed=2, failed=2)
+    result.stdout.fnmatch_lines_random(
+        [
+            "*::test_one PASSED*",
+            "*::test_two PASSED*",
+            "*::test_loud FAILED*",
+            "*::test_after_loud FAILED*",
+        ]
+    )
+    result.stdout.fnmatch_lines(["*The report for a test was more than 20000 bytes*"])
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--async-trace", "trace.json"],
+        ["--async-loop-metrics"],
+        ["--async-fixture-durations", "5"],
+        ["--async-task-leaks", "report"],
+        ["--async-benchmark-save", "benchmarks.json"],
+    ],
+)
+def test_can_not_be_used_with_options_that_gather_results_from_each_test(
+    pytester: pytest.Pytester, option: list[str]
+) -> None:
+    pytester.makepyfile(
+        """
+        def test_one() -> None:
+            pass
+        """
+    )
+    result = run(pytester, "--async-fork-workers", "2", *option)
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(
+        [f"*--async-fork-workers can't be used with {option[0]} as what they find*"]
+    )
+    assert not (pytester.path / "trace.json").exists()
@@ -0,0 +1,163 @@
+import pytest
+
+from tests.conftest import run
+
+
+def test_interrupts_tests_that_block_the_loop(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import time
+
+        import pytest
+
+
+        async def test_sleeps() -> None:
+            time.sleep(60)
+
+
+        async def test_spins() -> None:
+            while True:
+                pass
+
+
+        @pytest.fixture()
+        async def blocks() -> None:
+            time.sleep(60)
+
+
+        async def test_fixture_blocks(blocks: None) -> None:
+            pass
+
+
+        async def test_after() -> None:
+            pass
+        """
+    )
+
+    result = run(pytester, "--async-hard-timeout", "0.5")
+    result.assert_outcomes(passed=1, failed=2, errors=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*_ test_sleeps _*",
+            "*HardTimeout: The event loop didn't come back within the hard timeout of 0.5 seconds",
+            "*Threads:*",
+            "*in test_sleeps*",
+            "*Current task:*",
+        ]
+    )
+    assert result.duration < 10
+
+
+def test_exits_if_the_test_keeps_blocking(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import time
+
+
+        async def test_ignores_interrupts() -> None:
+            try:
+                time.sleep(60)
+            except Exception:
+                time.sleep(60)
+        """
+    )
+
+    result = run(pytester, "--async-hard-timeout", "0.5")
+    assert result.ret == 1
+    result.stderr.fnmatch_lines(
+        [
+            "The event loop didn't come back after being interrupted by the hard timeout",
+            "*in test_ignores_interrupts*",
+        ]
+    )
+    assert result.duration < 10
+
+
+def test_only_applies_when_asked_for(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import time
+
+
+        async def test_blocks_for_a_bit() -> None:
+            time.sleep(0.5)
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=1)
+
+    result = run(pytester, "-o", "async_hard_timeout=0.2")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*HardTimeout*"])
+
+
+def test_keyboard_interrupt_still_works(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import os
+        import signal
+
+
+        async def test_interrupted() -> None:
+            os.kill(os.getpid(), signal.SIGINT)
+        """
+    )
+
+    result = run(pytester, "--async-hard-timeout", "5")
+    result.stdout.fnmatch_lines(["*KeyboardInterrupt*"])
+    assert result.ret == pytest.ExitCode.INTERRUPTED
+
+
+def test_ignores_the_interrupt_for_a_block_that_finishes_at_the_timeout(
+    pytester: pytest.Pytester,
+) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        import os
+        import signal
+        import threading
+        import time
+
+        import pytest
+
+        from alt_pytest_asyncio import watchdog
+
+
+        class SlowToFire(watchdog.Watchdog):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.firing = threading.Event()
+
+            def _dump(self):
+                # The block finishes whilst the watchdog is busy interrupting it
+                self.firing.set()
+                time.sleep(0.3)
+                return super()._dump()
+
+
+        def test_finishes_at_the_timeout() -> None:
+            loop = asyncio.new_event_loop()
+            dog = SlowToFire(timeout=0.2)
+            dog.start()
+            try:
+                with dog.watching(loop):
+                    dog.firing.wait()
+
+                # Longer than the watchdog waits before giving up on a block
+                time.sleep(1)
+                assert dog._deadline is None
+                assert not dog._interrupted
+
+                with pytest.raises(KeyboardInterrupt):
+                    os.kill(os.getpid(), signal.SIGINT)
+                    time.sleep(5)
+            finally:
+                dog.stop()
+                loop.close()
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=1)
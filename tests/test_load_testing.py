@@ -0,0 +1,155 @@
+import json
+
+import pytest
+
+from tests.conftest import run
+
+
+def test_runs_the_body_many_times_at_once(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(
+        """
+        import json
+
+        import pytest
+
+        found = {}
+
+
+        def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+            for name, value in report.user_properties:
+                if name == "async_load":
+                    found[report.nodeid.split("::")[-1]] = value
+
+
+        def pytest_sessionfinish(session: pytest.Session) -> None:
+            with open("load.json", "w") as fle:
+                json.dump(found, fle)
+        """
+    )
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        running = [0]
+        most = [0]
+
+
+        @pytest.fixture()
+        def calls() -> list[int]:
+            return []
+
+
+        @pytest.mark.async_load(concurrency=20, iterations=200)
+        async def test_load(calls: list[int]) -> None:
+            running[0] += 1
+            most[0] = max(most[0], running[0])
+            calls.append(1)
+            await asyncio.sleep(0.001)
+            running[0] -= 1
+
+
+        def test_after() -> None:
+            assert most[0] == 20
+        """
+    )
+    result = run(pytester)
+    result.assert_outcomes(passed=2)
+    result.stdout.fnmatch_lines(
+        [
+            "*= async load =*",
+            "test_runs_the_body_many_times_at_once.py::test_load: 200 iterations with concurrency 20"
+            " in *s: * ops/s, p50 *ms, p95 *ms, p99 *ms, max *ms, 0 errors",
+        ]
+    )
+
+    found = json.loads((pytester.path / "load.json").read_text())
+    assert found["test_load"]["iterations"] == 200
+    assert found["test_load"]["errors"] == 0
+    assert found["test_load"]["ops_per_second"] > 0
+    assert found["test_load"]["p50_ms"] >= 1
+
+
+def test_fails_on_errors_and_limits(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        import itertools
+
+        import pytest
+
+        counter = itertools.count()
+
+
+        @pytest.mark.async_load(concurrency=5, iterations=50)
+        async def test_errors() -> None:
+            if next(counter) % 10 == 0:
+                raise ValueError("nope")
+
+
+        @pytest.mark.async_load(concurrency=5, iterations=50, max_errors=10)
+        async def test_allowed_errors() -> None:
+            if next(counter) % 10 == 0:
+                raise ValueError("nope")
+
+
+        @pytest.mark.async_load(concurrency=2, iterations=10, min_ops_per_second=1000)
+        async def test_too_slow() -> None:
+            await asyncio.sleep(0.01)
+
+
+        @pytest.mark.async_load(concurrency=2, iterations=10, max_p99=0.001)
+        async def test_p99() -> None:
+            await asyncio.sleep(0.01)
+        """
+    )
+    result = run(pytester)
+    result.assert_outcomes(passed=1, failed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*LoadTestFailed: 5 of 50 iterations failed (max_errors=0), the first with ValueError('nope')",
+            "*LoadTestFailed: Only managed *ops/s (min_ops_per_second=1000)",
+            "*LoadTestFailed: The p99 latency was *ms (max_p99=0.001s)",
+        ]
+    )
+
+
+def test_shows_what_finished_when_it_times_out(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        import itertools
+
+        import pytest
+
+        counter = itertools.count()
+
+
+        @pytest.mark.async_load(concurrency=2, iterations=10, timeout=0.5)
+        async def test_slows_down() -> None:
+            await asyncio.sleep(0.05 if next(counter) < 4 else 10)
+
+
+        @pytest.mark.async_load(concurrency=2, iterations=10, timeout=2)
+        async def test_longer_than_the_test_timeout() -> None:
+            await asyncio.sleep(0.2)
+        """
+    )
+    result = run(pytester, "--default-async-timeout", "0.1")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*_ test_slows_down _*",
+            "*Took too long to complete: *(timeout=0.5)",
+            "*async load*",
+            "4 of 10 iterations with concurrency 2 in 0.5*s: *",
+        ]
+    )
+    result.stdout.fnmatch_lines(
+        [
+            "*= async load =*",
+            "*::test_slows_down: 4 of 10 iterations*",
+            "*::test_longer_than_the_test_timeout: 10 iterations with concurrency 2*",
+        ]
+    )
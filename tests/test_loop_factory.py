@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from alt_pytest_asyncio import errors, run_coro_as_main
+from alt_pytest_asyncio.loop_manager import Loop, import_loop_factory
+from tests.conftest import run
+
+LOOPS = """
+import asyncio
+
+
+class CustomLoop(asyncio.SelectorEventLoop):
+    pass
+
+
+class OtherLoop(asyncio.SelectorEventLoop):
+    pass
+"""
+
+
+class CustomLoop(asyncio.SelectorEventLoop):
+    pass
+
+
+class TestImportLoopFactory:
+    def test_it_finds_the_callable(self) -> None:
+        assert import_loop_factory("asyncio:new_event_loop") is asyncio.new_event_loop
+        assert import_loop_factory(f"{__name__}:CustomLoop") is CustomLoop
+
+    @pytest.mark.parametrize(
+        "spec",
+        [
+            "asyncio",
+            ":new_event_loop",
+            "not_a_module_that_exists:thing",
+            "asyncio:nope",
+            "asyncio:sleep.__doc__",
+        ],
+    )
+    def test_it_complains_about_bad_specs(self, spec: str) -> None:
+        with pytest.raises(errors.LoopFactoryNotFound):
+            import_loop_factory(spec)
+
+
+def test_loop_uses_the_loop_factory() -> None:
+    with Loop(loop_factory=CustomLoop) as loop:
+        assert isinstance(loop.controlled_loop, CustomLoop)
+        assert asyncio.get_event_loop_policy().get_event_loop() is loop.controlled_loop
+
+
+def test_run_coro_as_main_can_make_the_loop() -> None:
+    found: list[asyncio.AbstractEventLoop] = []
+
+    async def main() -> None:
+        found.append(asyncio.get_running_loop())
+
+    run_coro_as_main(None, main(), loop_factory=CustomLoop)
+    assert len(found) == 1
+    assert isinstance(found[0], CustomLoop)
+    assert found[0].is_closed()
+
+
+def test_uses_the_loop_factory_from_the_cli(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(custom_loops=LOOPS)
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+
+        @pytest.fixture(scope="session")
+        async def session_loop() -> asyncio.AbstractEventLoop:
+            return asyncio.get_running_loop()
+
+
+        async def test_it(session_loop: asyncio.AbstractEventLoop) -> None:
+            assert type(session_loop).__name__ == "CustomLoop"
+            assert asyncio.get_running_loop() is session_loop
+        """
+    )
+
+    result = run(pytester, "--async-loop-factory", "custom_loops:CustomLoop")
+    result.assert_outcomes(passed=1)
+
+
+def test_uses_the_loop_factory_from_the_ini(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(custom_loops=LOOPS)
+    pytester.makeini(
+        """
+        [pytest]
+        async_loop_factory = custom_loops:OtherLoop
+        """
+    )
+    pytester.makepyfile(
+        """
+        import asyncio
+
+
+        async def test_it() -> None:
+            assert type(asyncio.get_running_loop()).__name__ == "OtherLoop"
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=1)
+
+
+def test_complains_about_a_bad_loop_factory(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        async def test_it() -> None:
+            pass
+        """
+    )
+
+    result = run(pytester, "--async-loop-factory", "asyncio:not_there")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(["*Failed to find 'not_there' in 'asyncio'*"])
+
+
+def test_conftest_can_choose_a_loop_per_directory(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(custom_loops=LOOPS)
+    pytester.makepyfile(
+        **{
+            "custom/conftest": """
+            import custom_loops
+
+
+            def pytest_async_loop_factory(config):
+                return custom_loops.CustomLoop
+            """,
+            "custom/test_custom": """
+            import asyncio
+
+            import pytest
+
+
+            @pytest.fixture(scope="module")
+            async def module_loop() -> asyncio.AbstractEventLoop:
+                return asyncio.get_running_loop()
+
+
+            async def test_one(module_loop: asyncio.AbstractEventLoop) -> None:
+                assert type(module_loop).__name__ == "CustomLoop"
+                assert asyncio.get_running_loop() is module_loop
+
+
+            async def test_two(module_loop: asyncio.AbstractEventLoop) -> None:
+                assert asyncio.get_running_loop() is module_loop
+            """,
+            "other/test_other": """
+            import asyncio
+
+
+            async def test_it() -> None:
+                assert type(asyncio.get_running_loop()).__name__ == "OtherLoop"
+            """,
+        }
+    )
+
+    result = run(pytester, "--async-loop-factory", "custom_loops:OtherLoop")
+    result.assert_outcomes(passed=3)
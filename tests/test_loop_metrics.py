@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+import pytest
+
+from alt_pytest_asyncio.converter import Converter
+from alt_pytest_asyncio.loop_metrics import LoopMetrics, percentile
+from tests.conftest import run
+
+
+def test_percentile() -> None:
+    assert percentile([], 50) == 0
+    assert percentile([3.0], 99) == 3
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+
+
+def test_counts_callbacks_that_become_ready_during_an_iteration() -> None:
+    metrics = LoopMetrics(interval=60)
+    loop = asyncio.new_event_loop()
+    ran: list[int] = []
+
+    async def schedule() -> None:
+        done = loop.create_future()
+        for i in range(50):
+            loop.call_later(0.01, ran.append, i)
+        loop.call_later(0.01, done.set_result, None)
+        await done
+
+    try:
+        with metrics.watching(loop):
+            loop.run_until_complete(schedule())
+        phase = metrics._take("test", "call")
+    finally:
+        loop.close()
+
+    assert len(ran) == 50
+    assert phase is not None
+    assert phase.callbacks >= 51
+
+
+def test_only_watches_a_loop_once_at_a_time() -> None:
+    converter = Converter()
+    converter.loop_watchers.append(LoopMetrics(interval=60))
+    loop = asyncio.new_event_loop()
+
+    try:
+        with converter._watching(loop):
+            run_once = vars(loop)["_run_once"]
+            with converter._watching(loop):
+                assert vars(loop)["_run_once"] is run_once
+                assert len(loop._scheduled) == 1  # type: ignore[attr-defined]
+        assert "_run_once" not in vars(loop)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("extra", [[], ["--async-loop-thread"]], ids=["main", "loop_thread"])
+def test_it_puts_metrics_in_the_reports(pytester: pytest.Pytester, extra: list[str]) -> None:
+    pytester.makeconftest(
+        """
+        import json
+
+        import pytest
+
+        found = {}
+
+
+        def pytest_runtest_logreport(report: pytest.TestReport) -> None:
+            for name, value in report.user_properties:
+                found[f"{report.nodeid.split('::')[-1]}:{name}"] = value
+
+
+        def pytest_sessionfinish(session: pytest.Session) -> None:
+            with open("metrics.json", "w") as fle:
+                json.dump(found, fle)
+        """
+    )
+    pytester.makepyfile(
+        """
+        import asyncio
+        import time
+
+        import pytest
+
+
+        @pytest.fixture()
+        async def tasks() -> None:
+            await asyncio.gather(*(asyncio.sleep(0) for _ in range(20)))
+
+
+        async def test_makes_tasks(tasks: None) -> None:
+            pass
+
+
+        async def test_blocks() -> None:
+            await asyncio.sleep(0.05)
+            time.sleep(0.1)
+            await asyncio.sleep(0.05)
+
+
+        def test_sync() -> None:
+            pass
+        """
+    )
+
+    result = run(pytester, "--async-loop-metrics", *extra)
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*= async loop metrics =*",
+            "per phase*p50*p90*p99*max",
+            "max lag*ms",
+            "tasks*",
+            "callbacks*",
+            "iterations*",
+            "most lag:",
+            "*ms test_it_puts_metrics_in_the_reports.py::test_blocks (call) tasks=0*",
+        ]
+    )
+
+    found = json.loads((pytester.path / "metrics.json").read_text())
+    assert found["test_makes_tasks:async_loop_setup"]["tasks"] == 20
+    assert found["test_makes_tasks:async_loop_setup"]["callbacks"] > 20
+    assert found["test_makes_tasks:async_loop_setup"]["iterations"] > 1
+
+    blocked = found["test_blocks:async_loop_call"]
+    assert blocked["lag_max_ms"] >= 80
+    assert blocked["heartbeats"] >= 2
+
+    assert not any(name.startswith("test_sync:") for name in found)
+
+    result = run(pytester, *extra)
+    result.assert_outcomes(passed=3)
+    assert "async loop metrics" not in result.stdout.str()
+    assert json.loads((pytester.path / "metrics.json").read_text()) == {}
@@ -0,0 +1,71 @@
+import pytest
+
+from tests.conftest import run
+
+TICKS = """
+    import asyncio
+    import contextvars
+    import time
+
+    import pytest
+
+    var: contextvars.ContextVar[str] = contextvars.ContextVar("var")
+
+
+    @pytest.fixture(scope="session", autouse=True)
+    async def ticks():
+        var.set("from fixture")
+        found = [0]
+
+        async def tick() -> None:
+            while True:
+                found[0] += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.get_event_loop().create_task(tick())
+        await asyncio.sleep(0)
+        yield found
+        task.cancel()
+
+
+    def test_sync(ticks: list[int]) -> None:
+        before = ticks[0]
+        time.sleep(0.2)
+        with open("ticks.txt", "w") as fle:
+            fle.write(str(ticks[0] - before))
+
+
+    async def test_async(ticks: list[int]) -> None:
+        assert var.get() == "from fixture"
+        before = ticks[0]
+        await asyncio.sleep(0.05)
+        assert ticks[0] > before
+    """
+
+
+def test_keeps_the_loop_running_between_tests(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(TICKS)
+    result = run(pytester, "--async-loop-thread")
+    result.assert_outcomes(passed=2)
+    assert int((pytester.path / "ticks.txt").read_text()) > 5
+
+
+def test_the_loop_only_runs_for_async_code_without_the_option(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(TICKS)
+    result = run(pytester)
+    result.assert_outcomes(passed=2)
+    assert int((pytester.path / "ticks.txt").read_text()) == 0
+
+
+def test_can_not_be_used_with_concurrent_fixtures(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        def test_one() -> None:
+            pass
+        """
+    )
+    result = run(pytester, "--async-loop-thread", "--async-concurrent-fixtures")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(
+        ["*--async-concurrent-fixtures can't be used with --async-loop-thread*"]
+    )
@@ -0,0 +1,89 @@
+import sys
+
+import pytest
+
+from tests.conftest import run
+
+LEAKY = """
+import asyncio
+import gc
+import os
+import socket
+
+import pytest
+
+kept: list[object] = []
+
+
+async def test_leaks_a_transport() -> None:
+    a, b = socket.socketpair()
+    kept.append(b)
+    transport, _ = await asyncio.get_running_loop().connect_accepted_socket(
+        asyncio.Protocol, a
+    )
+    kept.append(transport)
+
+
+async def test_leaks_a_file() -> None:
+    kept.append(os.open(os.devnull, os.O_RDONLY))
+
+
+async def test_drops_a_socket() -> None:
+    socket.socket()
+    gc.collect()
+
+
+async def test_cleans_up() -> None:
+    a, b = socket.socketpair()
+    transport, _ = await asyncio.get_running_loop().connect_accepted_socket(
+        asyncio.Protocol, a
+    )
+    transport.close()
+    b.close()
+    await asyncio.sleep(0)
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Counting file descriptors needs a unix")
+class TestResourceLeaks:
+    def test_it_reports_tests_that_leave_resources_open(self, pytester: pytest.Pytester) -> None:
+        pytester.makepyfile(LEAKY)
+
+        result = run(pytester, "--async-resource-leaks", "report")
+        result.assert_outcomes(passed=4)
+        result.stdout.fnmatch_lines(
+            [
+                "*= async resource leaks =*",
+                "*::test_leaks_a_transport: +2 file descriptors, +1 transports",
+                "*::test_leaks_a_file: +1 file descriptors",
+                "*::test_drops_a_socket: 1 ResourceWarning",
+                "  *: unclosed <socket.socket*",
+            ]
+        )
+        assert "test_cleans_up" not in result.stdout.str()
+
+    def test_it_can_warn(self, pytester: pytest.Pytester) -> None:
+        pytester.makepyfile(LEAKY)
+
+        result = run(pytester, "-o", "async_resource_leaks=warn")
+        result.assert_outcomes(passed=4, warnings=3)
+        result.stdout.fnmatch_lines(
+            [
+                "*::test_leaks_a_transport",
+                "*ResourceLeakWarning: *::test_leaks_a_transport: +2 file descriptors, +1 transports",
+            ]
+        )
+
+    def test_it_can_fail(self, pytester: pytest.Pytester) -> None:
+        pytester.makepyfile(LEAKY)
+
+        result = run(
+            pytester, "--async-resource-leaks", "fail", "--async-resource-leak-threshold", "1"
+        )
+        result.assert_outcomes(passed=4, errors=1)
+        result.stdout.fnmatch_lines(
+            [
+                "*ERROR at teardown of test_leaks_a_transport*",
+                "*ResourceLeak: *::test_leaks_a_transport: +2 file descriptors, +1 transports",
+            ]
+        )
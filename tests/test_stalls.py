@@ -0,0 +1,121 @@
+import pytest
+
+from tests.conftest import run
+
+
+def test_reports_code_that_blocks_the_loop(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        import time
+
+        import pytest
+
+
+        def do_something_slow() -> None:
+            time.sleep(0.4)
+
+
+        @pytest.fixture()
+        async def slow_fixture() -> None:
+            do_something_slow()
+
+
+        async def test_blocks() -> None:
+            await asyncio.sleep(0.01)
+            do_something_slow()
+
+
+        async def test_uses_fixture(slow_fixture: None) -> None:
+            pass
+
+
+        async def test_doesnt_block() -> None:
+            for _ in range(10):
+                await asyncio.sleep(0.05)
+        """
+    )
+
+    result = run(pytester, "--async-stall-threshold", "0.1")
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*= async stalls =*",
+            "test_reports_code_that_blocks_the_loop.py::test_* (*) blocked the event loop for *ms",
+            "*in do_something_slow",
+            "*time.sleep(0.4)",
+            "test_reports_code_that_blocks_the_loop.py::test_* (*) blocked the event loop for *ms",
+            "*in do_something_slow",
+        ]
+    )
+    assert "test_blocks (call) blocked" in result.stdout.str()
+    assert "test_uses_fixture (setup) blocked" in result.stdout.str()
+    assert "test_doesnt_block" not in result.stdout.str()
+
+
+def test_can_fail_tests_that_block_the_loop(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import time
+
+
+        async def test_blocks_a_little() -> None:
+            time.sleep(0.2)
+
+
+        async def test_blocks_a_lot() -> None:
+            time.sleep(0.6)
+        """
+    )
+
+    result = run(pytester, "--async-stall-threshold", "0.1", "--async-stall-fail", "0.4")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*_ test_blocks_a_lot _*",
+            "The event loop was blocked for longer than 0.4 seconds",
+            "*test_blocks_a_lot (call) blocked the event loop for *ms",
+            "*time.sleep(0.6)",
+        ]
+    )
+
+    result = run(pytester, "-o", "async_stall_fail=0.4")
+    result.assert_outcomes(passed=1, failed=1)
+
+
+def test_only_applies_when_asked_for(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import time
+
+
+        async def test_blocks() -> None:
+            time.sleep(0.3)
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=1)
+    assert "async stalls" not in result.stdout.str()
+
+    result = run(pytester, "-o", "async_stall_threshold=0.1")
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*= async stalls =*", "*test_blocks (call) blocked*"])
+
+
+def test_fail_limit_cant_be_less_than_the_threshold(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        async def test_it() -> None:
+            pass
+        """
+    )
+
+    result = run(pytester, "--async-stall-threshold", "0.5", "--async-stall-fail", "0.1")
+    assert result.ret == pytest.ExitCode.USAGE_ERROR
+    result.stderr.fnmatch_lines(
+        ["*async_stall_fail (0.1) can't be less than async_stall_threshold (0.5)*"]
+    )
+
+    result = run(pytester, "--async-stall-threshold", "0.5", "--async-stall-fail", "0.5")
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,134 @@
+import pytest
+
+from tests.conftest import run
+
+
+def test_leaves_sync_tests_that_do_not_use_async_fixtures_alone(
+    pytester: pytest.Pytester,
+) -> None:
+    pytester.makepyfile(
+        """
+        import contextvars
+        from collections.abc import AsyncGenerator, Iterator
+
+        import pytest
+
+        var: contextvars.ContextVar[str] = contextvars.ContextVar("var", default="unset")
+
+
+        def converted(func: object) -> bool:
+            return bool(getattr(func, "__alt_asyncio_pytest_converted__", False))
+
+
+        @pytest.fixture()
+        def plain() -> Iterator[str]:
+            yield "plain"
+
+
+        @pytest.fixture()
+        def shared() -> str:
+            return "shared"
+
+
+        @pytest.fixture()
+        async def setter(shared: str) -> AsyncGenerator[str]:
+            var.set("set")
+            yield shared
+
+
+        def test_plain(plain: str, request: pytest.FixtureRequest) -> None:
+            assert not converted(request.function)
+            assert not converted(request._fixture_defs["plain"].func)
+
+
+        async def test_async(setter: str, request: pytest.FixtureRequest) -> None:
+            assert var.get() == "set"
+            assert converted(request.function)
+
+
+        def test_shares_a_fixture(shared: str, request: pytest.FixtureRequest) -> None:
+            assert var.get() == "set"
+            assert converted(request.function)
+            assert converted(request._fixture_defs["shared"].func)
+        """
+    )
+
+    result = run(pytester, "--async-sync-fast-path")
+    result.assert_outcomes(passed=3)
+
+
+def test_does_not_start_when_nothing_is_async(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        from alt_pytest_asyncio.plugin import AltPytestAsyncioPlugin
+
+
+        @pytest.fixture()
+        def value() -> int:
+            return 1
+
+
+        def test_not_started(pytestconfig: pytest.Config) -> None:
+            plugins = pytestconfig.pluginmanager.get_plugins()
+            assert not any(isinstance(p, AltPytestAsyncioPlugin) for p in plugins)
+
+
+        def test_one(value: int) -> None:
+            assert value == 1
+
+
+        @pytest.mark.parametrize("n", [1, 2])
+        def test_two(n: int) -> None:
+            pass
+        """
+    )
+
+    result = run(pytester, "--async-sync-fast-path")
+    result.assert_outcomes(passed=4)
+
+    result = run(pytester)
+    result.assert_outcomes(passed=3, failed=1)
+
+
+def test_sync_tests_can_share_a_fixture_with_async_tests(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        import contextvars
+
+        import pytest
+
+        var: contextvars.ContextVar[str] = contextvars.ContextVar("var", default="unset")
+        ran: list[str] = []
+
+
+        @pytest.fixture(scope="module")
+        def resource() -> list[str]:
+            var.set("set")
+            return ran
+
+
+        def test_sync_first(resource: list[str]) -> None:
+            resource.append("sync_first")
+
+
+        async def test_async(resource: list[str]) -> None:
+            await asyncio.sleep(0)
+            assert var.get() == "set"
+            resource.append("async")
+
+
+        def test_sync_after(resource: list[str]) -> None:
+            assert var.get() == "set"
+            resource.append("sync_after")
+
+
+        def test_order() -> None:
+            assert ran == ["sync_first", "async", "sync_after"]
+        """
+    )
+
+    result = run(pytester, "--async-sync-fast-path")
+    result.assert_outcomes(passed=4)
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from alt_pytest_asyncio import Loop
+from alt_pytest_asyncio.converter import Converter
+from alt_pytest_asyncio.plugin import LoadedAsyncTimeout
+
+
+def tracked(converter: Converter) -> int:
+    return sum(len(tasks) for tasks in converter._test_tasks.values())
+
+
+class TestTaskBookkeeping:
+    def test_it_forgets_tasks_once_they_are_done(self) -> None:
+        converter = Converter()
+
+        async def run() -> int:
+            await asyncio.sleep(0)
+            return 1
+
+        with Loop():
+            for _ in range(2000):
+                async_timeout = LoadedAsyncTimeout(default_timeout=5)
+                assert converter._run(async_timeout, run, (), {}) == 1
+                assert tracked(converter) == 0
+
+        assert converter._test_tasks == {}
+
+    def test_it_forgets_loops(self) -> None:
+        converter = Converter()
+        waiting: list[asyncio.Task[object]] = []
+
+        async def run() -> None:
+            await asyncio.sleep(0)
+
+        async def forever() -> None:
+            await asyncio.get_running_loop().create_future()
+
+        for _ in range(200):
+            with Loop() as loop:
+                assert loop.controlled_loop is not None
+                converter._run(LoadedAsyncTimeout(default_timeout=5), run, (), {})
+
+                # A task that is still going when the loop is closed
+                task = loop.controlled_loop.create_task(forever())
+                converter._add_new_task(loop.controlled_loop, task)
+                waiting.append(task)
+
+            assert len(converter._test_tasks) <= 1
+
+        converter.sessionfinish()
+        assert converter._test_tasks == {}
+
+
+def test_bookkeeping_stays_flat_as_the_suite_grows(pytester: pytest.Pytester) -> None:
+    count = 3000
+    pytester.makeconftest(
+        """
+        import pytest
+
+        from alt_pytest_asyncio.plugin import AltPytestAsyncioPlugin
+
+        sizes: list[int] = []
+
+
+        @pytest.hookimpl(trylast=True)
+        def pytest_runtest_teardown(item: pytest.Item) -> None:
+            for plugin in item.config.pluginmanager.get_plugins():
+                if isinstance(plugin, AltPytestAsyncioPlugin):
+                    tasks = plugin._converter._test_tasks
+                    sizes.append(sum(len(ts) for ts in tasks.values()))
+        """
+    )
+    tests = "".join(
+        f"""
+async def test_{i}(module_fixture: int, function_fixture: int) -> None:
+    await asyncio.sleep(0)
+"""
+        for i in range(count)
+    )
+    pytester.makepyfile(
+        test_many="""
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+async def module_fixture() -> AsyncGenerator[int]:
+    yield 1
+
+
+@pytest.fixture()
+async def function_fixture() -> AsyncGenerator[int]:
+    await asyncio.sleep(0)
+    yield 2
+    await asyncio.sleep(0)
+"""
+        + tests,
+        test_zz_sizes="""
+import conftest
+
+
+def test_sizes() -> None:
+    assert len(conftest.sizes) == %d
+    assert max(conftest.sizes) <= 2
+"""
+        % count,
+    )
+
+    result = pytester.runpytest_subprocess("-q", "-p", "alt_pytest_asyncio.enable")
+    result.assert_outcomes(passed=count + 1)
@@ -0,0 +1,92 @@
+import pytest
+
+from tests.conftest import run
+
+LEAKY = """
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+
+ran: list[str] = []
+
+
+async def forever(name: str, stopping: float = 0) -> None:
+    try:
+        await asyncio.sleep(60)
+    finally:
+        if stopping:
+            await asyncio.sleep(stopping)
+        ran.append(f"{name} finished")
+
+
+@pytest.fixture(scope="module")
+async def server() -> AsyncGenerator[None]:
+    task = asyncio.create_task(forever("server"))
+    yield
+    task.cancel()
+
+
+@pytest.fixture(scope="module")
+async def leaky_server() -> None:
+    asyncio.create_task(forever("leaky_server"), name="leaky_server_task")
+
+
+async def test_leaks(server: None) -> None:
+    asyncio.create_task(forever("test_leaks", 0.2), name="leaked")
+
+
+async def test_cleans_up(server: None, leaky_server: None) -> None:
+    task = asyncio.create_task(forever("test_cleans_up"))
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.sleep(0)
+
+
+def test_after() -> None:
+    assert "test_leaks finished" in ran
+"""
+
+
+def test_it_reports_tasks_left_running(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(LEAKY)
+
+    result = run(pytester, "--async-task-leaks", "report")
+    result.assert_outcomes(passed=2, failed=1)
+    output = result.stdout.str()
+    assert "server made by" not in output.replace("leaky_server made by", "")
+    assert "test_cleans_up (" not in output
+    result.stdout.fnmatch_lines(
+        [
+            "*= async task leaks =*",
+            "leaked (forever) made by *::test_leaks is still running",
+            "*in test_leaks",
+            '*asyncio.create_task(forever("test_leaks", 0.2), name="leaked")',
+            "leaky_server_task (forever) made by leaky_server for *::test_cleans_up is still running",
+            "*in leaky_server",
+        ]
+    )
+
+
+@pytest.mark.parametrize("extra", [[], ["--async-loop-thread"]], ids=["main", "loop_thread"])
+def test_it_can_cancel_tasks_left_running(pytester: pytest.Pytester, extra: list[str]) -> None:
+    pytester.makepyfile(LEAKY)
+
+    result = run(pytester, "-o", "async_task_leaks=cancel", *extra)
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        ["*= async task leaks =*", "leaked (forever) made by *::test_leaks was cancelled"]
+    )
+    result.stdout.fnmatch_lines(
+        [
+            "leaky_server_task (forever) made by leaky_server for *::test_cleans_up was cancelled",
+        ]
+    )
+
+
+def test_it_only_applies_when_asked_for(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(LEAKY)
+
+    result = run(pytester)
+    result.assert_outcomes(passed=2, failed=1)
+    assert "async task leaks" not in result.stdout.str()
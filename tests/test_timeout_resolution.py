@@ -0,0 +1,129 @@
+import pytest
+
+from tests.conftest import run
+
+
+def test_default_timeouts_follow_overrides_in_each_scope(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        from alt_pytest_asyncio.plugin import LoadedAsyncTimeout
+
+
+        @pytest.fixture(scope="module")
+        def module_default_async_timeout() -> float:
+            return 2
+
+
+        @pytest.fixture(scope="class")
+        async def class_timeout(async_timeout: LoadedAsyncTimeout) -> float:
+            return async_timeout.timeout
+
+
+        @pytest.fixture()
+        async def function_timeout(async_timeout: LoadedAsyncTimeout) -> float:
+            return async_timeout.timeout
+
+
+        class TestOverridden:
+            @pytest.fixture(scope="class")
+            def class_default_async_timeout(self) -> float:
+                return 3
+
+            async def test_one(self, class_timeout: float, function_timeout: float) -> None:
+                assert class_timeout == 3
+                assert function_timeout == 3
+
+            @pytest.mark.parametrize("default_async_timeout", [4])
+            async def test_two(
+                self, class_timeout: float, function_timeout: float, default_async_timeout: float
+            ) -> None:
+                assert class_timeout == 3
+                assert function_timeout == 4
+
+            async def test_three(self, async_timeout: LoadedAsyncTimeout) -> None:
+                assert async_timeout.timeout == 3
+
+
+        class TestNotOverridden:
+            async def test_one(self, class_timeout: float, function_timeout: float) -> None:
+                assert class_timeout == 2
+                assert function_timeout == 2
+
+            async def test_two(self, async_timeout: LoadedAsyncTimeout) -> None:
+                assert async_timeout.timeout == 2
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=5)
+
+
+def test_default_timeouts_are_found_again_when_a_timeout_fixture_changes(
+    pytester: pytest.Pytester,
+) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        from alt_pytest_asyncio.plugin import LoadedAsyncTimeout
+
+
+        @pytest.fixture(scope="session", params=[1, 2])
+        def session_default_async_timeout(request: pytest.FixtureRequest) -> float:
+            return request.param
+
+
+        @pytest.fixture(scope="module")
+        async def module_timeout(
+            async_timeout: LoadedAsyncTimeout, session_default_async_timeout: float
+        ) -> float:
+            return async_timeout.timeout
+
+
+        async def test_it(module_timeout: float, session_default_async_timeout: float) -> None:
+            assert module_timeout == session_default_async_timeout
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=2)
+
+
+def test_default_timeouts_are_found_again_when_async_timeout_is_overridden_mid_module(
+    pytester: pytest.Pytester,
+) -> None:
+    pytester.makepyfile(
+        """
+        import pytest
+
+        from alt_pytest_asyncio.plugin import AsyncTimeoutProvider, LoadedAsyncTimeout
+
+
+        @pytest.fixture(scope="module", params=[1, 2])
+        def async_timeout(request: pytest.FixtureRequest) -> AsyncTimeoutProvider:
+            timeout = request.param
+
+            def factory(*, default_timeout: float) -> LoadedAsyncTimeout:
+                return LoadedAsyncTimeout(default_timeout=timeout)
+
+            return AsyncTimeoutProvider(timeout_factory=factory)
+
+
+        @pytest.fixture(scope="module")
+        async def module_timeout(async_timeout: LoadedAsyncTimeout) -> float:
+            return async_timeout.timeout
+
+
+        async def test_it(module_timeout: float, async_timeout: LoadedAsyncTimeout) -> None:
+            assert module_timeout == async_timeout.timeout
+
+
+        async def test_again(module_timeout: float, async_timeout: LoadedAsyncTimeout) -> None:
+            assert module_timeout == async_timeout.timeout
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=4)
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+from tests.conftest import run
+from tests.test_concurrent_teardown import FIXTURES
+
+
+def test_it_writes_a_chrome_trace(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        from collections.abc import AsyncGenerator
+
+        import pytest
+
+
+        @pytest.fixture(scope="module")
+        async def database() -> AsyncGenerator[str]:
+            await asyncio.sleep(0.05)
+            yield "database"
+            await asyncio.sleep(0.1)
+
+
+        @pytest.fixture()
+        def conn(database: str) -> str:
+            return database
+
+
+        async def background() -> None:
+            await asyncio.sleep(0.02)
+
+
+        async def test_one(conn: str) -> None:
+            await asyncio.create_task(background(), name="background")
+
+
+        def test_two(conn: str) -> None:
+            pass
+        """
+    )
+
+    result = run(pytester, "--async-trace", "trace/out.json")
+    result.assert_outcomes(passed=2)
+
+    trace = json.loads((pytester.path / "trace" / "out.json").read_text())
+    events = trace["traceEvents"]
+    spans = {(event["cat"], event["name"]): event for event in events if event["ph"] == "X"}
+
+    nodeid = "test_it_writes_a_chrome_trace.py::test_one"
+    for phase in ("setup", "call", "teardown"):
+        assert spans[("test", f"{phase} {nodeid}")]["args"] == {"nodeid": nodeid}
+
+    setup = spans[("fixture setup", "database")]
+    assert setup["args"]["scope"] == "module"
+    assert setup["dur"] >= 50_000
+
+    teardown = spans[("fixture teardown", "database")]
+    assert teardown["dur"] >= 100_000
+    assert teardown["ts"] >= spans[("test", f"call {nodeid.replace('one', 'two')}")]["ts"]
+
+    # Fixtures are inside the setup of the test that needed them
+    test_setup = spans[("test", f"setup {nodeid}")]
+    assert test_setup["ts"] <= setup["ts"]
+    assert setup["ts"] + setup["dur"] <= test_setup["ts"] + test_setup["dur"]
+
+    tasks = [event for event in events if event["cat"] == "task"]
+    background = [event for event in tasks if event["name"] == "background"]
+    assert [event["ph"] for event in background] == ["b", "e"]
+    assert background[0]["args"] == {"nodeid": nodeid}
+    assert background[1]["args"] == {"outcome": "done", "task": "background"}
+    assert background[1]["ts"] - background[0]["ts"] >= 20_000
+
+
+def test_it_doesnt_stop_fixtures_being_torn_down_together(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_one=FIXTURES)
+    pytester.makepyfile(
+        test_two="""
+        def test_order() -> None:
+            import test_one
+
+            assert len(test_one.events) == 4
+        """
+    )
+
+    result = run(
+        pytester,
+        "--async-concurrent-teardown",
+        "--default-async-timeout",
+        "1",
+        "--async-trace",
+        "out.json",
+    )
+    result.assert_outcomes(passed=3)
+
+    events = json.loads((pytester.path / "out.json").read_text())["traceEvents"]
+    torn_down = {event["name"] for event in events if event["cat"] == "fixture teardown"}
+    assert {"server", "pool", "uses_server", "uses_pool"} <= torn_down
@@ -0,0 +1,249 @@
+import asyncio
+import functools
+import time
+
+import pytest
+
+from alt_pytest_asyncio import Loop
+from alt_pytest_asyncio.virtual_time import VirtualTimeEventLoop
+from tests.conftest import run
+
+
+class TestVirtualTimeEventLoop:
+    def test_it_skips_ahead_when_only_timers_are_pending(self) -> None:
+        with Loop(loop_factory=functools.partial(VirtualTimeEventLoop, virtual_time=True)) as loop:
+            assert loop.controlled_loop is not None
+            before_loop = loop.controlled_loop.time()
+            before = time.monotonic()
+
+            async def sleeper() -> str:
+                await asyncio.sleep(60)
+                await asyncio.wait_for(asyncio.sleep(120), timeout=100)
+                return "done"
+
+            with pytest.raises(TimeoutError):
+                loop.run_until_complete(sleeper())
+
+            assert time.monotonic() - before < 1
+            assert loop.controlled_loop.time() - before_loop >= 160
+
+    def test_it_uses_real_time_if_virtual_time_is_off(self) -> None:
+        with Loop(loop_factory=VirtualTimeEventLoop) as loop:
+            assert loop.controlled_loop is not None
+            before = time.monotonic()
+            loop.run_until_complete(asyncio.sleep(0.1))
+            assert time.monotonic() - before >= 0.1
+
+    def test_wall_clock_timers_use_real_time(self) -> None:
+        with Loop(loop_factory=functools.partial(VirtualTimeEventLoop, virtual_time=True)) as loop:
+            controlled = loop.controlled_loop
+            assert isinstance(controlled, VirtualTimeEventLoop)
+            called: list[float] = []
+
+            async def waiter() -> None:
+                fut: asyncio.Future[None] = controlled.create_future()
+                controlled.call_later_wall_clock(0.1, fut.set_result, None)
+                controlled.call_later_wall_clock(10, called.append, 1).cancel()
+                await asyncio.sleep(1000)
+                assert not fut.done()
+                before = time.monotonic()
+                await fut
+                called.append(time.monotonic() - before)
+
+            loop.run_until_complete(waiter())
+            assert len(called) == 1
+            assert 0.05 < called[0] < 1
+
+
+def test_marker_makes_sleeps_instant(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        import time
+
+        import pytest
+
+
+        @pytest.mark.async_virtual_time
+        async def test_virtual() -> None:
+            before = time.monotonic()
+            await asyncio.sleep(3600)
+            assert time.monotonic() - before < 1
+
+
+        async def test_real() -> None:
+            loop = asyncio.get_running_loop()
+            before = loop.time()
+            await asyncio.sleep(0.1)
+            assert loop.time() - before < 1
+        """
+    )
+
+    result = run(pytester, "--async-virtual-time-loop", "--default-async-timeout", "2")
+    result.assert_outcomes(passed=2)
+
+
+def test_marker_can_be_used_on_a_module(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        from collections.abc import AsyncGenerator
+
+        import pytest
+
+        pytestmark = pytest.mark.async_virtual_time
+
+
+        @pytest.fixture()
+        async def slow() -> AsyncGenerator[None]:
+            await asyncio.sleep(100)
+            yield
+            await asyncio.sleep(100)
+
+
+        async def test_one(slow: None) -> None:
+            await asyncio.sleep(100)
+
+
+        @pytest.mark.async_virtual_time(False)
+        async def test_two() -> None:
+            await asyncio.sleep(100)
+        """
+    )
+
+    result = run(pytester, "-o", "async_virtual_time_loop=true", "--default-async-timeout", "0.5")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines(["*_ test_two _*", "*Took too long to complete*"])
+
+
+def test_timeouts_are_in_wall_clock_time(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        import alt_pytest_asyncio
+
+        AsyncTimeout = alt_pytest_asyncio.protocols.AsyncTimeout
+
+
+        @pytest.mark.async_virtual_time
+        async def test_hangs(async_timeout: AsyncTimeout) -> None:
+            async_timeout.set_timeout_seconds(0.1)
+            await asyncio.get_running_loop().create_future()
+        """
+    )
+
+    result = run(pytester, "--async-virtual-time-loop")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*Took too long to complete*(timeout=0.1)"])
+
+
+def test_only_uses_a_virtual_time_loop_when_asked_to(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+
+        import pytest
+
+        from alt_pytest_asyncio.virtual_time import VirtualTimeEventLoop
+
+
+        async def test_loop() -> None:
+            assert not isinstance(asyncio.get_running_loop(), VirtualTimeEventLoop)
+
+
+        @pytest.mark.async_virtual_time
+        async def test_virtual() -> None:
+            pass
+        """
+    )
+
+    result = run(pytester)
+    result.assert_outcomes(passed=1, errors=1)
+    result.stdout.fnmatch_lines(
+        [
+            "*VirtualTimeNotSupported: The current event loop (*) doesn't support virtual time,"
+            " the session loop only does with --async-virtual-time-loop"
+        ]
+    )
+
+
+def test_moving_the_clock_forward_sets_off_timers_from_session_fixtures(
+    pytester: pytest.Pytester,
+) -> None:
+    pytester.makepyfile(
+        """
+        import asyncio
+        from collections.abc import AsyncGenerator
+
+        import pytest
+
+        from alt_pytest_asyncio.virtual_time import call_later_wall_clock
+
+
+        @pytest.fixture(scope="session")
+        async def timers() -> AsyncGenerator[dict[str, asyncio.Event]]:
+            loop = asyncio.get_running_loop()
+            events = {"loop": asyncio.Event(), "wall_clock": asyncio.Event()}
+            handles = [
+                loop.call_later(600, events["loop"].set),
+                call_later_wall_clock(loop, 600, events["wall_clock"].set),
+            ]
+            yield events
+            for handle in handles:
+                handle.cancel()
+
+
+        async def test_before(timers: dict[str, asyncio.Event]) -> None:
+            await asyncio.sleep(0.01)
+            assert not timers["loop"].is_set()
+
+
+        @pytest.mark.async_virtual_time
+        async def test_virtual(timers: dict[str, asyncio.Event]) -> None:
+            await asyncio.sleep(3600)
+
+
+        async def test_after(timers: dict[str, asyncio.Event]) -> None:
+            await asyncio.sleep(0.01)
+            assert timers["loop"].is_set()
+            assert not timers["wall_clock"].is_set()
+        """
+    )
+
+    result = run(pytester, "--async-virtual-time-loop")
+    result.assert_outcomes(passed=3)
+
+
+def test_complains_if_the_loop_does_not_support_virtual_time(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(
+        """
+        import asyncio
+
+        import pytest
+
+        from alt_pytest_asyncio.plugin import AltPytestAsyncioPlugin
+
+
+        def pytest_configure(config: pytest.Config) -> None:
+            config.pluginmanager.register(
+                AltPytestAsyncioPlugin(managed_loop=asyncio.new_event_loop())
+            )
+        """
+    )
+    pytester.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.mark.async_virtual_time
+        async def test_it() -> None:
+            pass
+        """
+    )
+
+    result = pytester.runpytest_subprocess("--tb", "short")
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*VirtualTimeNotSupported*"])
@@ -0,0 +1,257 @@
+import asyncio
+import contextlib
+import pathlib
+import sys
+from collections.abc import AsyncIterator
+
+import pytest
+
+from alt_pytest_asyncio import errors
+from alt_pytest_asyncio.workers import SharedResources, WorkerSummary
+from tests.conftest import run
+
+
+class TestSharedResources:
+    async def test_only_sets_up_in_one_worker(self, tmp_path: pathlib.Path) -> None:
+        called: list[str] = []
+
+        def setup_for(worker: str) -> contextlib.AbstractAsyncContextManager[dict[str, int]]:
+            @contextlib.asynccontextmanager
+            async def setup() -> AsyncIterator[dict[str, int]]:
+                called.append(f"setup {worker}")
+                await asyncio.sleep(0.05)
+                yield {"port": 1234}
+                called.append(f"teardown {worker}")
+
+            return setup()
+
+        first, second = (
+            SharedResources(
+                directory=tmp_path, worker_id=worker, worker_count=2, poll_interval=0.01
+            )
+            for worker in ("gw0", "gw1")
+        )
+
+        async def use(shared: SharedResources, wait: float) -> dict[str, int]:
+            await asyncio.sleep(wait)
+            async with shared.share("broker", lambda: setup_for(shared.worker_id)) as value:
+                await asyncio.sleep(wait * 2)
+                called.append(f"done {shared.worker_id}")
+                shared.mark_done()
+                return value
+
+        assert list(await asyncio.gather(use(first, 0), use(second, 0.1))) == [
+            {"port": 1234},
+            {"port": 1234},
+        ]
+        assert called == ["setup gw0", "done gw0", "done gw1", "teardown gw0"]
+        assert first.owned == ["broker"]
+        assert second.owned == []
+
+    async def test_tells_other_workers_when_setup_fails(self, tmp_path: pathlib.Path) -> None:
+        @contextlib.asynccontextmanager
+        async def setup() -> AsyncIterator[None]:
+            raise ValueError("no ports")
+            yield
+
+        first, second = (
+            SharedResources(
+                directory=tmp_path, worker_id=worker, worker_count=2, poll_interval=0.01
+            )
+            for worker in ("gw0", "gw1")
+        )
+
+        with pytest.raises(ValueError, match="no ports"):
+            async with first.share("broker", setup):
+                pass
+
+        with pytest.raises(
+            errors.SharedSetupFailed, match="Setting up broker in worker gw0 failed: ValueError"
+        ):
+            async with second.share("broker", setup):
+                pass
+
+    async def test_gives_up_waiting_for_setup(self, tmp_path: pathlib.Path) -> None:
+        started = asyncio.Event()
+
+        @contextlib.asynccontextmanager
+        async def setup() -> AsyncIterator[None]:
+            started.set()
+            await asyncio.sleep(10)
+            yield
+
+        first, second = (
+            SharedResources(
+                directory=tmp_path,
+                worker_id=worker,
+                worker_count=2,
+                timeout=0.1,
+                poll_interval=0.01,
+            )
+            for worker in ("gw0", "gw1")
+        )
+
+        async def own() -> None:
+            async with first.share("broker", setup):
+                pass
+
+        owning = asyncio.create_task(own())
+        try:
+            await started.wait()
+            with pytest.raises(
+                errors.SharedSetupFailed,
+                match="Gave up waiting for worker gw0 to set up broker after 0.1 seconds",
+            ):
+                async with second.share("broker", setup):
+                    pass
+        finally:
+            owning.cancel()
+            await asyncio.wait([owning])
+
+    async def test_stops_waiting_when_the_owner_dies(self, tmp_path: pathlib.Path) -> None:
+        process = await asyncio.create_subprocess_exec(sys.executable, "-c", "pass")
+        await process.wait()
+
+        folder = tmp_path / "shared" / "broker"
+        folder.mkdir(parents=True)
+        (folder / "owner").write_text(f"gw0\n{process.pid}")
+
+        @contextlib.asynccontextmanager
+        async def setup() -> AsyncIterator[None]:
+            raise AssertionError("Only the owner sets up")
+            yield
+
+        shared = SharedResources(
+            directory=tmp_path, worker_id="gw1", worker_count=2, poll_interval=0.01
+        )
+        with pytest.raises(
+            errors.SharedSetupFailed,
+            match="Worker gw0 stopped before it finished setting up broker",
+        ):
+            async with shared.share("broker", setup):
+                pass
+
+    async def test_just_sets_up_without_other_workers(self) -> None:
+        @contextlib.asynccontextmanager
+        async def setup() -> AsyncIterator[object]:
+            yield shared
+
+        shared = SharedResources(directory=None)
+        async with shared.share("thing", setup) as value:
+            assert value is shared
+
+
+def test_worker_summary() -> None:
+    summary = WorkerSummary(
+        worker_id="gw1",
+        tests=3,
+        async_timeouts=1,
+        max_loop_lag=0.0123,
+        stalls=0,
+        task_leaks=2,
+        resource_leaks=0,
+        shared=("broker",),
+    )
+    assert WorkerSummary.from_dict(summary.as_dict()) == summary
+    assert summary.format() == (
+        "gw1: 3 tests, 1 async timeouts, max loop lag 12.3ms, 0 stalls, 2 task leaks,"
+        " 0 resource leaks, shared broker"
+    )
+
+
+def test_shares_between_xdist_workers(pytester: pytest.Pytester) -> None:
+    pytest.importorskip("xdist")
+    pytester.makeconftest(
+        """
+        import contextlib
+        import os
+        from collections.abc import AsyncIterator
+
+        import pytest
+
+        from alt_pytest_asyncio.workers import SharedResources
+
+
+        @contextlib.asynccontextmanager
+        async def start_broker() -> AsyncIterator[dict[str, int]]:
+            with open("setups.txt", "a") as fle:
+                fle.write(f"{os.getpid()}\\n")
+            yield {"pid": os.getpid()}
+
+
+        @pytest.fixture(scope="session")
+        async def broker(async_shared: SharedResources) -> AsyncIterator[dict[str, int]]:
+            async with async_shared.share("broker", start_broker) as info:
+                yield info
+        """
+    )
+    pytester.makepyfile(
+        **{
+            f"test_{i}": f"""
+            import asyncio
+
+
+            async def test_{i}(broker: dict[str, int]) -> None:
+                await asyncio.sleep(0.05)
+                assert broker["pid"] > 0
+            """
+            for i in range(6)
+        }
+    )
+
+    result = run(pytester, "-n", "3")
+    result.assert_outcomes(passed=6)
+    assert len((pytester.path / "setups.txt").read_text().split()) == 1
+    result.stdout.fnmatch_lines(
+        [
+            "*= async workers =*",
+            "gw0: * tests, 0 async timeouts, 0 stalls, 0 task leaks, 0 resource leaks*",
+            "gw1: *",
+            "gw2: *",
+            "total: 6 tests, 0 async timeouts, 0 stalls, 0 task leaks, 0 resource leaks,"
+            " shared broker",
+        ]
+    )
+
+
+def test_leaves_watching_tests_to_the_xdist_workers(pytester: pytest.Pytester) -> None:
+    pytest.importorskip("xdist")
+    pytester.makepyfile(
+        """
+        import pytest
+
+
+        @pytest.fixture
+        async def thing() -> int:
+            return 1
+
+
+        async def test_one(thing: int) -> None:
+            pass
+
+
+        async def test_two(thing: int) -> None:
+            pass
+        """
+    )
+
+    result = run(
+        pytester,
+        "-n",
+        "2",
+        "--async-trace",
+        "trace.json",
+        "--async-fixture-durations-json",
+        "fixtures.json",
+        "--async-hard-timeout",
+        "10",
+        "--async-stall-threshold",
+        "1",
+    )
+    result.assert_outcomes(passed=2)
+    assert sorted(path.name for path in pytester.path.glob("*.json")) == [
+        "fixtures.gw0.json",
+        "fixtures.gw1.json",
+        "trace.gw0.json",
+        "trace.gw1.json",
+    ]
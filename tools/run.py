@@ -126,5 +126,16 @@ def tests(args: list[str]) -> None:
     run("python", "-m", "pytest", *args)
 
 
+@cli.command(context_settings=dict(ignore_unknown_options=True))
+@click.argument("name")
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+def bench(name: str, args: list[str]) -> None:
+    """
+    Run one of the benchmarks in the benchmarks folder
+    """
+    os.chdir(here / "..")
+    run("python", "-m", f"benchmarks.bench_{name}", *args)
+
+
 if __name__ == "__main__":
     cli()